@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""Quota-bounded store of generated files with background eviction.
+
+The store keeps an in-memory index of the artifacts in its directory (name,
+size, created, last accessed), ordered from least to most recently used. A
+daemon thread evicts artifacts that were not accessed for ``ttl`` seconds
+and, least recently used first, any beyond the byte and count quotas. Since
+expired and over-quota artifacts are always at the old end of the index, a
+sweep costs time in proportion to what it removes, not to the number of
+files on disk. The directory is only listed once, when the store is created.
+
+New artifacts get random ids and live in hash-prefix shard directories
+(``3f/a2/3fa2....pptx``), so names never collide and no directory grows
+large. They are written under a hidden temporary name and renamed into
+place, so a name in the index always refers to a complete file. Since the
+shard path follows from the id, a lookup of an id the index does not know
+checks the disk once, which lets several server processes share a directory.
+Each process has its own index, so lookups also record the access in the
+file's atime, and a sweep re-reads it before deleting a file that another
+process may have used since.
+"""
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+def artifact_id(name):
+    """The id an artifact is indexed and downloaded by: its file name without the shard path"""
+    return os.path.basename(name)
+
+
+def shard_name(artifact):
+    """Name (relative path) of the artifact with the given random id"""
+    return os.path.join(artifact[:2], artifact[2:4], artifact)
+
+
+def temporary_path(path):
+    """Hidden sibling of path to write to before renaming it into place"""
+    directory, filename = os.path.split(path)
+    return os.path.join(directory, f'.{filename}.{os.getpid()}.{threading.get_ident()}.tmp')
+
+
+class ArtifactStore:
+    """Index of the files in directory with LRU/TTL eviction on a background thread.
+
+    Names are paths relative to directory; the index is keyed by artifact_id
+    (the file name), which all lookups accept too. Hidden files and
+    directories (temporary files, other caches) are not managed.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, max_count=10000, ttl=3600,
+                 sweep_interval=60, on_evict=None, on_sweep=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_count = max_count
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self.on_evict = on_evict  # called with the name of every evicted artifact
+        self.on_sweep = on_sweep  # called by the eviction thread after every sweep and when stopping
+        self.evictions = 0
+        self.sweeps = 0
+        self._entries = OrderedDict()  # artifact id -> entry, least recently accessed first
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+        os.makedirs(directory, exist_ok=True)
+        self._scan()
+
+    def new_name(self, extension):
+        """Allocate a unique sharded name for a new artifact and create its directory"""
+        name = shard_name(f'{uuid.uuid4().hex}.{extension}')
+        os.makedirs(os.path.dirname(self.path(name)), exist_ok=True)
+        return name
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def add(self, name, download_name=None):
+        """Index a file that was just written into the directory.
+
+        download_name is the file name offered to clients (default: the id).
+        """
+        size = os.path.getsize(self.path(name))
+        now = time.time()
+        key = artifact_id(name)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old['size']
+            self._entries[key] = {'name': name, 'download_name': download_name or key,
+                                  'size': size, 'created': now, 'last_accessed': now}
+            self._total_bytes += size
+            over_quota = self._over_quota()
+        if over_quota:
+            self._wake.set()
+
+    def lookup(self, name):
+        """Mark an artifact as used; returns a copy of its entry, or None if it is not in the store
+
+        An id that is not indexed but exists in its shard directory (written
+        by another process) is added to the index, and an indexed one whose
+        file is gone (evicted by another process) is forgotten.
+        """
+        key = artifact_id(name)
+        with self._lock:
+            entry = self._entries.get(key)
+            entry = dict(entry) if entry is not None else None
+        if entry is not None:
+            now = time.time()
+            try:
+                self._record_access(entry['name'], now)
+            except OSError:
+                self._forget(key)
+                return None
+            with self._lock:
+                current = self._entries.get(key)
+                if current is not None:
+                    current['last_accessed'] = now
+                    self._entries.move_to_end(key)
+            entry['last_accessed'] = now
+            return entry
+        if key.startswith('.') or not os.path.isfile(self.path(shard_name(key))):
+            return None
+        try:
+            self.add(shard_name(key))
+        except OSError:  # Removed again in the meantime
+            return None
+        return self.lookup(key)
+
+    def touch(self, name):
+        """Mark an artifact as used; returns False if it is not in the store"""
+        return self.lookup(name) is not None
+
+    def __contains__(self, name):
+        with self._lock:
+            return artifact_id(name) in self._entries
+
+    def remove(self, name):
+        """Delete an artifact and forget it"""
+        entry = self._forget(artifact_id(name))
+        if entry is not None:
+            self._delete(entry['name'])
+
+    def request_sweep(self):
+        """Wake the eviction thread; returns immediately"""
+        self._wake.set()
+
+    def sweep(self, now=None):
+        """Evict expired and over-quota artifacts now; returns how many were removed"""
+        now = time.time() if now is None else now
+        victims = []
+        with self._lock:
+            while self._entries:
+                key, entry = next(iter(self._entries.items()))
+                if not (self._over_quota() or now - entry['last_accessed'] > self.ttl):
+                    break
+                # Another process sharing the directory may have used the file since
+                accessed = self._last_access(entry['name'])
+                if accessed is not None and accessed > entry['last_accessed']:
+                    entry['last_accessed'] = accessed
+                    self._entries.move_to_end(key)
+                    continue
+                del self._entries[key]
+                self._total_bytes -= entry['size']
+                victims.append(entry['name'])
+            self.evictions += len(victims)
+            self.sweeps += 1
+        # Files are deleted outside the lock so lookups never wait on the disk
+        for name in victims:
+            self._delete(name)
+            if self.on_evict is not None:
+                self.on_evict(name)
+        return len(victims)
+
+    def start(self):
+        """Start the eviction thread (once); it sweeps every sweep_interval or when woken"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='artifact-eviction', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'artifacts': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_count': self.max_count,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'evictions': self.evictions,
+                'sweeps': self.sweeps,
+            }
+
+    def _over_quota(self):
+        return self._total_bytes > self.max_bytes or len(self._entries) > self.max_count
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.sweep_interval)
+            self._wake.clear()
+            if not self._stopping.is_set():
+                self.sweep()
+            if self.on_sweep is not None:
+                self.on_sweep()
+
+    def _forget(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry['size']
+        return entry
+
+    def _record_access(self, name, now):
+        # The access time is kept in atime: mtime stays the version ETags and Last-Modified use
+        path = self.path(name)
+        os.utime(path, ns=(int(now * 1e9), os.stat(path).st_mtime_ns))
+
+    def _last_access(self, name):
+        try:
+            stat = os.stat(self.path(name))
+        except OSError:
+            return None
+        return max(stat.st_atime, stat.st_mtime)
+
+    def _delete(self, name):
+        try:
+            os.remove(self.path(name))
+        except OSError:
+            pass
+
+    def _scan(self):
+        entries = []
+        pending = ['']
+        while pending:
+            relative = pending.pop()
+            try:
+                with os.scandir(os.path.join(self.directory, relative)) as it:
+                    for entry in it:
+                        if entry.name.startswith('.'):
+                            continue
+                        name = os.path.join(relative, entry.name)
+                        if entry.is_dir():
+                            pending.append(name)
+                            continue
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((name, stat.st_size, stat.st_mtime,
+                                        max(stat.st_atime, stat.st_mtime)))
+            except OSError:
+                continue
+        for name, size, mtime, accessed in sorted(entries, key=lambda entry: entry[3]):
+            key = artifact_id(name)
+            self._entries[key] = {'name': name, 'download_name': key,
+                                  'size': size, 'created': mtime, 'last_accessed': accessed}
+            self._total_bytes += size
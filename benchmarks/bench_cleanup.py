@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Cost of a cleanup pass as the output directory grows: directory scan vs indexed store.
+
+The old /cleanup listed the directory and stat'ed every file on the request
+thread; the artifact store sweeps from the old end of its in-memory index,
+so a pass that finds little to evict costs the same for any number of files.
+
+Usage: python benchmarks/bench_cleanup.py [--sizes 1000,10000,50000] [--repeat R]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from artifact_store import ArtifactStore
+
+
+def legacy_cleanup(directory, max_age=3600):
+    """The previous /cleanup route body"""
+    current_time = time.time()
+    count = 0
+    for filename in os.listdir(directory):
+        filepath = os.path.join(directory, filename)
+        if os.path.isfile(filepath):
+            if current_time - os.path.getctime(filepath) > max_age:
+                os.remove(filepath)
+                count += 1
+    return count
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', default='1000,10000,50000')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'files':>8} {'directory scan':>15} {'store sweep':>12} {'store start':>12}")
+    for size in (int(value) for value in args.sizes.split(',')):
+        directory = tempfile.mkdtemp(prefix='bench_cleanup_')
+        try:
+            for i in range(size):
+                with open(os.path.join(directory, f'artifact_{i:06d}.pdf'), 'wb') as f:
+                    f.write(b'%PDF')
+            scan = best_of(lambda: legacy_cleanup(directory), args.repeat)
+            started = time.perf_counter()
+            store = ArtifactStore(directory, max_count=size)
+            load = time.perf_counter() - started
+            sweep = best_of(store.sweep, args.repeat)
+            print(f"{size:>8} {scan * 1000:12.2f} ms {sweep * 1000:9.3f} ms {load * 1000:9.2f} ms")
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
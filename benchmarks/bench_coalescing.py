@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Identical concurrent /convert requests: one shared render instead of one each.
+
+Fires N identical requests at the same moment (a dashboard refresh storm)
+in each request mode, with request coalescing on and off, and counts the
+renders that ran: conversions recorded by the engine for the synchronous
+and inline modes, distinct jobs for asynchronous mode. With coalescing every
+mode must render exactly once; the script exits with status 1 otherwise.
+
+Usage: python benchmarks/bench_coalescing.py [--requests N] [--slides N] [--format pptx]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+MODES = {
+    'sync': {},
+    'inline, cached': {'inline': True},
+    'inline, no disk': {'inline': True, 'cache': False},
+    'async': {'async': True},
+}
+
+
+def deck(marker, slides):
+    frames = ''.join(
+        f"\\begin{{frame}}{{Slide {i}}}\n\\begin{{itemize}}\n\\item {marker} point one\n"
+        f"\\item Point two\n\\end{{itemize}}\n\\end{{frame}}\n" for i in range(slides))
+    return f"\\documentclass{{beamer}}\n\\title{{Storm {marker}}}\n\\begin{{document}}\n{frames}\\end{{document}}\n"
+
+
+def storm(server, client, payload, requests):
+    """Send requests identical payloads at once; returns (seconds, renders, failures)"""
+    barrier = threading.Barrier(requests)
+    conversions = server.engine.stats()['conversions']
+
+    def send(_):
+        barrier.wait()
+        response = client.post('/convert', json=payload)
+        if payload.get('async'):
+            return response.status_code == 202 and response.get_json()['job_id']
+        return response.status_code == 200 and (payload.get('inline') or response.get_json()['success'])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=requests) as executor:
+        outcomes = list(executor.map(send, range(requests)))
+    elapsed = time.perf_counter() - started
+    failures = outcomes.count(False)
+    if payload.get('async'):
+        job_ids = {job_id for job_id in outcomes if job_id}
+        for job_id in job_ids:
+            while server.job_queue.get(job_id)['status'] not in ('finished', 'failed'):
+                time.sleep(0.01)
+        return time.perf_counter() - started, len(job_ids), failures
+    return elapsed, server.engine.stats()['conversions'] - conversions, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--slides', type=int, default=40)
+    parser.add_argument('--format', default='pptx')
+    args = parser.parse_args()
+
+    # The server creates its output directory relative to the working directory
+    os.chdir(tempfile.mkdtemp(prefix='bench_coalescing_'))
+    import server_app as server
+
+    server.app.config['JOB_QUEUE_SIZE'] = server.job_queue.max_pending = max(
+        server.job_queue.max_pending, args.requests)
+    server.engine.preload()
+    client = server.app.test_client()
+
+    print(f"{args.requests} identical {args.slides}-slide {args.format} requests at once\n")
+    print(f"{'mode':<17} {'coalescing':<11} {'renders':>8} {'failed':>7} {'time':>10}")
+    wrong = []
+    for mode, options in MODES.items():
+        for coalesce in (False, True):
+            server.app.config['COALESCE_REQUESTS'] = coalesce
+            # A new source for every run, so nothing is answered from the cache of an earlier one
+            marker = f"{mode}-{'on' if coalesce else 'off'}"
+            payload = dict(options, latex=deck(marker, args.slides), format=args.format)
+            elapsed, renders, failures = storm(server, client, payload, args.requests)
+            if coalesce and (renders != 1 or failures):
+                wrong.append(mode)
+            print(f"{mode:<17} {'on' if coalesce else 'off':<11} {renders:>8} {failures:>7} "
+                  f"{elapsed * 1000:7.0f} ms")
+
+    server.job_queue.shutdown()
+    if wrong:
+        print(f"\nMore than one render with coalescing on: {', '.join(wrong)}")
+        return 1
+    print("\nEvery mode rendered exactly once with coalescing on")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Repeated-download bandwidth benchmark for /download.
+
+Compares clients that re-fetch the whole artifact on every refresh (the old
+behaviour) with clients that revalidate using the content ETag, and a
+download interrupted halfway that is resumed with a Range request.
+
+Usage: python benchmarks/bench_download.py [--size-mb N] [--downloads N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+
+def run(client, label, url, downloads, headers_for):
+    transferred = 0
+    statuses = {}
+    start = time.perf_counter()
+    previous = None
+    for _ in range(downloads):
+        response = client.get(url, headers=headers_for(previous))
+        body = response.get_data()
+        transferred += len(body)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        if response.status_code == 200:
+            previous = response
+        response.close()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {transferred / (1024 * 1024):9.1f} MB sent  {elapsed * 1000:8.1f} ms  "
+          f"statuses {statuses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=float, default=8)
+    parser.add_argument('--downloads', type=int, default=50)
+    args = parser.parse_args()
+
+    # The server creates its output directory relative to the working directory
+    os.chdir(tempfile.mkdtemp(prefix='bench_download_'))
+    import server_app as server
+
+    name = server.artifact_store.new_name('pdf')
+    size = int(args.size_mb * 1024 * 1024)
+    with open(server.artifact_store.path(name), 'wb') as f:
+        f.write(os.urandom(size))
+    server.artifact_store.add(name, 'LaTeX_Presentation_English_benchmark.pdf')
+    filename = server.artifact_id(name)
+
+    client = server.app.test_client()
+    url = f'/download/{filename}'
+    print(f"Artifact: {args.size_mb:.1f} MB, {args.downloads} downloads per client\n")
+
+    run(client, "full re-download (before)", url, args.downloads, lambda previous: {})
+    run(client, "ETag revalidation (after)", url, args.downloads,
+        lambda previous: {'If-None-Match': previous.headers['ETag']} if previous else {})
+    run(client, "Last-Modified revalidation", url, args.downloads,
+        lambda previous: {'If-Modified-Since': previous.headers['Last-Modified']} if previous else {})
+
+    half = size // 2
+    response = client.get(url, headers={'Range': f'bytes={half}-'})
+    resumed = len(response.get_data())
+    print(f"\nResume from 50%: status {response.status_code}, "
+          f"{resumed / (1024 * 1024):.1f} MB sent instead of {size / (1024 * 1024):.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Convert latency after a one-frame edit: full re-render vs incremental re-render.
+
+Usage: python benchmarks/bench_incremental.py [--frames N] [--format F] [--repeat R]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from bench_parser import generate_deck
+from conversion_core import ConversionEngine
+from incremental_render import SlideArtifactStore
+
+
+def edit_frame(latex, generation):
+    """Change the text of the first frame, as an author touching one slide would"""
+    return latex.replace('Introductory text for frame 0', f'Edited ({generation}) text for frame 0', 1)
+
+
+def measure(label, convert, latex, frames, repeat):
+    best = float('inf')
+    for generation in range(1, repeat + 1):
+        source = edit_frame(latex, generation)
+        start = time.perf_counter()
+        convert(source)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {best * 1000:9.1f} ms  {frames / best:8.1f} frames/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--format', default='pptx', choices=('pptx',))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    output_dir = tempfile.mkdtemp(prefix='bench_incremental_')
+    slide_store = SlideArtifactStore(os.path.join(output_dir, '.slide_cache'))
+    full = ConversionEngine(output_dir=output_dir)
+    incremental = ConversionEngine(output_dir=output_dir, slide_store=slide_store)
+
+    latex = generate_deck(args.frames)
+    print(f"Deck: {args.frames} frames, format {args.format}, one frame edited per run\n")
+
+    def converter(engine):
+        return lambda source: engine.convert(source, format_type=args.format,
+                                             filename=f'deck.{args.format}')
+
+    measure("full re-render", converter(full), latex, args.frames, args.repeat)
+
+    start = time.perf_counter()
+    converter(incremental)(latex)
+    print(f"{'incremental, cold store':<28} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    measure("incremental, one frame", converter(incremental), latex, args.frames, args.repeat)
+    print(f"\nSlide store: {slide_store.stats()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""End-to-end latency of small-deck conversions: download link vs inline response.
+
+A real HTTP server runs on a local port. The link mode posts to /convert and
+then fetches /download/<id> (two requests, the output written to and read
+back from disk); inline mode gets the file in the /convert response, with the
+result cached on disk or rendered without touching disk at all. Every
+request converts a new source, so the conversion cache never answers.
+
+Usage: python benchmarks/bench_inline.py [--requests N] [--slides N] [--formats pptx,pdf,pdf_fast]
+"""
+import argparse
+import http.client
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+
+def small_deck(slides, marker):
+    frames = ''.join(
+        f"\\begin{{frame}}{{Slide {i} {marker}}}\n\\begin{{itemize}}\n\\item Point one\n\\item Point two\n"
+        f"\\end{{itemize}}\n\\end{{frame}}\n" for i in range(slides))
+    return f"\\documentclass{{beamer}}\n\\title{{Deck {marker}}}\n\\begin{{document}}\n{frames}\\end{{document}}\n"
+
+
+def request(port, method, path, body=None):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    connection.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+    response = connection.getresponse()
+    data = response.read()
+    connection.close()
+    if response.status != 200:
+        raise RuntimeError(f"{method} {path} answered {response.status}: {data[:200]!r}")
+    return response, data
+
+
+def via_link(port, payload):
+    _, body = request(port, 'POST', '/convert', payload)
+    result = json.loads(body)
+    if not result.get('success'):
+        raise RuntimeError(result.get('error'))
+    return len(request(port, 'GET', result['download_url'])[1])
+
+
+def inline(cache):
+    def convert(port, payload):
+        return len(request(port, 'POST', '/convert', dict(payload, inline=True, cache=cache))[1])
+    return convert
+
+
+def measure(port, mode, format_type, args, run_id):
+    times = []
+    size = 0
+    for i in range(args.requests):
+        payload = {'latex': small_deck(args.slides, f'{run_id}-{i}'), 'format': format_type}
+        started = time.perf_counter()
+        size = mode(port, payload)
+        times.append(time.perf_counter() - started)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.95) - 1 if len(times) > 1 else 0], size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--slides', type=int, default=5)
+    parser.add_argument('--formats', default='pptx,pdf,pdf_fast')
+    args = parser.parse_args()
+
+    # The server creates its output directory relative to the working directory
+    os.chdir(tempfile.mkdtemp(prefix='bench_inline_'))
+    import server_app as server
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    http_server = make_server('127.0.0.1', 0, server.app, threaded=True, request_handler=QuietHandler)
+    port = http_server.server_port
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    server.engine.preload()
+
+    modes = [
+        ('link + /download', via_link),
+        ('inline, cached', inline(True)),
+        ('inline, no disk', inline(False)),
+    ]
+    print(f"{args.slides}-slide decks, {args.requests} requests per row, new source every request\n")
+    print(f"{'format':<9} {'mode':<18} {'median':>9} {'p95':>9} {'size':>9}")
+    for format_type in args.formats.split(','):
+        # One unmeasured conversion per format warms up the renderers
+        via_link(port, {'latex': small_deck(args.slides, f'warmup-{format_type}'), 'format': format_type})
+        for label, mode in modes:
+            median, p95, size = measure(port, mode, format_type, args, f'{format_type}-{label}')
+            print(f"{format_type:<9} {label:<18} {median * 1000:6.1f} ms {p95 * 1000:6.1f} ms "
+                  f"{size / 1024:6.1f} KB")
+
+    http_server.shutdown()
+    server.job_queue.shutdown()
+
+
+if __name__ == '__main__':
+    main()
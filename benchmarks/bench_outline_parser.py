@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Desktop app outline parser: single-scan lexer vs the old multi-regex parser.
+
+Checks that both parsers agree on the regression corpus (benchmarks/outline_corpus
+and the .tex files in attached_assets), then times them on generated inputs
+of 1 to 50 MB, including adversarial ones that make the old patterns
+backtrack.
+
+Usage: python benchmarks/bench_outline_parser.py [--sizes MB ...] [--legacy-max MB]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from latex_outline_parser import parse_outline
+
+CORPUS_PATTERNS = (
+    os.path.join(REPO_DIR, 'benchmarks', 'outline_corpus', '*.tex'),
+    os.path.join(REPO_DIR, 'attached_assets', '*.tex'),
+)
+
+
+def legacy_parse_outline(content):
+    """The parser previously inlined in LatexConverterApp.parse_latex_content"""
+    title_match = re.search(r'\\title\{([^}]+)\}', content)
+    title = title_match.group(1) if title_match else "Presentation"
+    sections = re.findall(r'\\section\{([^}]+)\}', content)
+    subsections = []
+    subsection_pattern = r'\\subsection\{([^}]+)\}(.*?)(?=\\subsection|\\section|\\end\{document\})'
+    for match in re.findall(subsection_pattern, content, re.DOTALL):
+        subsection_content = match[1].strip()
+        bullets = re.findall(r'\\item\s+([^\n\\]+)', subsection_content)
+        subsections.append({'title': match[0], 'content': subsection_content, 'bullets': bullets})
+    return {'title': title, 'sections': sections, 'subsections': subsections}
+
+
+def check_corpus():
+    paths = sorted(path for pattern in CORPUS_PATTERNS for path in glob.glob(pattern))
+    failures = 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        ok = parse_outline(content) == legacy_parse_outline(content)
+        failures += not ok
+        print(f"  {'ok  ' if ok else 'FAIL'} {os.path.relpath(path, REPO_DIR)}")
+    return failures
+
+
+def generate_document(size_mb):
+    """A realistic article: sections of subsections with itemized bullets"""
+    parts = ["\\documentclass{article}\n\\title{Generated}\n\\begin{document}\n"]
+    size = 0
+    i = 0
+    while size < size_mb * 1024 * 1024:
+        chunk = (
+            f"\\section{{Section {i}}}\n"
+            f"\\subsection{{Subsection {i}}}\n"
+            f"Some introductory text for subsection {i} with \\emph{{markup}}.\n"
+            "\\begin{itemize}\n"
+            f"    \\item First point of {i}\n"
+            "    \\item Second point with a longer description that keeps going\n"
+            "    \\item \\textbf{Bold} third point\n"
+            "\\end{itemize}\n\n"
+        )
+        parts.append(chunk)
+        size += len(chunk)
+        i += 1
+    parts.append("\\end{document}\n")
+    return ''.join(parts)
+
+
+def generate_unterminated(size_mb):
+    """Many \\subsection{ openers without a closing brace: [^}]+ rescans to the end each time"""
+    unit = "\\subsection{ open argument without a closing brace\n"
+    return unit * int(size_mb * 1024 * 1024 / len(unit))
+
+
+def generate_long_subsection(size_mb):
+    """One huge subsection whose body is mostly blank lines after \\item"""
+    unit = "\\item\n\n\n\n\n\n\n\n\n\n\n\n"
+    return ("\\subsection{Long}\n" + unit * int(size_mb * 1024 * 1024 / len(unit))
+            + "\\end{document}\n")
+
+
+def timed(func, content):
+    start = time.perf_counter()
+    func(content)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=float, nargs='+', default=[1, 5, 10, 25, 50])
+    parser.add_argument('--legacy-max', type=float, default=10,
+                        help='largest input (MB) to run the old parser on')
+    args = parser.parse_args()
+
+    print("Regression corpus (single-scan vs multi-regex):")
+    failures = check_corpus()
+    if failures:
+        print(f"\n{failures} corpus file(s) differ")
+        sys.exit(1)
+
+    # (label, generator, whether the old patterns are quadratic on it)
+    generators = [
+        ("article", generate_document, False),
+        ("unterminated args", generate_unterminated, True),
+        ("long subsection", generate_long_subsection, False),
+    ]
+    for label, generate, quadratic in generators:
+        print(f"\n{label}:")
+        for size_mb in args.sizes:
+            content = generate(size_mb)
+            actual_mb = len(content.encode('utf-8')) / (1024 * 1024)
+            new = timed(parse_outline, content)
+            line = f"  {actual_mb:6.1f} MB  single-scan {new * 1000:9.1f} ms ({actual_mb / new:7.1f} MB/s)"
+            if size_mb <= args.legacy_max and not quadratic:
+                old = timed(legacy_parse_outline, content)
+                line += f"  multi-regex {old * 1000:9.1f} ms ({actual_mb / old:7.1f} MB/s)"
+            print(line)
+        if quadratic:
+            # Only feasible on a small input for the old patterns
+            small = generate(0.1)
+            print(f"     0.1 MB  multi-regex {timed(legacy_parse_outline, small) * 1000:9.1f} ms"
+                  f"  single-scan {timed(parse_outline, small) * 1000:9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Scaling of chunked parallel rendering over 1, 2, 4 and 8 worker processes.
+
+Usage: python benchmarks/bench_parallel_render.py [--frames N] [--chunk-size C] [--repeat R]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from bench_parser import generate_deck
+from conversion_core import ConversionEngine
+from parallel_render import ParallelRenderer, pdf_merge_available
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+def measure(render, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=500)
+    parser.add_argument('--chunk-size', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    output_dir = tempfile.mkdtemp(prefix='bench_parallel_')
+    slides = ConversionEngine().parse(generate_deck(args.frames))
+    print(f"Deck: {args.frames} frames, {len(slides)} slides, chunks of {args.chunk_size}, "
+          f"{os.cpu_count()} CPUs\n")
+    if not pdf_merge_available():
+        print("pypdf is not installed: PDF formats render without splitting\n")
+
+    for fmt in ('pptx', 'pdf', 'pdf_fast'):
+        baseline = None
+        for workers in WORKER_COUNTS:
+            renderer = ParallelRenderer(max_workers=workers, chunk_size=args.chunk_size)
+            engine = ConversionEngine(output_dir=output_dir, parallel_renderer=renderer)
+            # Warm the pool so process start-up is not counted
+            renderer.map(len, slides)
+            path = os.path.join(output_dir, f"{fmt}_{workers}.{fmt.split('_')[0]}")
+            elapsed = measure(lambda: engine.render(slides, fmt, path), args.repeat)
+            baseline = baseline or elapsed
+            print(f"{fmt:<9} {workers} workers {elapsed * 1000:9.1f} ms  "
+                  f"{len(slides) / elapsed:8.1f} slides/s  x{baseline / elapsed:4.2f}")
+            renderer.shutdown()
+        print()
+
+if __name__ == '__main__':
+    main()
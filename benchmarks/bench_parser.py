@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Throughput benchmark: streaming LaTeX parser vs the old line-splitting parser.
+
+Exits with status 1 if the streaming parser is slower than the legacy one on
+the same in-memory source.
+
+Usage: python benchmarks/bench_parser.py [--frames N] [--repeat R]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from latex_stream_parser import parse_slides
+
+
+def legacy_parse_latex(latex_code):
+    """The line-splitting parser previously used by LaTeXToPresentationConverter"""
+    slides = []
+    lines = latex_code.split('\n')
+    in_frame = False
+    in_itemize = False
+    frame_title = ""
+    frame_content = []
+
+    for line in lines:
+        line = line.strip()
+        if line.startswith('\\title{'):
+            title = line.replace('\\title{', '').replace('}', '')
+            slides.append({'type': 'title', 'title': title, 'content': []})
+        elif line.startswith('\\author{'):
+            author = line.replace('\\author{', '').replace('}', '')
+            if slides and slides[-1]['type'] == 'title':
+                slides[-1]['author'] = author
+        elif line.startswith('\\begin{frame}'):
+            in_frame = True
+            frame_content = []
+            if '{' in line:
+                frame_title = line.split('{', 2)[-1].replace('}', '')
+            else:
+                frame_title = "Slide"
+        elif line.startswith('\\end{frame}'):
+            if in_frame:
+                slides.append({'type': 'content', 'title': frame_title,
+                               'content': frame_content.copy()})
+            in_frame = False
+            in_itemize = False
+        elif line.startswith('\\begin{itemize}') and in_frame:
+            in_itemize = True
+        elif line.startswith('\\end{itemize}') and in_frame:
+            in_itemize = False
+        elif line.startswith('\\item') and in_frame and in_itemize:
+            frame_content.append({'type': 'bullet', 'text': line.replace('\\item', '').strip()})
+        elif in_frame and line and not line.startswith('\\'):
+            frame_content.append({'type': 'text', 'text': line})
+    return slides
+
+
+def generate_deck(frames):
+    """Generate a synthetic Beamer deck with the given number of frames"""
+    parts = ["\\documentclass{beamer}\n\\title{Benchmark Deck}\n\\author{Bench}\n\\begin{document}\n"]
+    for i in range(frames):
+        parts.append(
+            f"% Frame {i}\n"
+            f"\\begin{{frame}}{{Frame number {i}}}\n"
+            f"    Introductory text for frame {i} with some words in it.\n"
+            f"    \\begin{{block}}{{Block {i}}}\n"
+            f"    \\begin{{itemize}}\n"
+            f"        \\item \\textbf{{Point one}} of frame {i}, about 50\\% of the story\n"
+            f"        \\item Point two with a longer description that keeps going\n"
+            f"        \\item Point three\n"
+            f"        \\item Point four referencing \\cite{{ref{i}}}\n"
+            f"    \\end{{itemize}}\n"
+            f"    \\end{{block}}\n"
+            f"\\end{{frame}}\n\n"
+        )
+    parts.append("\\end{document}\n")
+    return ''.join(parts)
+
+
+def measure(label, func, source, size_mb, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        slides = func(source)
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<34} {best * 1000:9.1f} ms  {size_mb / best:7.2f} MB/s  ({len(slides)} slides)")
+    return best
+
+
+def peak_memory(func, source):
+    tracemalloc.start()
+    func(source)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    source = generate_deck(args.frames)
+    size_mb = len(source.encode('utf-8')) / (1024 * 1024)
+    print(f"Deck: {args.frames} frames, {size_mb:.2f} MB\n")
+
+    legacy = measure("legacy line-splitting parser", legacy_parse_latex, source, size_mb, args.repeat)
+    streaming = measure("streaming parser (str)", parse_slides, source, size_mb, args.repeat)
+    measure("streaming parser (file object)",
+            lambda text: parse_slides(io.StringIO(text)), source, size_mb, args.repeat)
+
+    print("\nPeak traced memory while parsing (excluding the source string):")
+    print(f"  legacy:    {peak_memory(legacy_parse_latex, source):8.2f} MB")
+    print(f"  streaming: {peak_memory(parse_slides, source):8.2f} MB")
+
+    if streaming > legacy:
+        print(f"\nThe streaming parser is {streaming / legacy:.2f}x slower than the legacy parser")
+        return 1
+    print(f"\nThe streaming parser takes {streaming / legacy:.2f}x the time of the legacy parser")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
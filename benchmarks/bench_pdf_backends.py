@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Pages/second of the platypus PDF path vs the direct canvas ('pdf_fast') path.
+
+Usage: python benchmarks/bench_pdf_backends.py [--frames N] [--repeat R]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from bench_parser import generate_deck
+from conversion_core import ConversionEngine
+from pdf_styles import get_pdf_styles
+
+
+def measure(label, render, pages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        filename = render()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<22} {best * 1000:9.1f} ms  {pages / best:8.1f} pages/s  ({filename})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    output_dir = tempfile.mkdtemp(prefix='bench_pdf_')
+    engine = ConversionEngine(output_dir=output_dir)
+    slides = engine.parse(generate_deck(args.frames))
+    pages = len(slides)
+    print(f"Deck: {args.frames} frames, {pages} pages\n")
+
+    # Register fonts and styles up front; both paths share them
+    get_pdf_styles()
+
+    def render(format_type, filename):
+        engine.render(slides, format_type, os.path.join(output_dir, filename))
+        return filename
+
+    measure("platypus (pdf)", lambda: render('pdf', 'platypus.pdf'), pages, args.repeat)
+    measure("canvas (pdf_fast)", lambda: render('pdf_fast', 'canvas.pdf'), pages, args.repeat)
+
+if __name__ == '__main__':
+    main()
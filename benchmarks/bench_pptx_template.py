@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Time per small PPTX deck with Presentation() vs the shared template pool.
+
+Also reports the memory a long-running server keeps after many renders
+(retained) and the transient peak while rendering.
+
+Usage: python benchmarks/bench_pptx_template.py [--decks N]
+"""
+import argparse
+import gc
+import io
+import os
+import tracemalloc
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation
+
+from pptx_templates import new_presentation, template_pool
+
+
+def render_small_deck(prs):
+    for i in range(3):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {i}"
+        slide.placeholders[1].text_frame.text = "A bullet point"
+    prs.save(io.BytesIO())
+
+
+def measure(label, factory, decks):
+    start = time.perf_counter()
+    for _ in range(decks):
+        render_small_deck(factory())
+    elapsed = time.perf_counter() - start
+    print(f"{label:<26} {elapsed / decks * 1000:7.2f} ms/deck")
+
+
+def measure_memory(label, factory, decks):
+    gc.collect()
+    tracemalloc.start()
+    for _ in range(decks):
+        render_small_deck(factory())
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<26} retained {retained / 1024:8.1f} KB   peak {peak / (1024 * 1024):6.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--decks', type=int, default=300)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    template_pool.preload()
+    print(f"Template preload: {(time.perf_counter() - start) * 1000:.2f} ms (once per process)\n")
+
+    # Warm up lxml and python-pptx so the first measurement does not pay for imports
+    render_small_deck(Presentation())
+    render_small_deck(new_presentation())
+
+    measure("template pool copy", new_presentation, args.decks)
+    measure("Presentation() per deck", Presentation, args.decks)
+
+    print(f"\nMemory over {args.decks // 10} decks:")
+    measure_memory("template pool copy", new_presentation, args.decks // 10)
+    measure_memory("Presentation() per deck", Presentation, args.decks // 10)
+
+
+if __name__ == '__main__':
+    main()
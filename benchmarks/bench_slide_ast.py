@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Memory per frame and load time: slide AST with binary files vs plain dicts.
+
+Usage: python benchmarks/bench_slide_ast.py [--frames N] [--repeat R]
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parser import generate_deck
+from latex_stream_parser import parse_slides
+from slide_ast import dump_slides, load_slides
+
+
+def retained_memory(build):
+    """Bytes still allocated by the object graph build() returns"""
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def measure(label, load, frames, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {best * 1000:9.1f} ms  {best * 1e6 / frames:7.2f} us/frame")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    source = generate_deck(args.frames)
+    slides = parse_slides(source)
+    dicts = [slide.to_dict() for slide in slides]
+    print(f"Deck: {args.frames} frames, {len(slides)} slides\n")
+
+    directory = tempfile.mkdtemp(prefix='bench_slide_ast_')
+    json_path = os.path.join(directory, 'deck.json')
+    pickle_path = os.path.join(directory, 'deck.pickle')
+    ast_path = os.path.join(directory, 'deck.ast')
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(dicts, f, ensure_ascii=False)
+    with open(pickle_path, 'wb') as f:
+        pickle.dump(dicts, f, protocol=pickle.HIGHEST_PROTOCOL)
+    dump_slides(slides, ast_path)
+
+    def load_json():
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_pickle():
+        with open(pickle_path, 'rb') as f:
+            return pickle.load(f)
+
+    print("Memory per frame (retained by the loaded deck):")
+    for label, load in (("dicts (json)", load_json), ("dicts (pickle)", load_pickle),
+                        ("slide AST (binary)", lambda: load_slides(ast_path))):
+        print(f"  {label:<26} {retained_memory(load) / args.frames:8.1f} bytes")
+
+    print("\nFile size:")
+    for label, path in (("json", json_path), ("pickle", pickle_path), ("binary AST", ast_path)):
+        print(f"  {label:<26} {os.path.getsize(path) / 1024:8.1f} KB")
+
+    print("\nLoad time:")
+    measure("re-parse LaTeX source", lambda: parse_slides(source), args.frames, args.repeat)
+    measure("dicts from json", load_json, args.frames, args.repeat)
+    measure("dicts from pickle", load_pickle, args.frames, args.repeat)
+    measure("slide AST from binary (mmap)", lambda: load_slides(ast_path), args.frames, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Cold start of the entry points against recorded targets, and the cost of lazy loading.
+
+Each entry point module is imported in a fresh interpreter; the median wall
+time (interpreter start included) is compared with STARTUP_TARGETS_MS. The
+second table shows what lazy imports move to the first conversion and what a
+background preload takes back.
+
+Usage: python benchmarks/bench_startup.py [--repeat R] [--check]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from startup_profile import HEAVY_MODULES
+
+# Interpreter start plus import, median of cold runs; python-pptx, ReportLab and
+# pypdf must not be among the imports
+STARTUP_TARGETS_MS = {
+    'server_app': 400,
+    'latex_converter_app': 150,
+    'conversion_core.cli': 150,
+}
+
+HEAVY_CHECK = (
+    "import sys; heavy = sorted({{m.split('.')[0] for m in sys.modules}} & set({heavy!r})); "
+    "print(','.join(heavy))"
+)
+
+FIRST_CONVERSION = r"""
+import sys, tempfile, time
+started = time.perf_counter()
+from conversion_core import ConversionEngine
+engine = ConversionEngine(tempfile.mkdtemp())
+if {preload}:
+    engine.preload()
+ready = time.perf_counter()
+source = r'\begin{{document}}\title{{T}}\maketitle\begin{{frame}}{{A}}\begin{{itemize}}\item x\end{{itemize}}\end{{frame}}\end{{document}}'
+engine.convert(source, format_type={format!r}, filename='deck')
+print(ready - started, time.perf_counter() - ready)
+"""
+
+
+def run_python(code):
+    completed = subprocess.run([sys.executable, '-c', code], cwd=REPO_DIR,
+                               capture_output=True, text=True, check=True)
+    return completed.stdout.strip()
+
+
+def cold_import(module, repeat):
+    """Median wall time of importing module in a fresh interpreter, and the heavy modules it loaded"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', f'import {module}'], cwd=REPO_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    heavy = run_python(f'import {module}; ' + HEAVY_CHECK.format(heavy=HEAVY_MODULES))
+    return statistics.median(times), heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--check', action='store_true', help='exit 1 if a target is missed')
+    args = parser.parse_args()
+
+    print(f"{'entry point':<26} {'cold start':>11} {'target':>8}  heavy imports")
+    missed = []
+    for module, target_ms in STARTUP_TARGETS_MS.items():
+        try:
+            elapsed, heavy = cold_import(module, args.repeat)
+        except subprocess.CalledProcessError:
+            print(f"{module:<26} {'n/a':>11} {target_ms:>6} ms  (import failed)")
+            continue
+        ok = elapsed * 1000 <= target_ms and not heavy
+        if not ok:
+            missed.append(module)
+        print(f"{module:<26} {elapsed * 1000:8.1f} ms {target_ms:>5} ms  "
+              f"{heavy or 'none'}{'' if ok else '  MISSED'}")
+
+    print(f"\n{'first conversion':<26} {'setup':>11} {'convert':>10}")
+    for format_type in ('pptx', 'pdf'):
+        for preload in (False, True):
+            setup, convert = (float(value) for value in run_python(
+                FIRST_CONVERSION.format(preload=preload, format=format_type)).split())
+            label = f"{format_type}, {'preloaded' if preload else 'lazy'}"
+            print(f"{label:<26} {setup * 1000:8.1f} ms {convert * 1000:7.1f} ms")
+
+    if args.check and missed:
+        print(f"\nStartup targets missed: {', '.join(missed)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
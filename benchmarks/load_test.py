@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Load test for the HTTP server: requests per second and latency percentiles.
+
+Starts the server in a subprocess (the single-process development server
+that `python latex_converter_server.py` runs, the pre-fork production
+server, or both, one after the other) or targets a running one with --url.
+Client threads then post inline conversions of small decks as fast as they
+are answered for --duration seconds. A --repeat fraction of the requests
+reuses an earlier source, so it is answered from the conversion cache.
+
+Usage: python benchmarks/load_test.py [--server dev|prefork|both] [--url URL]
+       [--concurrency C] [--duration S] [--workers W] [--threads T] [--format pptx]
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What `python latex_converter_server.py` runs, without the reloader's second process
+DEV_SERVER = (
+    "import sys; sys.path.insert(0, {repo!r}); import server_app as server; "
+    "server.app.run(host='127.0.0.1', port={port}, debug=True, use_reloader=False)"
+)
+
+
+def small_deck(marker, slides=5):
+    frames = ''.join(
+        f"\\begin{{frame}}{{Slide {i} {marker}}}\n\\begin{{itemize}}\n\\item Point one\n\\item Point two\n"
+        f"\\end{{itemize}}\n\\end{{frame}}\n" for i in range(slides))
+    return f"\\documentclass{{beamer}}\n\\title{{Load {marker}}}\n\\begin{{document}}\n{frames}\\end{{document}}\n"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, args):
+    """Start a server in a fresh working directory; returns (process, port, directory)"""
+    port = free_port()
+    directory = tempfile.mkdtemp(prefix=f'load_test_{kind}_')
+    if kind == 'dev':
+        command = [sys.executable, '-c', DEV_SERVER.format(repo=REPO_DIR, port=port)]
+    else:
+        command = [sys.executable, os.path.join(REPO_DIR, 'prefork_server.py'), '--host', '127.0.0.1',
+                   '--port', str(port), '--workers', str(args.workers), '--threads', str(args.threads),
+                   '--chdir', directory]
+    process = subprocess.Popen(command, cwd=directory, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            status, _ = send('127.0.0.1', port, 'GET', '/cache/stats')
+            if status == 200:
+                return process, port, directory
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{kind} server did not start")
+
+
+def stop_server(process, directory):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def send(host, port, method, path, body=None):
+    connection = http.client.HTTPConnection(host, port, timeout=120)
+    try:
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        connection.request(method, path, body=json.dumps(body) if body is not None else None,
+                           headers=headers)
+        response = connection.getresponse()
+        response.read()
+        return response.status, response
+    finally:
+        connection.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float('nan')
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def run_load(host, port, args, label):
+    """Send requests from args.concurrency threads for args.duration seconds; returns the report line"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.warmup + args.duration
+    measure_from = time.monotonic() + args.warmup
+
+    def client(number):
+        rng = random.Random(number)
+        sent = 0
+        while time.monotonic() < deadline:
+            if sent and rng.random() < args.repeat:
+                marker = f'{label}-{number}-{rng.randrange(sent)}'
+            else:
+                marker = f'{label}-{number}-{sent}'
+            body = {'latex': small_deck(marker), 'format': args.format, 'inline': True}
+            started = time.monotonic()
+            try:
+                status, _ = send(host, port, 'POST', '/convert', body)
+            except OSError as e:
+                status = type(e).__name__
+            finished = time.monotonic()
+            sent += 1
+            if started < measure_from:
+                continue
+            with lock:
+                if status == 200:
+                    latencies.append(finished - started)
+                else:
+                    errors.append(status)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies.sort()
+    total = len(latencies) + len(errors)
+    return (f"{label:<24} {total:>8} {len(errors):>7} {len(latencies) / args.duration:9.1f} "
+            f"{percentile(latencies, 0.5) * 1000:8.1f} {percentile(latencies, 0.99) * 1000:8.1f} "
+            f"{(latencies[-1] if latencies else float('nan')) * 1000:8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--server', choices=('dev', 'prefork', 'both'), default='both')
+    parser.add_argument('--url', help='load an already running server instead of starting one')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--warmup', type=float, default=3, help='seconds of load before measuring')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--format', default='pptx')
+    parser.add_argument('--repeat', type=float, default=0.2,
+                        help='fraction of requests that repeat an earlier source (cache hits)')
+    args = parser.parse_args()
+
+    print(f"{args.concurrency} clients, {args.duration:g} s, inline {args.format} conversions of "
+          f"5-slide decks, {args.repeat:.0%} repeated\n")
+    print(f"{'server':<24} {'requests':>8} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    if args.url:
+        target = urlsplit(args.url)
+        print(run_load(target.hostname, target.port or 80, args, target.netloc))
+        return 0
+
+    kinds = ('dev', 'prefork') if args.server == 'both' else (args.server,)
+    for kind in kinds:
+        process, port, directory = start_server(kind, args)
+        try:
+            label = 'dev server' if kind == 'dev' else f'prefork {args.workers}w x {args.threads}t'
+            print(run_load('127.0.0.1', port, args, label), flush=True)
+        finally:
+            stop_server(process, directory)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
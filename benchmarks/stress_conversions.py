@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Concurrency stress check: hundreds of parallel /convert requests, no lost or corrupted outputs.
+
+Every request converts a deck with a unique marker in its frame title
+(a few sources are repeated to exercise the conversion cache), some through
+asynchronous jobs. Afterwards every output is downloaded and checked: ids
+must be distinct for distinct sources, each file must be a complete PPTX
+or PDF containing its own marker, and no temporary files may be left.
+Exits with status 1 on any failure.
+
+Usage: python benchmarks/stress_conversions.py [--requests N] [--threads T]
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+DECK = r"""\documentclass{beamer}
+\title{Stress}
+\begin{document}
+\begin{frame}{Marker %s}
+\begin{itemize}
+\item Request %s
+\end{itemize}
+\end{frame}
+\end{document}
+"""
+FORMATS = ('pptx', 'pdf', 'pdf_fast')
+
+
+def contains_marker(body, format_type, marker):
+    """Whether a downloaded output is a complete file of its format that mentions marker"""
+    if format_type == 'pptx':
+        try:
+            with zipfile.ZipFile(io.BytesIO(body)) as archive:
+                return any(marker.encode() in archive.read(name)
+                           for name in archive.namelist() if name.startswith('ppt/slides/slide'))
+        except zipfile.BadZipFile:
+            return False
+    if not (body.startswith(b'%PDF') and b'%%EOF' in body[-1024:]):
+        return False
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return True  # Structure checked above; text extraction needs pypdf
+    text = ''.join(page.extract_text() or '' for page in PdfReader(io.BytesIO(body)).pages)
+    return marker in text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--threads', type=int, default=32)
+    args = parser.parse_args()
+
+    # The server creates its output directory relative to the working directory
+    os.chdir(tempfile.mkdtemp(prefix='stress_conversions_'))
+    import server_app as server
+
+    client = server.app.test_client()
+    # Every tenth request repeats an earlier source, so it must come back from the cache
+    requests = []
+    for i in range(args.requests):
+        source_index = i - 5 if i % 10 == 9 else i
+        requests.append({
+            'marker': f'M{source_index:05d}',
+            'format': FORMATS[source_index % len(FORMATS)],
+            'async': i % 4 == 1,
+        })
+
+    def convert(request):
+        marker = request['marker']
+        while True:
+            response = client.post('/convert', json={'latex': DECK % (marker, marker),
+                                                     'format': request['format'],
+                                                     'async': request['async']})
+            if response.status_code != 429:
+                break
+            time.sleep(0.05)  # The job queue is full: back off like a real client
+        data = response.get_json()
+        if request['async']:
+            if response.status_code != 202:
+                return None, f"{marker}: job not accepted: {data}"
+            while True:
+                job = client.get(data['status_url']).get_json()
+                if job['status'] in ('finished', 'failed'):
+                    break
+                time.sleep(0.02)
+            if job['status'] == 'failed':
+                return None, f"{marker}: job failed: {job['error']}"
+            return data['result_url'], None
+        if not data.get('success'):
+            return None, f"{marker}: {data.get('error')}"
+        return data['download_url'], None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        outcomes = list(executor.map(convert, requests))
+    elapsed = time.perf_counter() - started
+
+    failures = [error for _, error in outcomes if error]
+    urls_by_marker = {}
+    for request, (url, error) in zip(requests, outcomes):
+        if error:
+            continue
+        body = client.get(url)
+        if body.status_code != 200:
+            failures.append(f"{request['marker']}: download {url} answered {body.status_code}")
+        elif not contains_marker(body.get_data(), request['format'], request['marker']):
+            failures.append(f"{request['marker']}: {url} is corrupted or belongs to another request")
+        urls_by_marker.setdefault(request['marker'], set()).add(url)
+
+    # Distinct sources must never share an output file (sync ids and job results differ in form)
+    ids = {}
+    for marker, urls in urls_by_marker.items():
+        for url in urls:
+            if url.startswith('/download/'):
+                owner = ids.setdefault(url, marker)
+                if owner != marker:
+                    failures.append(f"{marker} and {owner} were both given {url}")
+
+    leftovers = [os.path.join(root, name)
+                 for root, _, files in os.walk(server.app.config['UPLOAD_FOLDER'])
+                 for name in files if name.endswith('.tmp')]
+    failures.extend(f"temporary file left behind: {path}" for path in leftovers)
+
+    server.job_queue.shutdown()
+    stats = server.artifact_store.stats()
+    print(f"{args.requests} conversions on {args.threads} threads in {elapsed:.2f} s "
+          f"({args.requests / elapsed:.0f} requests/s); {stats['artifacts']} artifacts stored, "
+          f"{server.conversion_cache.stats()['hits']} cache hits")
+    if failures:
+        print(f"{len(failures)} failures:")
+        for failure in failures[:20]:
+            print(f"  {failure}")
+        return 1
+    print("No lost or corrupted outputs")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,44 +1,273 @@
-
 #!/usr/bin/env python3
-import subprocess
+"""Compile .tex files to PDF with pdflatex, concurrently and with a build cache.
+
+Every compilation runs in its own temporary directory next to the output
+(pdflatex is started with cwd and -output-directory there, the source
+directory is put on TEXINPUTS), so any number can run at once without
+changing the process working directory. pdflatex is rerun until the .aux
+file stops changing, so cross-references settle. A hash of the command, the
+source and the local files it pulls in (\\input, \\include, \\includegraphics,
+local packages and bibliographies) is stored next to each PDF; when it is
+unchanged the compilation is skipped. Errors and warnings are parsed out of
+the log.
+
+The compiler executable is taken from the PDFLATEX environment variable, so
+a stub can stand in for pdflatex.
+"""
+import argparse
+import hashlib
 import os
+import re
+import shutil
+import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_TEX_FILE = "attached_assets/AI_Trainer_Presentation_English_Final_1752049436735.tex"
+PDFLATEX = os.environ.get('PDFLATEX', 'pdflatex')
+MAX_RUNS = 4
+RUN_TIMEOUT = 120
+STAMP_SUFFIX = '.sha256'
+
+# \input{x}, \include{x}, \includegraphics[...]{x}, \usepackage[...]{a,b}, \bibliography{a,b}
+_DEPENDENCY = re.compile(
+    r'\\(input|include|includegraphics|usepackage|bibliography)\s*(?:\[[^\]]*\])?\s*\{([^}]*)\}')
+_DEPENDENCY_SUFFIXES = {
+    'input': ('', '.tex'),
+    'include': ('.tex',),
+    'includegraphics': ('', '.pdf', '.png', '.jpg', '.jpeg', '.eps'),
+    'usepackage': ('.sty',),
+    'bibliography': ('.bib',),
+}
+_COMMENT = re.compile(r'(?<!\\)%.*')
+
+# -file-line-error messages: ./deck.tex:12: Undefined control sequence.
+_FILE_LINE_ERROR = re.compile(r'^(.*?):(\d+): (.*)$')
+_ERROR_LINE = re.compile(r'^l\.(\d+)')
+_WARNING = re.compile(r'^((?:LaTeX|Package \S+|Class \S+) Warning: .*)$')
+
+
+def find_dependencies(tex_file):
+    """Return the local files tex_file pulls in, recursively, as sorted absolute paths.
+
+    References that resolve to no file (TeX distribution packages, missing
+    files) are left out.
+    """
+    base_dir = os.path.dirname(os.path.abspath(tex_file))
+    found = set()
+    pending = [os.path.abspath(tex_file)]
+    while pending:
+        path = pending.pop()
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                source = _COMMENT.sub('', f.read())
+        except OSError:
+            continue
+        for command, names in _DEPENDENCY.findall(source):
+            for name in names.split(','):
+                name = name.strip()
+                if not name:
+                    continue
+                for suffix in _DEPENDENCY_SUFFIXES[command]:
+                    candidate = os.path.join(base_dir, name + suffix)
+                    if os.path.isfile(candidate):
+                        if candidate not in found:
+                            found.add(candidate)
+                            if candidate.endswith(('.tex', '.sty')):
+                                pending.append(candidate)
+                        break
+    return sorted(found)
+
+
+def source_hash(tex_file, command=PDFLATEX):
+    """Hash the compiler command, the source and its local dependencies"""
+    base_dir = os.path.dirname(os.path.abspath(tex_file))
+    digest = hashlib.sha256()
+    digest.update(f"{command}\0{MAX_RUNS}\0".encode('utf-8'))
+    for path in [os.path.abspath(tex_file), *find_dependencies(tex_file)]:
+        digest.update(os.path.relpath(path, base_dir).encode('utf-8') + b'\0')
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def parse_log(log):
+    """Extract errors ({'file', 'line', 'message'}) and warnings from a pdflatex log"""
+    errors = []
+    warnings = []
+    lines = log.splitlines()
+    for index, line in enumerate(lines):
+        match = _FILE_LINE_ERROR.match(line)
+        if match and not line.startswith(' '):
+            errors.append({'file': match.group(1), 'line': int(match.group(2)),
+                           'message': match.group(3).strip()})
+            continue
+        if line.startswith('! '):
+            error = {'file': None, 'line': None, 'message': line[2:].strip()}
+            # The line number follows within a few lines as "l.<n> <context>"
+            for following in lines[index + 1:index + 12]:
+                line_match = _ERROR_LINE.match(following)
+                if line_match:
+                    error['line'] = int(line_match.group(1))
+                    break
+            errors.append(error)
+            continue
+        match = _WARNING.match(line)
+        if match:
+            warnings.append(match.group(1))
+    return {'errors': errors, 'warnings': warnings}
+
 
-def compile_latex():
-    tex_file = "attached_assets/AI_Trainer_Presentation_English_Final_1752049436735.tex"
-    
-    if not os.path.exists(tex_file):
-        print(f"Error: {tex_file} not found!")
-        return False
-    
-    # Change to the directory containing the tex file
-    original_dir = os.getcwd()
-    tex_dir = os.path.dirname(tex_file)
-    tex_filename = os.path.basename(tex_file)
-    
+class LatexCompiler:
+    """Compiles .tex files to PDF, skipping sources whose hash is unchanged"""
+
+    def __init__(self, command=PDFLATEX, max_runs=MAX_RUNS, timeout=RUN_TIMEOUT, max_workers=None):
+        self.command = command
+        self.max_runs = max_runs
+        self.timeout = timeout
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def compile(self, tex_file, output_dir=None, force=False):
+        """Compile one file into output_dir (default: next to it); returns a result dict
+
+        The result has 'source', 'pdf', 'status' ('compiled', 'cached' or
+        'failed'), 'runs', 'errors', 'warnings' and 'seconds'.
+        """
+        started = time.perf_counter()
+        tex_file = os.path.abspath(tex_file)
+        output_dir = os.path.abspath(output_dir or os.path.dirname(tex_file))
+        jobname = os.path.splitext(os.path.basename(tex_file))[0]
+        pdf_path = os.path.join(output_dir, jobname + '.pdf')
+        result = {'source': tex_file, 'pdf': pdf_path, 'status': 'failed', 'runs': 0,
+                  'errors': [], 'warnings': [], 'seconds': 0.0}
+
+        try:
+            digest = source_hash(tex_file, self.command)
+        except OSError as e:
+            result['errors'].append({'file': tex_file, 'line': None, 'message': str(e)})
+            return self._finish(result, started)
+        stamp_path = pdf_path + STAMP_SUFFIX
+        if not force and os.path.exists(pdf_path) and _read_stamp(stamp_path) == digest:
+            result['status'] = 'cached'
+            return self._finish(result, started)
+
+        os.makedirs(output_dir, exist_ok=True)
+        work_dir = tempfile.mkdtemp(prefix=f'.{jobname}-', dir=output_dir)
+        try:
+            log = self._run_until_stable(tex_file, jobname, work_dir, result)
+            if log is not None:
+                result.update(parse_log(log))
+            built_pdf = os.path.join(work_dir, jobname + '.pdf')
+            if result['errors'] or not os.path.exists(built_pdf):
+                if log is not None:
+                    with open(os.path.join(output_dir, jobname + '.log'), 'w', encoding='utf-8') as f:
+                        f.write(log)
+                if not result['errors']:
+                    result['errors'].append({'file': tex_file, 'line': None,
+                                             'message': 'pdflatex produced no PDF'})
+                return self._finish(result, started)
+            os.replace(built_pdf, pdf_path)
+            with open(stamp_path, 'w') as f:
+                f.write(digest)
+            stale_log = os.path.join(output_dir, jobname + '.log')
+            if os.path.exists(stale_log):
+                os.remove(stale_log)  # Left behind by an earlier failed compilation
+            result['status'] = 'compiled'
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return self._finish(result, started)
+
+    def compile_many(self, tex_files, output_dir=None, force=False):
+        """Compile files concurrently; yields results in the order of tex_files"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from executor.map(lambda tex_file: self.compile(tex_file, output_dir, force),
+                                    tex_files)
+
+    def _run_until_stable(self, tex_file, jobname, work_dir, result):
+        """Run pdflatex until the .aux file stops changing; returns the last log or None"""
+        env = dict(os.environ)
+        # Resolve \input and graphics against the source directory, then the TeX defaults
+        env['TEXINPUTS'] = os.path.dirname(tex_file) + os.pathsep + env.get('TEXINPUTS', '')
+        args = [self.command, '-interaction=nonstopmode', '-halt-on-error', '-file-line-error',
+                f'-output-directory={work_dir}', f'-jobname={jobname}', tex_file]
+        aux_path = os.path.join(work_dir, jobname + '.aux')
+        log_path = os.path.join(work_dir, jobname + '.log')
+        previous_aux = None
+        log = None
+        for _ in range(self.max_runs):
+            try:
+                completed = subprocess.run(args, cwd=work_dir, env=env, stdin=subprocess.DEVNULL,
+                                           capture_output=True, timeout=self.timeout)
+            except FileNotFoundError:
+                result['errors'].append({'file': None, 'line': None,
+                                         'message': f'{self.command} not found'})
+                return None
+            except subprocess.TimeoutExpired:
+                result['errors'].append({'file': None, 'line': None,
+                                         'message': f'{self.command} timed out after {self.timeout} s'})
+                return None
+            result['runs'] += 1
+            try:
+                with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+                    log = f.read()
+            except OSError:
+                log = completed.stdout.decode('utf-8', errors='replace')
+            if completed.returncode != 0:
+                break
+            try:
+                with open(aux_path, 'rb') as f:
+                    aux = f.read()
+            except OSError:
+                break  # Nothing to resolve between runs
+            if aux == previous_aux:
+                break
+            previous_aux = aux
+        return log
+
+    def _finish(self, result, started):
+        result['seconds'] = time.perf_counter() - started
+        return result
+
+
+def _read_stamp(path):
     try:
-        os.chdir(tex_dir)
-        
-        # Compile with pdflatex
-        result = subprocess.run(['pdflatex', tex_filename], 
-                              capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            pdf_name = tex_filename.replace('.tex', '.pdf')
-            print(f"✅ Presentation compiled successfully!")
-            print(f"📄 PDF created: {os.path.join(tex_dir, pdf_name)}")
-            return True
-        else:
-            print("❌ Compilation failed:")
-            print(result.stdout)
-            print(result.stderr)
-            return False
-            
-    except FileNotFoundError:
-        print("❌ pdflatex not found. Installing LaTeX...")
-        return False
-    finally:
-        os.chdir(original_dir)
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def compile_latex(tex_files=(DEFAULT_TEX_FILE,), output_dir=None, force=False, max_workers=None):
+    """Compile tex_files and print a report; returns True if all of them succeeded"""
+    compiler = LatexCompiler(max_workers=max_workers)
+    ok = True
+    for result in compiler.compile_many(tex_files, output_dir, force):
+        if result['status'] == 'failed':
+            ok = False
+            print(f"❌ {result['source']}: compilation failed")
+            for error in result['errors']:
+                location = ':'.join(str(part) for part in (error['file'], error['line']) if part)
+                print(f"   {location + ': ' if location else ''}{error['message']}")
+            continue
+        runs = 'up to date' if result['status'] == 'cached' else f"{result['runs']} pdflatex runs"
+        print(f"✅ {result['pdf']} ({runs}, {result['seconds']:.2f} s)")
+        for warning in result['warnings']:
+            print(f"   ⚠️  {warning}")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compile LaTeX presentations to PDF with pdflatex.')
+    parser.add_argument('tex_files', nargs='*', default=[DEFAULT_TEX_FILE])
+    parser.add_argument('-o', '--output-dir', help='write PDFs here (default: next to each source)')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='files compiled at once (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='compile even if nothing changed')
+    args = parser.parse_args(argv)
+    return 0 if compile_latex(args.tex_files, args.output_dir, args.force, args.jobs) else 1
+
 
 if __name__ == "__main__":
-    compile_latex()
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Content-addressed cache of rendered presentations.
+
+Artifacts stay in the server's output directory; the cache only keeps an
+index (persisted as JSON next to the artifacts) that maps a hash of the
+conversion inputs to the file that was rendered for them.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+INDEX_FILENAME = '.conversion_cache.json'
+
+
+def conversion_key(latex_code, language, format_type, version):
+    """Hash the inputs that determine a rendered artifact"""
+    digest = hashlib.sha256()
+    digest.update(f"{version}\0{language}\0{format_type}\0".encode('utf-8'))
+    digest.update(latex_code.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """Size-bounded LRU cache of rendered artifacts with an on-disk index.
+
+    With an artifact_store (artifact_store.ArtifactStore), artifacts are
+    looked up in and removed through its index instead of the filesystem.
+    Hits only reorder the index in memory; it is written by put() and by
+    flush(), which the server calls from the artifact store's sweep thread.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 * 1024, artifact_store=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.artifact_store = artifact_store
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> entry, least recently used first
+        self._total_bytes = 0
+        self._dirty = False  # the index changed since it was last written
+        self._lock = threading.Lock()
+        self._load()
+
+    def get(self, key):
+        """Return the cached entry for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._exists(entry):
+                # The artifact was removed behind our back (e.g. evicted by the artifact store)
+                self._drop(key)
+                self._dirty = True
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry['last_used'] = time.time()
+            self._entries.move_to_end(key)
+            self._dirty = True
+            return dict(entry)
+
+    def put(self, key, filename, slides_count):
+        """Record a freshly rendered artifact and evict old ones past the size limit"""
+        path = os.path.join(self.directory, filename)
+        entry = {
+            'filename': filename,
+            'size': os.path.getsize(path),
+            'slides_count': slides_count,
+            'last_used': time.time(),
+        }
+        with self._lock:
+            # Artifact names are unique, so only an earlier entry for key can be replaced
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = entry
+            self._total_bytes += entry['size']
+            self._evict()
+            self._save()
+
+    def flush(self):
+        """Write the index if lookups changed it since it was last written"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _path(self, entry):
+        return os.path.join(self.directory, entry['filename'])
+
+    def _exists(self, entry):
+        if self.artifact_store is not None:
+            # A cache hit is a use of the artifact, so it also refreshes it in the store;
+            # the store confirms the file is still on disk (other processes evict too)
+            return self.artifact_store.touch(entry['filename'])
+        return os.path.exists(self._path(entry))
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry['size']
+        return entry
+
+    def _evict(self):
+        # Never evict the most recently added entry, even if it alone is too big
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            entry = self._drop(key)
+            self.evictions += 1
+            if self.artifact_store is not None:
+                self.artifact_store.remove(entry['filename'])
+                continue
+            try:
+                os.remove(self._path(entry))
+            except OSError:
+                pass
+
+    def _load(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, entry in sorted(entries.items(), key=lambda item: item[1].get('last_used', 0)):
+            # Only checks the file: loading the index is not a use of its artifacts
+            if os.path.exists(self._path(entry)):
+                self._entries[key] = entry
+                self._total_bytes += entry['size']
+        self._evict()
+
+    def _save(self):
+        # Several server processes may share the directory, so each writes its own temporary file
+        tmp_path = f'{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
@@ -0,0 +1,22 @@
+"""Conversion engine shared by the Flask server, the desktop app and the CLI.
+
+A conversion is parse -> (translate) -> render: a pluggable parser turns
+LaTeX source into the slide AST of ``slide_ast`` and a pluggable backend
+renders the slides to PPTX or PDF. ``ConversionEngine`` wires in the shared
+machinery (parsed-deck cache, per-slide artifact store, parallel renderer)
+and records timings, so every front end gets the same behaviour.
+
+Importing the package is cheap: python-pptx, ReportLab, Flask and Tk are
+only imported by the code paths that need them.
+"""
+from conversion_core.backends import (Backend, BACKENDS, OUTPUT_FORMATS, register_backend,
+                                      normalize_format, file_extension, mime_type, preload_backends)
+from conversion_core.engine import ConversionEngine
+from conversion_core.parsers import PARSERS, register_parser, parse_source
+
+__all__ = [
+    'Backend', 'BACKENDS', 'OUTPUT_FORMATS', 'register_backend', 'normalize_format', 'file_extension',
+    'mime_type', 'preload_backends',
+    'ConversionEngine',
+    'PARSERS', 'register_parser', 'parse_source',
+]
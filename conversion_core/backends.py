@@ -0,0 +1,360 @@
+"""Output backends: render a list of slide_ast.Slide objects to a file.
+
+Every backend can render a whole deck in one pass. Backends that can also
+render runs of slides into self-contained parts and stitch those parts
+together (``render_part`` / ``assemble``) get parallel rendering of large
+decks from the engine, and incremental re-rendering (one part per slide)
+when per-slide parts are cheap enough to be worth keeping.
+"""
+from slide_ast import TITLE, CONTENT, BULLET
+
+BACKENDS = {}
+
+
+class Backend:
+    """Base class; subclasses set name and extension and implement render()"""
+
+    name = None
+    extension = None
+    mimetype = 'application/octet-stream'
+    # Only the first slide of a deck may be rendered as a title slide
+    leading_title_only = True
+    # Whether output depends on the engine's .pptx template
+    uses_template = False
+    # Whether one-slide parts are cheap to assemble, so slides can be cached individually
+    incremental = False
+
+    def render(self, slides, output, template=None, title=None, on_slide=None):
+        """Render the whole deck to output (a path or a binary file object).
+
+        on_slide, if given, is called with the 1-based number of each slide
+        once it has been rendered.
+        """
+        raise NotImplementedError
+
+    def preload(self, template=None):
+        """Import and set up the rendering libraries ahead of the first render"""
+
+    def renderable(self, slides):
+        """The slides that produce output, in order"""
+        if not self.leading_title_only:
+            return slides
+        return [slide for i, slide in enumerate(slides) if i == 0 or slide.type != TITLE]
+
+    def can_split(self, slides):
+        """Whether these slides can be rendered as separate parts and assembled"""
+        return False
+
+    def render_part(self, slides, template=None):
+        """Render a run of slides into one picklable part"""
+        raise NotImplementedError
+
+    def assemble(self, parts, output, template=None, title=None):
+        """Write the parts of render_part to output, in order"""
+        raise NotImplementedError
+
+    def slide_parts(self, part):
+        """Split a part of render_part into one part per slide, as render_part([slide]) returns them"""
+        raise NotImplementedError
+
+    def render_parts(self, slides, output, template=None, title=None, on_slide=None):
+        """Render the whole deck to output in one pass and return slide_parts of it"""
+        part = self.render_part(slides, template)
+        self.assemble([part], output, template, title)
+        return self.slide_parts(part)
+
+
+class PptxBackend(Backend):
+    name = 'pptx'
+    extension = 'pptx'
+    mimetype = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+    uses_template = True
+    incremental = True
+
+    def render(self, slides, output, template=None, title=None, on_slide=None):
+        from pptx_templates import new_presentation
+
+        prs = new_presentation(template)
+        self.add_slides(prs, slides, on_slide)
+        prs.save(output)
+
+    def preload(self, template=None):
+        from pptx_templates import template_pool
+
+        template_pool.preload(template)
+
+    def add_slides(self, prs, slides, on_slide=None):
+        """Add parsed slides to a python-pptx presentation"""
+        # Title slide
+        if slides and slides[0].type == TITLE:
+            title_slide = prs.slides.add_slide(prs.slide_layouts[0])
+            title_slide.shapes.title.text = slides[0].title
+            subtitle = slides[0].subtitle if slides[0].subtitle is not None else slides[0].author
+            if subtitle is not None:
+                title_slide.placeholders[1].text = subtitle
+            if on_slide:
+                on_slide(1)
+            slides = slides[1:]
+            first_number = 2
+        else:
+            first_number = 1
+
+        # Content slides
+        for number, slide_data in enumerate(slides, first_number):
+            if slide_data.type == CONTENT:
+                slide = prs.slides.add_slide(prs.slide_layouts[1])
+                slide.shapes.title.text = slide_data.title
+
+                if slide_data.content:
+                    content_placeholder = slide.placeholders[1]
+                    tf = content_placeholder.text_frame
+                    tf.clear()
+
+                    for i, item in enumerate(slide_data.content):
+                        if i == 0:
+                            p = tf.paragraphs[0]
+                        else:
+                            p = tf.add_paragraph()
+
+                        p.text = item.text
+                        if item.type == BULLET:
+                            p.level = item.level
+
+                for image in slide_data.images:
+                    self._add_picture(slide, image)
+            if on_slide:
+                on_slide(number)
+
+    def _add_picture(self, slide, image):
+        from pptx.util import Pt
+
+        # Fit the picture inside its box, keeping the aspect ratio, like the PDF backends
+        left, top, width, height = image.box
+        try:
+            picture = slide.shapes.add_picture(image.path, Pt(left), Pt(top))
+        except Exception:
+            return  # Skip images that cannot be read
+        scale = min(Pt(width) / picture.width, Pt(height) / picture.height)
+        picture.width = int(picture.width * scale)
+        picture.height = int(picture.height * scale)
+        picture.left = int(Pt(left) + (Pt(width) - picture.width) / 2)
+        picture.top = int(Pt(top) + (Pt(height) - picture.height) / 2)
+
+    def can_split(self, slides):
+        # Spliced slide XML only carries the layout relationship, not pictures
+        return not any(slide.images for slide in slides)
+
+    def render_part(self, slides, template=None):
+        from pptx_templates import new_presentation
+        from parallel_render import slide_fragments
+
+        prs = new_presentation(template)
+        self.add_slides(prs, slides)
+        return slide_fragments(prs)
+
+    def assemble(self, parts, output, template=None, title=None):
+        from pptx_templates import new_presentation
+        from parallel_render import append_slide_fragments
+
+        prs = new_presentation(template)
+        for fragments in parts:
+            append_slide_fragments(prs, fragments)
+        prs.save(output)
+
+    def slide_parts(self, part):
+        # A part holds one (layout, slide XML) fragment per slide
+        return [[fragment] for fragment in part]
+
+    def render_parts(self, slides, output, template=None, title=None, on_slide=None):
+        from pptx_templates import new_presentation
+        from parallel_render import slide_fragments
+
+        prs = new_presentation(template)
+        self.add_slides(prs, slides, on_slide)
+        prs.save(output)
+        return self.slide_parts(slide_fragments(prs))
+
+
+class _PdfBackend(Backend):
+    """Parts are standalone PDF documents, concatenated with pypdf.
+
+    Each part embeds its own font subsets and merging is slower than drawing
+    a page, so PDFs are split into chunks for parallel rendering but are not
+    cached per slide.
+    """
+
+    extension = 'pdf'
+    mimetype = 'application/pdf'
+
+    def preload(self, template=None):
+        from pdf_styles import get_pdf_styles
+
+        get_pdf_styles()
+
+    def can_split(self, slides):
+        from parallel_render import pdf_merge_available
+
+        return pdf_merge_available()
+
+    def render_part(self, slides, template=None):
+        import io
+
+        output = io.BytesIO()
+        self.render(slides, output)
+        return output.getvalue()
+
+    def assemble(self, parts, output, template=None, title=None):
+        from parallel_render import merge_pdfs
+
+        merge_pdfs(parts, output, title=title)
+
+
+class PlatypusPdfBackend(_PdfBackend):
+    """A4 document pages laid out with ReportLab platypus"""
+
+    name = 'pdf'
+
+    def preload(self, template=None):
+        super().preload(template)
+        import reportlab.platypus  # noqa: F401
+
+    def render(self, slides, output, template=None, title=None, on_slide=None):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image
+        from pdf_styles import get_pdf_styles
+
+        doc = SimpleDocTemplate(output, pagesize=A4)
+        if title:
+            doc.title = title
+        styles = get_pdf_styles()
+        title_style = styles['title']
+        heading_style = styles['heading']
+        bullet_style = styles['bullet']
+
+        story = []
+        number = 0
+
+        # Title page
+        if slides and slides[0].type == TITLE:
+            story.append(Paragraph(slides[0].title, title_style))
+            subtitle = slides[0].subtitle if slides[0].subtitle is not None else slides[0].author
+            if subtitle is not None:
+                story.append(Spacer(1, 0.5*inch))
+                story.append(Paragraph(subtitle.replace('\n', '<br/>'), styles['normal']))
+            number += 1
+            if on_slide:
+                story.append(_progress_marker(on_slide, number))
+            story.append(PageBreak())
+            slides = slides[1:]
+
+        # Content slides
+        for slide_data in slides:
+            number += 1
+            if slide_data.type == CONTENT:
+                story.append(Paragraph(slide_data.title, heading_style))
+
+                for item in slide_data.content:
+                    if item.type == BULLET:
+                        story.append(Paragraph(f"• {item.text}", bullet_style))
+                    else:
+                        story.append(Paragraph(item.text, styles['normal']))
+
+                for image in slide_data.images:
+                    _, _, width, height = image.box
+                    try:
+                        picture = Image(image.path, width=width, height=height, kind='proportional')
+                    except Exception:
+                        continue  # Skip images that cannot be read
+                    story.append(Spacer(1, 0.2*inch))
+                    story.append(picture)
+
+                if on_slide:
+                    story.append(_progress_marker(on_slide, number))
+                story.append(PageBreak())
+
+        doc.build(story)
+
+
+_ProgressMarker = None
+
+
+def _progress_marker(on_slide, number):
+    """Zero-size flowable that reports a slide as rendered when it is drawn"""
+    global _ProgressMarker
+    if _ProgressMarker is None:
+        from reportlab.platypus import Flowable
+
+        class ProgressMarker(Flowable):
+            def __init__(self, on_slide, number):
+                super().__init__()
+                self.on_slide = on_slide
+                self.number = number
+
+            def wrap(self, available_width, available_height):
+                return 0, 0
+
+            def draw(self):
+                self.on_slide(self.number)
+
+        _ProgressMarker = ProgressMarker
+    return _ProgressMarker(on_slide, number)
+
+
+class CanvasPdfBackend(_PdfBackend):
+    """Slide-sized pages drawn directly on a ReportLab canvas"""
+
+    name = 'pdf_fast'
+    leading_title_only = False
+
+    def preload(self, template=None):
+        super().preload(template)
+        import pdf_canvas_renderer  # noqa: F401
+
+    def render(self, slides, output, template=None, title=None, on_slide=None):
+        from pdf_canvas_renderer import render_slides_pdf
+
+        render_slides_pdf(slides, output, title=title, on_slide=on_slide)
+
+
+def register_backend(backend):
+    """Make a Backend instance available under its name"""
+    BACKENDS[backend.name] = backend
+
+
+def preload_backends(template=None):
+    """Load every backend's rendering libraries, e.g. on a background thread after startup"""
+    for backend in BACKENDS.values():
+        backend.preload(template if backend.uses_template else None)
+
+
+def render_part(slides, backend_name, template=None):
+    """Render a chunk of slides into one part; runs inside parallel renderer processes"""
+    return BACKENDS[backend_name].render_part(slides, template)
+
+
+def render_slide_parts(slides, backend_name, template=None):
+    """Render each slide into its own part; runs inside parallel renderer processes"""
+    backend = BACKENDS[backend_name]
+    return [backend.render_part([slide], template) for slide in slides]
+
+
+register_backend(PptxBackend())
+register_backend(PlatypusPdfBackend())
+register_backend(CanvasPdfBackend())
+
+# 'pdf' is laid out with platypus; 'pdf_fast' draws slide-sized pages directly on a canvas
+OUTPUT_FORMATS = tuple(BACKENDS)
+
+
+def normalize_format(format_type):
+    """Map a requested format to a registered backend (unknown formats mean PDF)"""
+    return format_type if format_type in BACKENDS else 'pdf'
+
+
+def file_extension(format_type):
+    return BACKENDS[normalize_format(format_type)].extension
+
+
+def mime_type(format_type):
+    return BACKENDS[normalize_format(format_type)].mimetype
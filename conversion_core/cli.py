@@ -0,0 +1,206 @@
+"""Command-line front end for bulk conversion, usable without a display.
+
+    python -m conversion_core slides/ 'talks/**/*.tex' -f pptx -f pdf -j 8
+
+Inputs are .tex files, glob patterns or directories (searched recursively).
+Documents are converted on a pool of processes; outputs that are newer than
+their input (and template) are skipped, make-style, unless --force is given.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+from conversion_core.backends import BACKENDS, file_extension
+from conversion_core.engine import ConversionEngine
+from conversion_core.parsers import PARSERS
+
+SOURCE_SUFFIX = '.tex'
+
+
+def find_sources(inputs):
+    """Expand files, globs and directories into (source path, output stem) pairs.
+
+    The output stem is the file name without suffix, or the path relative to
+    the directory argument for files found in a directory.
+    """
+    sources = []
+    seen = set()
+
+    def add(path, stem):
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            sources.append((path, stem))
+
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(SOURCE_SUFFIX):
+                        path = os.path.join(root, name)
+                        add(path, os.path.splitext(os.path.relpath(path, pattern))[0])
+            continue
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            raise FileNotFoundError(f"no files match {pattern}")
+        for path in matches:
+            if not os.path.isdir(path):
+                add(path, os.path.splitext(os.path.basename(path))[0])
+    return sources
+
+
+def plan_outputs(path, stem, formats, output_dir, template, force=False):
+    """Return [(format, output path)] of the outputs that are missing or out of date"""
+    base = os.path.join(output_dir, stem) if output_dir else os.path.splitext(path)[0]
+    newest_input = os.stat(path).st_mtime_ns
+    stale = []
+    for format_type in formats:
+        output = f'{base}.{file_extension(format_type)}'
+        inputs_mtime = newest_input
+        if template and BACKENDS[format_type].uses_template:
+            inputs_mtime = max(inputs_mtime, os.stat(template).st_mtime_ns)
+        try:
+            up_to_date = not force and os.stat(output).st_mtime_ns >= inputs_mtime
+        except OSError:
+            up_to_date = False
+        if not up_to_date:
+            stale.append((format_type, output))
+    return stale
+
+
+_engine = None
+
+
+def _init_worker(template, cache_dir):
+    global _engine
+    from parallel_render import ParallelRenderer
+
+    slide_store = ast_cache = None
+    if cache_dir:
+        from incremental_render import SlideArtifactStore, STORE_DIRNAME
+        from slide_ast import AstCache
+
+        slide_store = SlideArtifactStore(os.path.join(cache_dir, STORE_DIRNAME))
+        ast_cache = AstCache(os.path.join(cache_dir, '.ast_cache'))
+    # Inside pool processes the parallel renderer renders chunks inline
+    _engine = ConversionEngine(template=template, parallel_renderer=ParallelRenderer(),
+                               slide_store=slide_store, ast_cache=ast_cache)
+
+
+def convert_file(path, outputs, language, parser):
+    """Parse path once and render it to every (format, output path); returns counts"""
+    started = time.perf_counter()
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+    slides = _engine.parse(source, parser)
+    if not slides:
+        raise ValueError('No slides found in LaTeX code')
+    slides = _engine.translate(slides, language)
+    written = 0
+    for format_type, output in outputs:
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        # Write next to the output and rename, so an interrupted run never looks up to date
+        tmp_output = f'{output}.{os.getpid()}.tmp'
+        try:
+            _engine.render(slides, format_type, tmp_output, title=slides[0].title)
+            os.replace(tmp_output, output)
+        finally:
+            if os.path.exists(tmp_output):
+                os.remove(tmp_output)
+        written += os.path.getsize(output)
+    return {'slides': len(slides), 'source_bytes': len(source.encode('utf-8')),
+            'output_bytes': written, 'seconds': time.perf_counter() - started}
+
+
+def _run(func, *args):
+    """Return (result, None), or (None, error) if func raises"""
+    try:
+        return func(*args), None
+    except Exception as e:
+        return None, e
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m conversion_core',
+                                     description='Convert LaTeX documents to PPTX or PDF presentations.')
+    parser.add_argument('inputs', nargs='+', help='.tex files, glob patterns or directories')
+    parser.add_argument('-f', '--format', dest='formats', action='append', choices=sorted(BACKENDS),
+                        help='output format; repeat for several (default: pptx)')
+    parser.add_argument('-l', '--language', default='english', choices=('english', 'russian'))
+    parser.add_argument('-p', '--parser', default='auto', choices=['auto', *sorted(PARSERS)])
+    parser.add_argument('-o', '--output-dir', help='write outputs here (default: next to each input)')
+    parser.add_argument('--template', help='.pptx template for PPTX output')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='documents converted in parallel (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='convert even if outputs are up to date')
+    parser.add_argument('--cache-dir', help='keep parsed decks and rendered slides here between runs')
+    parser.add_argument('-q', '--quiet', action='store_true', help='only print errors and the summary')
+    args = parser.parse_args(argv)
+    formats = list(dict.fromkeys(args.formats or ['pptx']))
+
+    started = time.perf_counter()
+    try:
+        sources = find_sources(args.inputs)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+
+    stems = {}
+    for path, stem in sources:
+        if args.output_dir and stems.setdefault(stem, path) != path:
+            parser.error(f"{stems[stem]} and {path} would both be written to {stem}.*")
+
+    tasks = []
+    skipped = failures = 0
+    for path, stem in sources:
+        try:
+            outputs = plan_outputs(path, stem, formats, args.output_dir, args.template, args.force)
+        except OSError as e:
+            failures += 1
+            print(f"{path}: error: {e}", file=sys.stderr)
+            continue
+        if outputs:
+            tasks.append((path, outputs))
+        else:
+            skipped += 1
+
+    totals = {'slides': 0, 'source_bytes': 0, 'output_bytes': 0}
+    converted = 0
+    jobs = max(1, min(args.jobs, len(tasks)))
+    settings = (args.template, args.cache_dir)
+    if jobs == 1:
+        _init_worker(*settings)
+        results = ((task, _run(convert_file, *task, args.language, args.parser)) for task in tasks)
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=settings)
+        futures = {executor.submit(convert_file, *task, args.language, args.parser): task
+                   for task in tasks}
+        results = ((futures[future], _run(future.result)) for future in as_completed(futures))
+    try:
+        for (path, outputs), (result, error) in results:
+            if error is not None:
+                failures += 1
+                print(f"{path}: error: {error}", file=sys.stderr)
+                continue
+            converted += 1
+            for key in totals:
+                totals[key] += result[key]
+            if not args.quiet:
+                print(f"{path} -> {', '.join(output for _, output in outputs)} "
+                      f"({result['slides']} slides, {result['seconds'] * 1000:.0f} ms)")
+    finally:
+        if jobs > 1:
+            executor.shutdown(cancel_futures=True)
+        elif _engine is not None:
+            _engine.parallel_renderer.shutdown()
+
+    elapsed = time.perf_counter() - started
+    print(f"{converted} converted, {skipped} up to date, {failures} failed in {elapsed:.2f} s: "
+          f"{converted / elapsed:.1f} documents/s, {totals['slides'] / elapsed:.0f} slides/s, "
+          f"{totals['source_bytes'] / elapsed / 1e6:.2f} MB/s of LaTeX "
+          f"({jobs} {'job' if jobs == 1 else 'jobs'})")
+    return 1 if failures else 0
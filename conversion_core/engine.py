@@ -0,0 +1,237 @@
+"""ConversionEngine: parse, translate and render with the shared caches and renderer pool."""
+import io
+import os
+import threading
+import time
+from datetime import datetime
+
+from conversion_core.backends import BACKENDS, normalize_format, render_part, render_slide_parts
+from conversion_core.parsers import detect_parser, parse_source
+
+RUSSIAN_TITLES = {
+    'Introduction': 'Введение',
+    'Overview': 'Обзор',
+    'Conclusion': 'Заключение',
+    'Summary': 'Резюме',
+    'Features': 'Функции',
+    'Benefits': 'Преимущества',
+    'Getting Started': 'Начало работы',
+    'Technical': 'Технический',
+    'Implementation': 'Реализация'
+}
+
+
+class ConversionEngine:
+    """Converts LaTeX source to presentation files.
+
+    Every collaborator is optional: ``ast_cache`` (slide_ast.AstCache) keeps
+    parsed decks, ``slide_store`` (incremental_render.SlideArtifactStore)
+    enables incremental re-rendering and ``parallel_renderer``
+    (parallel_render.ParallelRenderer) spreads slides over processes.
+    """
+
+    # Bump whenever parsing or rendering output changes, so cached artifacts are not reused
+    VERSION = '3'
+
+    def __init__(self, output_dir='.', template=None, parallel_renderer=None,
+                 slide_store=None, ast_cache=None):
+        self.output_dir = output_dir
+        self.template = template  # optional .pptx template for the PPTX backend
+        self.parallel_renderer = parallel_renderer
+        self.slide_store = slide_store
+        self.ast_cache = ast_cache
+        self._stats = {'conversions': 0, 'slides': 0, 'rendered_slides': 0,
+                       'parse_seconds': 0.0, 'render_seconds': 0.0}
+        self._lock = threading.Lock()
+
+    def preload(self):
+        """Load the parsers and rendering libraries now instead of on the first conversion"""
+        import latex_outline_parser  # noqa: F401
+        import latex_stream_parser  # noqa: F401
+        from conversion_core.backends import preload_backends
+
+        preload_backends(self.template)
+
+    def preload_in_background(self):
+        """Run preload() on a daemon thread; returns the thread"""
+        thread = threading.Thread(target=self.preload, name='preload', daemon=True)
+        thread.start()
+        return thread
+
+    def parse(self, source, parser='beamer', cached=True):
+        """Parse LaTeX source (a string, text file object or chunk iterable) into slides
+
+        String sources are looked up in and added to ast_cache, unless cached is false.
+        """
+        if not isinstance(source, str) or self.ast_cache is None or not cached:
+            return parse_source(source, parser)
+        if parser == 'auto':
+            parser = detect_parser(source)
+        from slide_ast import ast_key
+
+        key = ast_key(source, f'{self.VERSION}\0{parser}')
+        slides = self.ast_cache.get(key)
+        if slides is None:
+            slides = parse_source(source, parser)
+            self.ast_cache.put(key, slides)
+        return slides
+
+    def translate(self, slides, language):
+        """Basic translation mapping for common terms in slide titles"""
+        if language == 'russian':
+            for slide in slides:
+                for eng, rus in RUSSIAN_TITLES.items():
+                    slide.title = slide.title.replace(eng, rus)
+        return slides
+
+    def output_filename(self, language, format_type):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        lang_suffix = "_Russian" if language == 'russian' else "_English"
+        return f"LaTeX_Presentation{lang_suffix}_{timestamp}.{BACKENDS[normalize_format(format_type)].extension}"
+
+    def render(self, slides, format_type, output, title=None, on_slide=None, cached=True):
+        """Render slides to output (a path or binary file object); returns how many were rendered
+
+        With a slide_store (and cached true), backends that support it
+        re-render only slides whose parts are not stored yet; large decks are
+        rendered in chunks on the parallel renderer. on_slide is called with
+        a running count of rendered slides.
+        """
+        backend = BACKENDS[normalize_format(format_type)]
+        template = self.template if backend.uses_template else None
+        parallel = self.parallel_renderer
+        incremental = cached and self.slide_store is not None and backend.incremental
+        chunked = parallel is not None and parallel.should_split(slides)
+        if not ((incremental or chunked) and backend.can_split(slides)):
+            backend.render(slides, output, template, title, on_slide)
+            return len(slides)
+
+        def run(func, slides):
+            # Yields (slides in the result, result) per chunk, in order
+            if parallel is None:
+                yield len(slides), func(slides, backend.name, template)
+                return
+            from parallel_render import chunk_slides
+
+            sizes = [len(chunk) for chunk in chunk_slides(slides, parallel.chunk_size)]
+            yield from zip(sizes, parallel.imap(func, slides, backend.name, template))
+
+        slides = backend.renderable(slides)
+        done = 0
+        written = False  # whether output was rendered in one pass instead of assembled from parts
+        if incremental:
+            from incremental_render import render_incremental
+
+            def render_many(changed):
+                nonlocal done
+                parts = []
+                for count, chunk_parts in run(render_slide_parts, changed):
+                    parts.extend(chunk_parts)
+                    done += count
+                    if on_slide:
+                        on_slide(done)
+                return parts
+
+            def render_all(slides):
+                # Nothing of the deck is stored yet: render it whole, or in chunks
+                # for large decks, and split the result into per-slide parts
+                nonlocal done, written
+                if not chunked:
+                    written = True
+                    return backend.render_parts(slides, output, template, title, on_slide)
+                parts = []
+                for count, part in run(render_part, slides):
+                    parts.extend(backend.slide_parts(part))
+                    done += count
+                    if on_slide:
+                        on_slide(done)
+                return parts
+
+            context = [self.VERSION, backend.name, template,
+                       os.stat(template).st_mtime_ns if template else None]
+            parts, rendered = render_incremental(slides, context, self.slide_store, render_many, render_all)
+        else:
+            parts = []
+            for count, part in run(render_part, slides):
+                parts.append(part)
+                done += count
+                if on_slide:
+                    on_slide(done)
+            rendered = len(slides)
+        if not written:
+            backend.assemble(parts, output, template, title)
+        return rendered
+
+    def convert(self, source, language='english', format_type='pptx', filename=None, parser='beamer'):
+        """Parse, translate and render into output_dir; returns filename, counts and timings
+
+        filename may include subdirectories of output_dir, which are created.
+        """
+        started = time.perf_counter()
+        slides = self._prepare(source, language, parser)
+        parsed = time.perf_counter()
+
+        format_type = normalize_format(format_type)
+        if filename is None:
+            filename = self.output_filename(language, format_type)
+        output = os.path.join(self.output_dir, filename)
+        os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+        # Render to a hidden temporary file and rename it, so the output is never seen half-written
+        directory, basename = os.path.split(output)
+        tmp_output = os.path.join(directory, f'.{basename}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            rendered = self.render(slides, format_type, tmp_output, title=slides[0].title)
+            os.replace(tmp_output, output)
+        finally:
+            if os.path.exists(tmp_output):
+                os.remove(tmp_output)
+        finished = time.perf_counter()
+
+        self._record(slides, rendered, started, parsed, finished)
+        return {
+            'filename': filename,
+            'slides_count': len(slides),
+            'rendered_slides': rendered,
+            'timings': {'parse': parsed - started, 'render': finished - parsed},
+        }
+
+    def convert_bytes(self, source, language='english', format_type='pptx', parser='beamer', cached=True):
+        """Parse, translate and render in memory; returns the output bytes, counts and timings
+
+        Nothing is written to output_dir. With cached false the parsed-deck
+        cache and the per-slide store are bypassed too, so nothing touches disk.
+        """
+        started = time.perf_counter()
+        slides = self._prepare(source, language, parser, cached)
+        parsed = time.perf_counter()
+
+        output = io.BytesIO()
+        rendered = self.render(slides, format_type, output, title=slides[0].title, cached=cached)
+        finished = time.perf_counter()
+
+        self._record(slides, rendered, started, parsed, finished)
+        return {
+            'data': output.getvalue(),
+            'slides_count': len(slides),
+            'rendered_slides': rendered,
+            'timings': {'parse': parsed - started, 'render': finished - parsed},
+        }
+
+    def _prepare(self, source, language, parser, cached=True):
+        slides = self.parse(source, parser, cached)
+        if not slides:
+            raise ValueError('No slides found in LaTeX code')
+        return self.translate(slides, language)
+
+    def _record(self, slides, rendered, started, parsed, finished):
+        with self._lock:
+            self._stats['conversions'] += 1
+            self._stats['slides'] += len(slides)
+            self._stats['rendered_slides'] += rendered
+            self._stats['parse_seconds'] += parsed - started
+            self._stats['render_seconds'] += finished - parsed
+
+    def stats(self):
+        """Cumulative conversion counters and stage timings of this process"""
+        with self._lock:
+            return dict(self._stats)
@@ -0,0 +1,65 @@
+"""Source parsers: LaTeX source in, list of slide_ast.Slide out.
+
+``beamer`` reads \\begin{frame} decks with the streaming parser; ``article``
+turns the \\title / \\subsection / \\item outline of an article into one
+slide per subsection. ``auto`` picks beamer when the source has frames.
+"""
+import re
+
+from slide_ast import Slide, Item, TITLE, CONTENT, BULLET, TEXT
+
+PARSERS = {}
+
+_INLINE_COMMAND = re.compile(r'\\[a-zA-Z]+\{[^}]*\}')
+_MARKUP = re.compile(r'[{}\\]')
+
+
+def register_parser(name, parse):
+    """Make parse(source) -> slides available under name"""
+    PARSERS[name] = parse
+
+
+def parse_beamer(source):
+    from latex_stream_parser import parse_slides
+
+    return parse_slides(source)
+
+
+def parse_article(source):
+    from latex_outline_parser import parse_outline
+
+    if not isinstance(source, str):
+        source = source.read() if hasattr(source, 'read') else ''.join(source)
+    return outline_slides(parse_outline(source))
+
+
+def outline_slides(outline):
+    """A title slide plus one slide per subsection, bulleted or as plain text"""
+    slides = [Slide(TITLE, outline['title'])]
+    for subsection in outline['subsections']:
+        if subsection['bullets']:
+            content = [Item(BULLET, bullet) for bullet in subsection['bullets']]
+        else:
+            text = _MARKUP.sub('', _INLINE_COMMAND.sub('', subsection['content'])).strip()
+            content = [Item(TEXT, text)] if text else []
+        slides.append(Slide(CONTENT, subsection['title'], content))
+    return slides
+
+
+def detect_parser(source):
+    return 'beamer' if '\\begin{frame}' in source else 'article'
+
+
+def parse_source(source, parser='beamer'):
+    """Parse with the named parser; 'auto' needs the source as a string"""
+    if parser == 'auto':
+        parser = detect_parser(source)
+    try:
+        parse = PARSERS[parser]
+    except KeyError:
+        raise ValueError(f'Unknown parser: {parser}') from None
+    return parse(source)
+
+
+register_parser('beamer', parse_beamer)
+register_parser('article', parse_article)
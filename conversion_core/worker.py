@@ -0,0 +1,24 @@
+"""Conversion entry point for the server's renderer processes.
+
+Pool workers import the module of the function they run. The server's job
+queue runs render_conversion from here rather than from server_app, so its
+workers import conversion_core alone: the Flask app, the artifact store and
+the conversion, AST and slide caches are only set up in the web process.
+"""
+from conversion_core.engine import ConversionEngine
+
+_engine = None
+
+
+def init_worker(output_dir, template=None):
+    """Pool initializer: build the engine of this renderer process"""
+    global _engine
+    from parallel_render import ParallelRenderer
+
+    # Inside pool processes the parallel renderer renders chunks inline
+    _engine = ConversionEngine(output_dir=output_dir, template=template, parallel_renderer=ParallelRenderer())
+
+
+def render_conversion(latex_code, language, format_type, filename=None):
+    """Conversion entry point executed inside renderer processes"""
+    return _engine.convert(latex_code, language, format_type, filename)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Bounded background job queue that runs conversions in a process pool"""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from parallel_render import LazyProcessPool
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job"""
+
+
+class JobQueue:
+    """Runs submitted functions on a pool of renderer processes.
+
+    At most ``max_pending`` jobs (including the items of run_many batches)
+    may be queued or running at once; further submissions raise
+    QueueFullError so callers can apply backpressure.
+    Submissions with the key of a job that is still queued or running get
+    that job's id instead of a new job.
+    Finished jobs are kept for status queries, oldest forgotten first. With
+    a ``state_dir``, job states are also written there as JSON, so that other
+    processes serving the same clients (pre-fork server workers) can answer
+    status queries for jobs they did not run.
+    ``initializer(*initargs)`` runs once in every renderer process as it starts.
+    """
+
+    def __init__(self, max_workers=None, max_pending=32, max_finished=1000, state_dir=None,
+                 initializer=None, initargs=()):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.state_dir = state_dir
+        if state_dir is not None:
+            os.makedirs(state_dir, exist_ok=True)
+        # A renderer process that dies (e.g. out of memory) fails its job, not later ones
+        self._pool = LazyProcessPool(max_workers, initializer, initargs)
+        self._jobs = {}
+        self._finished = OrderedDict()
+        self._pending = 0
+        self._keys = {}  # key -> id of the queued or running job submitted with it
+        self.coalesced = 0
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, on_success=None, key=None):
+        """Queue func(*args) and return the new job id, or the id of the pending job with this key"""
+        with self._lock:
+            if key is not None and key in self._keys:
+                self.coalesced += 1
+                return self._keys[key]
+            if self._pending >= self.max_pending:
+                raise QueueFullError(f'Job queue is full ({self.max_pending} jobs pending)')
+            job = {
+                'id': uuid.uuid4().hex,
+                'status': 'queued',
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None,
+            }
+            future = self._pool.submit(func, *args)
+            job['future'] = future
+            self._jobs[job['id']] = job
+            self._pending += 1
+            if key is not None:
+                self._keys[key] = job['id']
+            state = self._snapshot(job)
+        self._write_state(state)
+        future.add_done_callback(lambda f: self._complete(job, f, on_success, key))
+        return job['id']
+
+    def run_many(self, func, arg_tuples):
+        """Run func over many argument tuples on the pool and wait for all of them.
+
+        Every item counts against max_pending while it is queued or running.
+        The batch takes the slots that are free and hands each slot on to its
+        next item, so it never holds more than the queue had room for, and
+        later submissions see a full queue instead of waiting behind the whole
+        batch. Raises QueueFullError if no slot is free. Returns (result,
+        error message) pairs in input order.
+        """
+        arg_tuples = list(arg_tuples)
+        outcomes = [None] * len(arg_tuples)
+        in_flight = {}  # future -> input index
+        queued = iter(enumerate(arg_tuples))
+
+        def start_next():
+            # Called with the lock held; returns False once every item was submitted
+            item = next(queued, None)
+            if item is None:
+                return False
+            index, args = item
+            in_flight[self._pool.submit(func, *args)] = index
+            return True
+
+        def take_free_slots():
+            while self._pending < self.max_pending and start_next():
+                self._pending += 1
+
+        with self._lock:
+            if arg_tuples and self._pending >= self.max_pending:
+                raise QueueFullError(f'Job queue is full ({self.max_pending} jobs pending)')
+            take_free_slots()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            with self._lock:
+                for future in done:
+                    error = future.exception()
+                    outcomes[in_flight.pop(future)] = ((None, str(error)) if error is not None
+                                                       else (future.result(), None))
+                    if not start_next():
+                        self._pending -= 1
+                take_free_slots()
+        return outcomes
+
+    def add_finished(self, result):
+        """Record an already available result (e.g. a cache hit) as a finished job"""
+        now = time.time()
+        job = {
+            'id': uuid.uuid4().hex,
+            'status': 'finished',
+            'submitted_at': now,
+            'started_at': now,
+            'finished_at': now,
+            'result': result,
+            'error': None,
+            'future': None,
+        }
+        with self._lock:
+            self._jobs[job['id']] = job
+            self._remember_finished(job)
+        self._write_state(self._snapshot(job))
+        return job['id']
+
+    def get(self, job_id):
+        """Return a snapshot of the job's state, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                future = job['future']
+                if job['status'] == 'queued' and future is not None and future.running():
+                    job['status'] = 'running'
+                    job['started_at'] = time.time()
+                return self._snapshot(job)
+        return self._read_state(job_id)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending': self._pending,
+                'max_pending': self.max_pending,
+                'workers': self.max_workers,
+                'retained_jobs': len(self._jobs),
+                'coalesced': self.coalesced,
+            }
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    def _complete(self, job, future, on_success, key=None):
+        error = future.exception()
+        result = None if error is not None else future.result()
+        if error is None and on_success is not None:
+            try:
+                on_success(result)
+            except Exception as e:
+                # The output was rendered but not stored, so the job has no result to offer
+                error = e
+        with self._lock:
+            job['finished_at'] = time.time()
+            if job['started_at'] is None:
+                job['started_at'] = job['finished_at']
+            if error is not None:
+                job['status'] = 'failed'
+                job['error'] = str(error)
+            else:
+                job['status'] = 'finished'
+                job['result'] = result
+            job['future'] = None
+            self._pending -= 1
+            if key is not None:
+                self._keys.pop(key, None)
+            self._remember_finished(job)
+            state = self._snapshot(job)
+        self._write_state(state)
+
+    def _remember_finished(self, job):
+        self._finished[job['id']] = True
+        while len(self._finished) > self.max_finished:
+            old_id, _ = self._finished.popitem(last=False)
+            self._jobs.pop(old_id, None)
+            if self.state_dir is not None:
+                try:
+                    os.remove(self._state_path(old_id))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _snapshot(job):
+        return {key: value for key, value in job.items() if key != 'future'}
+
+    def _state_path(self, job_id):
+        return os.path.join(self.state_dir, f'{job_id}.json')
+
+    def _write_state(self, state):
+        if self.state_dir is None:
+            return
+        path = self._state_path(state['id'])
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def _read_state(self, job_id):
+        if self.state_dir is None or not job_id.isalnum():
+            return None
+        try:
+            with open(self._state_path(job_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
@@ -1,54 +1,24 @@
 
 #!/usr/bin/env python3
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak
 from reportlab.lib.units import inch
-from reportlab.lib.colors import HexColor, black, blue, red, green
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 import os
 
+from pdf_styles import get_pdf_styles
+from media_pipeline import prepare_image
+
 def create_pdf_presentation():
     # Create PDF document
     filename = "attached_assets/Pose_Recognition_Presentation.pdf"
     doc = SimpleDocTemplate(filename, pagesize=A4)
     
-    # Define styles
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Title'],
-        fontSize=24,
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        textColor=HexColor('#0066CC')
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=20,
-        textColor=HexColor('#0066CC')
-    )
-    
-    bullet_style = ParagraphStyle(
-        'BulletText',
-        parent=styles['Normal'],
-        fontSize=12,
-        spaceAfter=8,
-        leftIndent=20,
-        bulletIndent=10
-    )
-    
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=12,
-        spaceAfter=12,
-        alignment=TA_JUSTIFY
-    )
+    # Shared styles (fonts with Cyrillic coverage are registered once)
+    styles = get_pdf_styles()
+    title_style = styles['title']
+    heading_style = styles['heading']
+    bullet_style = styles['bullet']
+    normal_style = styles['body']
     
     # Story array to hold content
     story = []
@@ -101,7 +71,7 @@ def create_pdf_presentation():
     if os.path.exists("attached_assets/GUI1_1752049448296.png"):
         try:
             story.append(Spacer(1, 0.2*inch))
-            story.append(Image("attached_assets/GUI1_1752049448296.png", width=6*inch, height=3*inch))
+            story.append(Image(prepare_image("attached_assets/GUI1_1752049448296.png", 6, 3), width=6*inch, height=3*inch))
         except:
             pass
     story.append(PageBreak())
@@ -119,7 +89,7 @@ def create_pdf_presentation():
     if os.path.exists("attached_assets/GUI2_1752049449853.png"):
         try:
             story.append(Spacer(1, 0.2*inch))
-            story.append(Image("attached_assets/GUI2_1752049449853.png", width=6*inch, height=3*inch))
+            story.append(Image(prepare_image("attached_assets/GUI2_1752049449853.png", 6, 3), width=6*inch, height=3*inch))
         except:
             pass
     story.append(PageBreak())
@@ -6,6 +6,8 @@ from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
 import os
 
+from media_pipeline import prepare_image
+
 def create_pose_recognition_presentation():
     # Create a presentation object
     prs = Presentation()
@@ -105,7 +107,7 @@ def create_pose_recognition_presentation():
     
     # Try to add image if it exists
     if os.path.exists("attached_assets/GUI1_1752049448296.png"):
-        slide.shapes.add_picture("attached_assets/GUI1_1752049448296.png", 
+        slide.shapes.add_picture(prepare_image("attached_assets/GUI1_1752049448296.png", 8, 4),
                                Inches(1), Inches(3), Inches(8), Inches(4))
     
     # Slide 5: GUI Recognition Interface
@@ -130,7 +132,7 @@ def create_pose_recognition_presentation():
     
     # Try to add image if it exists
     if os.path.exists("attached_assets/GUI2_1752049449853.png"):
-        slide.shapes.add_picture("attached_assets/GUI2_1752049449853.png", 
+        slide.shapes.add_picture(prepare_image("attached_assets/GUI2_1752049449853.png", 8, 4),
                                Inches(1), Inches(3), Inches(8), Inches(4))
     
     # Slide 6: Technical Specifications
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Size-bounded on-disk LRU cache, one file per key.
+
+The AST cache (slide_ast.AstCache) and the per-slide artifact store
+(incremental_render.SlideArtifactStore) keep their entries in a directory
+that renderer processes and server workers share. Reads refresh a file's
+mtime; once the directory holds more than max_bytes, the least recently used
+files are removed.
+"""
+import os
+import threading
+
+
+class DiskCache:
+    """Files named ``<key><SUFFIX>`` in directory, evicted least recently used first.
+
+    Subclasses set SUFFIX and LOAD_ERRORS and implement _load(path), which
+    reads a value, and _dump(value, f), which writes one to a binary file.
+    """
+
+    SUFFIX = ''
+    LOAD_ERRORS = (OSError,)  # _load failures that count as a miss
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._scan())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def get(self, key):
+        """Return the value stored for key, or None if it is missing or unreadable"""
+        path = self._path(key)
+        try:
+            value = self._load(path)
+            os.utime(path)
+        except self.LOAD_ERRORS:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Store value for key atomically and evict past max_bytes"""
+        path = self._path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            self._dump(value, f)
+        size = os.path.getsize(tmp_path)
+        try:
+            replaced = os.path.getsize(path)  # an earlier file for key, overwritten below
+        except OSError:
+            replaced = 0
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._total_bytes += size - replaced
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _load(self, path):
+        raise NotImplementedError
+
+    def _dump(self, value, f):
+        raise NotImplementedError
+
+    def _scan(self):
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(self.SUFFIX):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            pass
+        return entries
+
+    def _evict(self):
+        # Other processes write to the same directory, so recount from disk first
+        entries = sorted(self._scan(), key=lambda entry: entry[2])
+        self._total_bytes = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._total_bytes -= size
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Incremental rendering: reuse per-slide artifacts across conversions.
+
+Every parsed slide is fingerprinted from its content (title, content items
+and media references, including the size and mtime of referenced files) plus
+a render context (converter version, output format, template). Each slide is
+rendered on its own into an artifact (slide XML fragments for PPTX) that is
+kept in an on-disk store keyed by fingerprint. When a deck is converted again only slides with unknown
+fingerprints are rendered; the rest are read back from the store and spliced
+into the output in order.
+"""
+import hashlib
+import json
+import os
+import pickle
+
+from disk_cache import DiskCache
+
+STORE_DIRNAME = '.slide_cache'
+ARTIFACT_SUFFIX = '.slide'
+
+
+def _media_stamps(slide):
+    stamps = []
+    for image in slide.images:
+        path = image.path
+        try:
+            stat = os.stat(path)
+            stamps.append((path, stat.st_mtime_ns, stat.st_size))
+        except (OSError, TypeError):
+            stamps.append((path, None, None))
+    return stamps
+
+
+def slide_fingerprint(slide, context):
+    """Hash a parsed slide together with the context it is rendered in"""
+    payload = json.dumps([context, slide.to_dict(), _media_stamps(slide)],
+                         sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class SlideArtifactStore(DiskCache):
+    """Size-bounded store of rendered per-slide artifacts, one file per fingerprint.
+
+    Artifacts live on disk so renderer processes (job queue, batch) share
+    them. Reads refresh a file's mtime; past max_bytes the least recently
+    used artifacts are removed.
+    """
+
+    SUFFIX = ARTIFACT_SUFFIX
+    LOAD_ERRORS = (OSError, EOFError, pickle.UnpicklingError)
+
+    def __init__(self, directory, max_bytes=128 * 1024 * 1024):
+        super().__init__(directory, max_bytes)
+
+    def _load(self, path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def _dump(self, artifact, f):
+        pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def render_incremental(slides, context, store, render_many, render_all=None):
+    """Return one artifact per slide, rendering only slides the store does not know.
+
+    render_many(slides) must return the artifacts of the given slides, one
+    per slide and in order. When the store knows none of the slides and
+    render_all is given, render_all(slides) renders the whole deck instead
+    (in one pass, which is cheaper than slide by slide) and returns the
+    artifacts of all its slides. Returns (artifacts, number of slides rendered).
+    """
+    fingerprints = [slide_fingerprint(slide, context) for slide in slides]
+    artifacts = [store.get(fingerprint) for fingerprint in fingerprints]
+
+    if render_all is not None and not any(artifacts):
+        artifacts = render_all(slides)
+        for fingerprint, artifact in dict(zip(fingerprints, artifacts)).items():
+            store.put(fingerprint, artifact)
+        return artifacts, len(slides)
+
+    # Identical slides within the deck are rendered once
+    missing = {}
+    for index, artifact in enumerate(artifacts):
+        if artifact is None:
+            missing.setdefault(fingerprints[index], []).append(index)
+    if missing:
+        rendered = render_many([slides[indexes[0]] for indexes in missing.values()])
+        for (fingerprint, indexes), artifact in zip(missing.items(), rendered):
+            store.put(fingerprint, artifact)
+            for index in indexes:
+                artifacts[index] = artifact
+    return artifacts, len(missing)
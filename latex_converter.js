@@ -133,7 +133,8 @@ function startCreate() {
                 // Create download link
                 const link = document.createElement('a');
                 link.href = data.download_url;
-                link.download = data.filename || 'presentation';
+                // Empty: the server's Content-Disposition supplies a readable name
+                link.download = '';
                 document.body.appendChild(link);
                 link.click();
                 document.body.removeChild(link);
@@ -3,11 +3,54 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
+import queue
 import subprocess
 import sys
-import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import re
+
+
+OUTPUT_DIR = "output_presentations"
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp')
+IMAGE_BOX = (6 * 72, 2 * 72, 3 * 72, 2 * 72)  # 3 x 2 inch box at (6, 2) inches, in points
+
+
+class ConversionCancelled(Exception):
+    """Raised inside a conversion when the user pressed Cancel"""
+
+
+class ConversionJob:
+    """Settings snapshot and progress channel for one background conversion.
+
+    Tk variables may only be touched from the main thread, so everything the
+    worker needs is copied here first. Progress is sent to the UI as
+    (kind, data) tuples on a thread-safe queue; every report is also a
+    cancellation checkpoint.
+    """
+
+    def __init__(self, latex_file, output_format, language, media_files):
+        self.latex_file = latex_file
+        self.output_format = output_format
+        self.language = language
+        self.media_files = list(media_files)
+        self.events = queue.Queue()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def check(self):
+        if self.cancelled.is_set():
+            raise ConversionCancelled()
+
+    def report(self, kind, data=None):
+        self.check()
+        self.events.put((kind, data))
+
+    def slide_rendered(self, number, total):
+        self.report('slide', (number, total))
+
 
 class LatexConverterApp:
     def __init__(self, root):
@@ -21,8 +64,17 @@ class LatexConverterApp:
         self.output_format = tk.StringVar(value="pptx")
         self.language = tk.StringVar(value="english")
         self.media_files = []
+        self.media_report = None
+        
+        # Conversions run on a worker thread; the UI polls job.events
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='conversion')
+        self.job = None
+        self.engine = None
         
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        # Load the converters once the window is up, not before it is shown
+        self.root.after_idle(self.preload_engine)
         
     def setup_ui(self):
         # Main frame
@@ -115,6 +167,10 @@ class LatexConverterApp:
         
         tk.Radiobutton(format_options_frame, text="📄 PDF Document (.pdf)", 
                       variable=self.output_format, value="pdf",
+                      font=('Arial', 11), bg='#f0f0f0').pack(side='left', padx=(0, 20))
+        
+        tk.Radiobutton(format_options_frame, text="⚡ PDF Slides, fast (.pdf)", 
+                      variable=self.output_format, value="pdf_fast",
                       font=('Arial', 11), bg='#f0f0f0').pack(side='left')
         
         # Progress and status
@@ -125,13 +181,23 @@ class LatexConverterApp:
         self.progress = ttk.Progressbar(main_frame, mode='indeterminate')
         self.progress.pack(fill='x', pady=(0, 15))
         
-        # Convert button
-        convert_button = tk.Button(main_frame, text="🚀 Convert to Presentation", 
+        # Convert and cancel buttons
+        buttons_frame = tk.Frame(main_frame, bg='#f0f0f0')
+        buttons_frame.pack(pady=10)
+        
+        self.convert_button = tk.Button(buttons_frame, text="🚀 Convert to Presentation", 
                                   command=self.convert_presentation,
                                   font=('Arial', 14, 'bold'),
                                   bg='#0066CC', fg='white',
                                   padx=20, pady=10)
-        convert_button.pack(pady=10)
+        self.convert_button.pack(side='left', padx=(0, 10))
+        
+        self.cancel_button = tk.Button(buttons_frame, text="✖ Cancel", 
+                                  command=self.cancel_conversion,
+                                  font=('Arial', 12),
+                                  bg='#6c757d', fg='white',
+                                  padx=10, pady=10, state='disabled')
+        self.cancel_button.pack(side='left')
         
     def browse_latex_file(self):
         file_path = filedialog.askopenfilename(
@@ -171,211 +237,89 @@ class LatexConverterApp:
         self.media_files.clear()
         self.media_listbox.delete(0, tk.END)
         
+    def get_engine(self):
+        """The shared conversion engine, set up on first use with caches in output_presentations"""
+        if self.engine is None:
+            from conversion_core import ConversionEngine
+            from incremental_render import SlideArtifactStore, STORE_DIRNAME
+            from parallel_render import ParallelRenderer
+            from slide_ast import AstCache
+            
+            self.engine = ConversionEngine(
+                output_dir=OUTPUT_DIR,
+                parallel_renderer=ParallelRenderer(),
+                slide_store=SlideArtifactStore(os.path.join(OUTPUT_DIR, STORE_DIRNAME)),
+                ast_cache=AstCache(os.path.join(OUTPUT_DIR, '.ast_cache')),
+            )
+        return self.engine
+        
+    def preload_engine(self):
+        self.get_engine().preload_in_background()
+        
     def parse_latex_content(self, latex_file):
-        """Parse LaTeX file and extract content for presentation"""
+        """Parse a LaTeX article or Beamer deck into slides"""
         try:
             with open(latex_file, 'r', encoding='utf-8') as f:
                 content = f.read()
             
-            # Extract title
-            title_match = re.search(r'\\title\{([^}]+)\}', content)
-            title = title_match.group(1) if title_match else "Presentation"
-            
-            # Extract sections
-            sections = re.findall(r'\\section\{([^}]+)\}', content)
-            
-            # Extract subsections with content
-            subsections = []
-            subsection_pattern = r'\\subsection\{([^}]+)\}(.*?)(?=\\subsection|\\section|\\end\{document\})'
-            matches = re.findall(subsection_pattern, content, re.DOTALL)
-            
-            for match in matches:
-                subsection_title = match[0]
-                subsection_content = match[1].strip()
-                
-                # Extract bullet points
-                bullets = re.findall(r'\\item\s+([^\n\\]+)', subsection_content)
-                
-                subsections.append({
-                    'title': subsection_title,
-                    'content': subsection_content,
-                    'bullets': bullets
-                })
-            
-            return {
-                'title': title,
-                'sections': sections,
-                'subsections': subsections
-            }
+            return self.get_engine().parse(content, parser='auto')
             
         except Exception as e:
             raise Exception(f"Error parsing LaTeX file: {str(e)}")
             
-    def create_presentation_from_latex(self, latex_data):
-        """Create presentation file from parsed LaTeX data"""
-        output_dir = "output_presentations"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Copy media files to output directory
-        media_dir = os.path.join(output_dir, "media")
-        os.makedirs(media_dir, exist_ok=True)
-        
-        copied_media = []
-        for media_file in self.media_files:
-            dest_path = os.path.join(media_dir, os.path.basename(media_file))
-            shutil.copy2(media_file, dest_path)
-            copied_media.append(dest_path)
-        
-        if self.output_format.get() == "pptx":
-            return self.create_pptx_from_latex(latex_data, output_dir, copied_media)
-        else:
-            return self.create_pdf_from_latex(latex_data, output_dir, copied_media)
-            
-    def create_pptx_from_latex(self, latex_data, output_dir, media_files):
-        """Create PowerPoint presentation from LaTeX data"""
-        try:
-            from pptx import Presentation
-            from pptx.util import Inches
-            from pptx.dml.color import RGBColor
-            
-            prs = Presentation()
-            
-            # Title slide
-            title_slide_layout = prs.slide_layouts[0]
-            slide = prs.slides.add_slide(title_slide_layout)
-            title = slide.shapes.title
-            subtitle = slide.placeholders[1]
-            
-            title.text = latex_data['title']
-            subtitle.text = f"Generated from LaTeX\n{len(media_files)} media files included"
-            
-            # Content slides
-            bullet_slide_layout = prs.slide_layouts[1]
-            
-            for subsection in latex_data['subsections']:
-                slide = prs.slides.add_slide(bullet_slide_layout)
-                title = slide.shapes.title
-                content = slide.placeholders[1]
-                
-                title.text = subsection['title']
-                tf = content.text_frame
-                
-                if subsection['bullets']:
-                    tf.text = subsection['bullets'][0] if subsection['bullets'] else "Content"
-                    for bullet in subsection['bullets'][1:]:
-                        p = tf.add_paragraph()
-                        p.text = bullet
-                        p.level = 0
-                else:
-                    # Use raw content if no bullets found
-                    clean_content = re.sub(r'\\[a-zA-Z]+\{[^}]*\}', '', subsection['content'])
-                    clean_content = re.sub(r'[{}\\]', '', clean_content).strip()
-                    tf.text = clean_content[:200] + "..." if len(clean_content) > 200 else clean_content
-                
-                # Add media if available
-                if media_files:
-                    media_file = media_files[len(prs.slides) % len(media_files) - 1]
-                    if media_file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp')):
-                        try:
-                            slide.shapes.add_picture(media_file, 
-                                                   Inches(6), Inches(2), 
-                                                   Inches(3), Inches(2))
-                        except:
-                            pass  # Skip if image can't be added
-            
-            # Save presentation
-            lang_suffix = "_russian" if self.language.get() == "russian" else "_english"
-            filename = os.path.join(output_dir, f"latex_presentation{lang_suffix}.pptx")
-            prs.save(filename)
-            
-            return filename
-            
-        except ImportError:
-            raise Exception("python-pptx library not found. Installing...")
-        except Exception as e:
-            raise Exception(f"Error creating PowerPoint: {str(e)}")
-            
-    def create_pdf_from_latex(self, latex_data, output_dir, media_files):
-        """Create PDF presentation from LaTeX data"""
+    def media_summary(self):
+        """Describe the media copied by the last conversion"""
+        report = self.media_report
+        if not report:
+            return f"Media files: {len(self.media_files)}"
+        return (f"Media files: {report['files']} ({report['unique']} unique, "
+                f"{report['bytes_saved'] / 1024:.0f} KB not copied)")
+            
+    def create_presentation_from_latex(self, slides, job):
+        """Create presentation file from parsed slides"""
+        from media_pipeline import collect_media, prepare_image
+        from slide_ast import Image, TITLE, CONTENT
+        
+        engine = self.get_engine()
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        
+        # Copy media files to output directory, once per unique content
+        media_dir = os.path.join(OUTPUT_DIR, "media")
+        copied_media, media_report = collect_media(job.media_files, media_dir)
+        job.report('media', media_report)
+        
+        if slides[0].type == TITLE and slides[0].author is None:
+            slides[0].subtitle = f"Generated from LaTeX\n{len(copied_media)} media files included"
+        
+        # One picture per content slide, in the order the media was added
+        content_slides = [slide for slide in slides if slide.type == CONTENT]
+        for slide, media_file in zip(content_slides, copied_media):
+            if media_file.lower().endswith(IMAGE_EXTENSIONS):
+                slide.images.append(Image(prepare_image(media_file, 3, 2, fit='contain'), IMAGE_BOX))
+        
+        slides = engine.translate(slides, job.language)
+        lang_suffix = "_russian" if job.language == "russian" else "_english"
+        fast_suffix = "_slides" if job.output_format == "pdf_fast" else ""
+        extension = "pptx" if job.output_format == "pptx" else "pdf"
+        filename = os.path.join(OUTPUT_DIR, f"latex_presentation{lang_suffix}{fast_suffix}.{extension}")
+        
+        total = len(slides)
         try:
-            from reportlab.pdfgen import canvas
-            from reportlab.lib.pagesizes import letter, A4
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak
-            from reportlab.lib.units import inch
-            from reportlab.lib.colors import HexColor
-            from reportlab.lib.enums import TA_CENTER, TA_LEFT
-            
-            lang_suffix = "_russian" if self.language.get() == "russian" else "_english"
-            filename = os.path.join(output_dir, f"latex_presentation{lang_suffix}.pdf")
-            
-            doc = SimpleDocTemplate(filename, pagesize=A4)
-            styles = getSampleStyleSheet()
-            
-            # Custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Title'],
-                fontSize=24,
-                spaceAfter=30,
-                alignment=TA_CENTER,
-                textColor=HexColor('#0066CC')
-            )
-            
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading1'],
-                fontSize=18,
-                spaceAfter=20,
-                textColor=HexColor('#0066CC')
-            )
-            
-            story = []
-            
-            # Title page
-            story.append(Paragraph(latex_data['title'], title_style))
-            story.append(Spacer(1, 0.5*inch))
-            story.append(Paragraph("Generated from LaTeX", heading_style))
-            story.append(Spacer(1, 0.3*inch))
-            story.append(Paragraph(f"{len(media_files)} media files included", styles['Normal']))
-            story.append(PageBreak())
-            
-            # Content pages
-            for i, subsection in enumerate(latex_data['subsections']):
-                story.append(Paragraph(subsection['title'], heading_style))
-                
-                if subsection['bullets']:
-                    for bullet in subsection['bullets']:
-                        story.append(Paragraph(f"• {bullet}", styles['Normal']))
-                        story.append(Spacer(1, 6))
-                else:
-                    clean_content = re.sub(r'\\[a-zA-Z]+\{[^}]*\}', '', subsection['content'])
-                    clean_content = re.sub(r'[{}\\]', '', clean_content).strip()
-                    if clean_content:
-                        story.append(Paragraph(clean_content, styles['Normal']))
-                
-                # Add image if available
-                if media_files and i < len(media_files):
-                    media_file = media_files[i]
-                    if media_file.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp')):
-                        try:
-                            story.append(Spacer(1, 0.2*inch))
-                            img = Image(media_file, width=4*inch, height=3*inch)
-                            story.append(img)
-                        except:
-                            pass
-                
-                story.append(PageBreak())
-            
-            doc.build(story)
-            return filename
-            
-        except ImportError:
-            raise Exception("reportlab library not found. Installing...")
+            engine.render(slides, job.output_format, filename, title=slides[0].title,
+                          on_slide=lambda number: job.slide_rendered(min(number, total), total))
+        except ConversionCancelled:
+            raise
+        except ImportError as e:
+            raise Exception(f"{e.name or 'A rendering library'} is not installed")
         except Exception as e:
-            raise Exception(f"Error creating PDF: {str(e)}")
+            raise Exception(f"Error creating presentation: {str(e)}")
+        job.report('saved', filename)
+        return filename
             
     def convert_presentation(self):
+        if self.job is not None:
+            return
+            
         if not self.latex_file.get():
             messagebox.showerror("Error", "Please select a LaTeX file first!")
             return
@@ -384,39 +328,110 @@ class LatexConverterApp:
             messagebox.showerror("Error", "Selected LaTeX file does not exist!")
             return
             
+        self.job = ConversionJob(self.latex_file.get(), self.output_format.get(),
+                                 self.language.get(), self.media_files)
+        self.status_label.config(text="Parsing LaTeX...", fg='blue')
+        self.progress.config(mode='indeterminate', value=0)
+        self.progress.start()
+        self.convert_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
+        
+        self.executor.submit(self.run_conversion, self.job)
+        self.root.after(50, self.poll_conversion)
+        
+    def run_conversion(self, job):
+        """Worker thread: parse and render, reporting progress on job.events"""
         try:
-            self.status_label.config(text="Converting...", fg='blue')
-            self.progress.start()
-            self.root.update()
-            
-            # Parse LaTeX content
-            latex_data = self.parse_latex_content(self.latex_file.get())
-            
-            # Create presentation
-            output_file = self.create_presentation_from_latex(latex_data)
-            
-            self.progress.stop()
-            self.status_label.config(text="Conversion completed successfully!", fg='green')
+            slides = self.parse_latex_content(job.latex_file)
+            if not slides:
+                raise Exception("No slides found in the LaTeX file")
+            job.report('parsed', len(slides))
+            output_file = self.create_presentation_from_latex(slides, job)
+            job.events.put(('done', output_file))
+        except ConversionCancelled:
+            job.events.put(('cancelled', None))
+        except Exception as e:
+            job.events.put(('error', str(e)))
             
-            # Try to open the file
+    def poll_conversion(self):
+        """Apply queued progress events to the UI; reschedules itself until the job ends"""
+        job = self.job
+        if job is None:
+            return
+        while True:
             try:
-                if os.name == 'nt':  # Windows
-                    os.startfile(output_file)
-                elif os.name == 'posix':  # macOS and Linux
-                    subprocess.run(['open' if sys.platform == 'darwin' else 'xdg-open', output_file])
-                    
-                messagebox.showinfo("Success", 
-                                  f"Presentation created successfully!\n\nFile: {output_file}\n\nMedia files: {len(self.media_files)}")
-            except:
-                messagebox.showinfo("Success", 
-                                  f"Presentation created successfully!\n\nFile: {output_file}\n\nPlease open it manually.")
-                
-        except Exception as e:
-            self.progress.stop()
+                kind, data = job.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'parsed':
+                self.progress.stop()
+                self.progress.config(mode='determinate', maximum=max(data, 1), value=0)
+                self.status_label.config(text=f"Parsed {data} slides, copying media...", fg='blue')
+            elif kind == 'media':
+                self.media_report = data
+                self.status_label.config(text="Media copied, rendering...", fg='blue')
+            elif kind == 'slide':
+                number, total = data
+                self.progress.config(value=number)
+                self.status_label.config(text=f"Rendered slide {number} of {total}", fg='blue')
+            elif kind == 'saved':
+                self.status_label.config(text=f"Saved {os.path.basename(data)}", fg='blue')
+            else:
+                self.finish_conversion(kind, data)
+                return
+        self.root.after(50, self.poll_conversion)
+        
+    def finish_conversion(self, kind, data):
+        self.job = None
+        self.progress.stop()
+        self.convert_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
+        
+        if kind == 'cancelled':
+            self.progress.config(mode='determinate', value=0)
+            self.status_label.config(text="Conversion cancelled", fg='orange')
+            return
+        if kind == 'error':
             self.status_label.config(text="Error occurred during conversion", fg='red')
-            messagebox.showerror("Error", f"Conversion failed:\n{str(e)}")
+            messagebox.showerror("Error", f"Conversion failed:\n{data}")
+            return
+            
+        output_file = data
+        self.progress.config(value=self.progress['maximum'])
+        self.status_label.config(text="Conversion completed successfully!", fg='green')
+        
+        # Try to open the file
+        try:
+            if os.name == 'nt':  # Windows
+                os.startfile(output_file)
+            elif os.name == 'posix':  # macOS and Linux
+                subprocess.run(['open' if sys.platform == 'darwin' else 'xdg-open', output_file])
+                
+            messagebox.showinfo("Success", 
+                              f"Presentation created successfully!\n\nFile: {output_file}\n\n{self.media_summary()}")
+        except:
+            messagebox.showinfo("Success", 
+                              f"Presentation created successfully!\n\nFile: {output_file}\n\nPlease open it manually.")
+            
+    def cancel_conversion(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.cancel_button.config(state='disabled')
+            self.status_label.config(text="Cancelling...", fg='orange')
+            
+    def on_close(self):
+        if self.job is not None:
+            self.job.cancel()
+        self.executor.shutdown(wait=False)
+        if self.engine is not None:
+            self.engine.parallel_renderer.shutdown(wait=False)
+        self.root.destroy()
 
 def main():
+    if '--import-profile' in sys.argv[1:]:
+        from startup_profile import print_import_profile
+        sys.exit(print_import_profile('latex_converter_app'))
+    
     root = tk.Tk()
     app = LatexConverterApp(root)
     root.mainloop()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Single-scan outline parser used by the desktop app.
+
+Extracts the document title, the \\section titles and every \\subsection with
+its body and \\item bullets in one left-to-right pass over the source. All
+patterns are compiled once; none of them can backtrack across more than one
+line-free run, and brace arguments are located with a shared cursor, so the
+scan stays linear even on unterminated or adversarial input.
+
+The result matches the multi-regex parser the app used before:
+
+* title: the first ``\\title{...}`` (``Presentation`` if there is none)
+* sections: every ``\\section{...}``
+* subsections: every ``\\subsection{...}`` that is followed by another
+  ``\\subsection``, ``\\section`` or ``\\end{document}``; the body runs up
+  to that terminator and bullets are ``\\item`` followed by whitespace and
+  the rest of the line up to the next backslash
+"""
+import re
+
+DEFAULT_TITLE = "Presentation"
+
+_COMMAND = re.compile(r'\\(title|subsection|section|item|end\{document\})')
+_BULLET = re.compile(r'\s+([^\n\\]+)')
+
+
+class _Arguments:
+    """Finds ``{...}`` arguments (no nested closing braces) in linear total time"""
+
+    def __init__(self, content):
+        self.content = content
+        self._close = -1  # position of the next '}' at or after the last lookup
+
+    def at(self, pos):
+        """Return (text, end) of a non-empty argument starting at pos, or None"""
+        content = self.content
+        if not content.startswith('{', pos):
+            return None
+        if self._close <= pos:
+            self._close = content.find('}', pos + 1)
+            if self._close < 0:
+                self._close = len(content)
+        close = self._close
+        if close == pos + 1 or close == len(content):
+            return None
+        return content[pos + 1:close], close + 1
+
+
+def parse_outline(content):
+    """Parse LaTeX source into {'title', 'sections', 'subsections'}"""
+    arguments = _Arguments(content)
+    title = None
+    sections = []
+    subsections = []
+
+    current = None  # (title, body start, item positions) of the open subsection
+    sections_end = 0  # \section inside the previous \section's argument is not a new section
+    for match in _COMMAND.finditer(content):
+        name = match.group(1)
+        pos = match.start()
+        inside_argument = current is not None and pos < current[1]
+
+        if name == 'item':
+            if current is not None and not inside_argument:
+                current[2].append(match.end())
+            continue
+
+        if name == 'title':
+            if title is None:
+                argument = arguments.at(match.end())
+                if argument is not None:
+                    title = argument[0]
+            continue
+
+        argument = arguments.at(match.end()) if name != 'end{document}' else None
+        if name == 'section' and argument is not None and pos >= sections_end:
+            sections.append(argument[0])
+            sections_end = argument[1]
+        if inside_argument:
+            continue
+
+        # \subsection, \section and \end{document} all close the open subsection
+        if current is not None:
+            subsections.append(_close_subsection(content, current, pos))
+            current = None
+        if name == 'subsection' and argument is not None:
+            current = (argument[0], argument[1], [])
+
+    # A subsection without a terminator after it is dropped
+    return {
+        'title': title if title is not None else DEFAULT_TITLE,
+        'sections': sections,
+        'subsections': subsections,
+    }
+
+
+def _close_subsection(content, subsection, end):
+    title, start, items = subsection
+    body = content[start:end]
+    body_end = start + len(body.rstrip())
+    bullets = []
+    for item_end in items:
+        match = _BULLET.match(content, item_end, body_end)
+        if match is not None:
+            bullets.append(match.group(1))
+    return {'title': title, 'content': body.strip(), 'bullets': bullets}
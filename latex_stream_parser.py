@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+"""Single-pass streaming parser for Beamer-style LaTeX decks.
+
+The source is consumed as a stream of chunks (a string, a text file object or
+any iterable of strings). The complete lines of each chunk are scanned with
+one compiled regular expression whose alternatives match whole units: a frame
+or a list made of nothing but lines of text and list items, a line of text
+with its line break (escapes, ordinary commands and one-line brace groups
+included), an environment line such as ``\\begin{itemize}``, a run of list
+items, a comment or a lone brace. Slides are built directly from the
+units, so the work done in Python is per unit rather than per character or
+token. Only the unfinished last line, the argument being read and the current
+list item are ever held in memory.
+"""
+import re
+
+from slide_ast import Slide, Item, TITLE, CONTENT, BULLET, TEXT
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+LIST_ENVIRONMENTS = ('itemize', 'enumerate')
+
+# Control sequences the parser acts on; every other control sequence (and
+# escapes such as \% or \{) is passed through verbatim as text.
+STRUCTURAL_COMMANDS = ('begin', 'end', 'item', 'title', 'author', 'frametitle')
+
+_ESCAPE = (r'\\(?:(?!(?:' + '|'.join(STRUCTURAL_COMMANDS) + r')(?![A-Za-z@]))[A-Za-z@]++\*?'
+           r'|[^A-Za-z@\n])')
+# Text runs: plain characters, escapes, ordinary commands and brace groups with
+# nothing structural inside. Line text stops at line breaks; item text does
+# not, since inside a list item a line break is just whitespace. Possessive
+# quantifiers keep the engine from backtracking into runs it has matched.
+# Plain characters are anything but \ % { } (and line breaks, in line text);
+# the classes are written as ranges since sre scans negated classes several
+# times slower.
+_LINE_CHAR = r'[\x00-\t\x0b-$&-\[\]-z|~-\U0010ffff]'
+_ITEM_CHAR = r'[\x00-$&-\[\]-z|~-\U0010ffff]'
+_LINE_TEXT = r'(?:' + _LINE_CHAR + r'++|' + _ESCAPE + r'|\{' + _LINE_CHAR + r'*+(?:' + _ESCAPE + _LINE_CHAR + r'*+)*+\})++'
+_ITEM_TEXT = r'(?:' + _ITEM_CHAR + r'++|' + _ESCAPE + r'|\{' + _ITEM_CHAR + r'*+(?:' + _ESCAPE + _ITEM_CHAR + r'*+)*+\})++'
+_ITEM_LABEL = r'[^\\%{}\]\n]*+(?:(?:' + _ESCAPE + r'|\{[^\\%{}\n]*+\})[^\\%{}\]\n]*+)*+'
+# A line break, with the lines after it that do nothing once the line before
+# has been finished: blank lines, comment lines, markup lines that start with
+# an ordinary command and the \begin or \end of environments other than
+# frames and lists
+_OTHER_ENVIRONMENT = r'\{[ \t]*+(?!(?:frame|' + '|'.join(LIST_ENVIRONMENTS) + r')[ \t]*\})[^\\%{}\n]*+\}'
+_MARKUP = r'%[^\n]*+|\\(?:begin|end)' + _OTHER_ENVIRONMENT + r'(?:' + _LINE_TEXT + r')?+|(?=\\)' + _LINE_TEXT
+_EOL = r'\n\s*+(?:(?:' + _MARKUP + r')\n\s*+)*+'
+
+_ITEMS = r'(?:\\item(?![A-Za-z@])(?:[ \t]*+\[' + _ITEM_LABEL + r'\])?(?:' + _ITEM_TEXT + r')?+)++'
+_LIST = r'\{(?:' + '|'.join(LIST_ENVIRONMENTS) + r')\}'
+# The body of a list that holds nothing but items: anything but comments,
+# escaped backslashes, environments, frame titles and commands that start with
+# \item, so the body splits into items at every '\item'. Commands are matched by
+# their first letter only, so the rest of a run is taken by the character class.
+_LIST_TEXT = r'[\x00-$&-\[\]-\U0010ffff]*+'
+_LIST_BODY = (r'\s*+(?=\\item(?![A-Za-z@]))' + _LIST_TEXT + r'(?:\\(?:(?!(?:begin|end|frametitle)(?![A-Za-z@])'
+              r'|item[A-Za-z@])[A-Za-z@]|[^\\A-Za-z@])' + _LIST_TEXT + r')*+')
+
+# A frame that holds nothing but lines of text, markup lines and at most one
+# such list, each of them on lines of its own
+_FRAME = (r'\\begin\{frame\}(?:\{(?P<frame_title>[^\\%{}\n]*+)\})?[ \t]*+\n'
+          r'(?P<frame_text>(?:[ \t]*+(?:[^\s\\%{}](?:' + _LINE_TEXT + r')?+|' + _MARKUP + r')?\n)*+)'
+          r'(?:[ \t]*+\\begin' + _LIST + r'(?P<frame_list>' + _LIST_BODY + r')\\end' + _LIST + r'[ \t]*+\n'
+          r'(?:[ \t]*+(?:' + _MARKUP + r')?\n)*+)?'
+          r'[ \t]*+\\end\{frame\}(?:[ \t]*+' + _EOL + r')?')
+
+_UNIT = re.compile(
+    r'(?P<frame>' + _FRAME + r')'
+    # A list that holds nothing but items, with the rest of the line its \end is on
+    r'|\\begin' + _LIST + r'(?P<list>' + _LIST_BODY + r')'
+    r'\\end' + _LIST + r'(?P<list_eol>(?:' + _LINE_TEXT + r')?+' + _EOL + r')?'
+    # \begin / \end with a plain {name}, the one-line arguments after it and,
+    # when nothing else follows, the rest of the line
+    r'|\\(?P<env>begin|end)(?![A-Za-z@])(?:\{(?P<env_name>[^\\%{}\n]*+)\}'
+    r'(?:\[(?P<env_option>[^\\%{}\]\n]*+)\])?(?:\{(?P<env_argument>[^\\%{}\n]*+)\})?'
+    r'(?P<env_eol>(?:' + _LINE_TEXT + r')?+' + _EOL + r')?)?'
+    # One or more \item, each with an optional one-line [label] and its text
+    r'|(?P<items>' + _ITEMS + r')'
+    r'|\\(?P<meta>title|author)(?![A-Za-z@])'
+    r'(?:\[[^\\%{}\]\n]*+\])?(?:\{(?P<meta_argument>[^\\%{}\n]*+)\})?'
+    r'|\\(?P<frametitle>frametitle)(?![A-Za-z@])(?:\{(?P<frametitle_argument>[^\\%{}\n]*+)\})?'
+    r'|(?P<text>' + _LINE_TEXT + r')(?P<text_eol>' + _EOL + r')?'
+    r'|(?P<newline>' + _EOL + r')'
+    r'|(?P<comment>%[^\n]*+)(?P<comment_eol>' + _EOL + r')?'
+    r'|(?P<bgroup>\{)'
+    r'|(?P<egroup>\})'
+    r'|(?P<backslash>\\)'
+)
+_ITEM_SPLIT = re.compile(r'\\item(?![A-Za-z@])')
+_LABEL = re.compile(r'[ \t]*+\[(' + _ITEM_LABEL + r')\]')
+_ITEM = re.compile(r'\\item(?![A-Za-z@])(?:[ \t]*+\[(' + _ITEM_LABEL + r')\])?((?:' + _ITEM_TEXT + r')?+)')
+_BLANK = re.compile(r'\s*')
+# The last group a unit matched (Match.lastgroup) -> the kind of unit
+_UNIT_KINDS = {
+    'frame': 'frame', 'text': 'text', 'text_eol': 'text_eol', 'newline': 'newline', 'list': 'list', 'list_eol': 'list',
+    'env': 'env', 'env_name': 'env', 'env_option': 'env', 'env_argument': 'env', 'env_eol': 'env',
+    'items': 'items', 'meta': 'meta', 'meta_argument': 'meta',
+    'frametitle': 'frametitle', 'frametitle_argument': 'frametitle',
+    'comment': 'comment', 'comment_eol': 'comment_eol',
+    'bgroup': 'bgroup', 'egroup': 'egroup', 'backslash': 'backslash',
+}
+
+_SPACE = re.compile(r'(?:\s|%[^\n]*)*')
+_SIMPLE_ARGUMENT = {'{': re.compile(r'\{([^\\%{}]*)\}'), '[': re.compile(r'\[([^\\%{}\]]*)\]')}
+_GROUP_PIECE = re.compile(r'[^\\%{}\]]+|\\(?:[A-Za-z@]+\*?|[^A-Za-z@\n])?|%[^\n]*|[{}\]]')
+_CLOSER = {'{': '}', '[': ']'}
+
+
+def iter_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the source in chunks from a string, a file object or an iterable of strings"""
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        yield from source
+
+
+class _NeedMore(Exception):
+    """The buffer ends before an argument does"""
+
+
+def _read_argument(buf, pos, eof, opener='{'):
+    """Read a {...} (or [...]) argument after pos, skipping whitespace and comments.
+
+    Returns (raw source without comments, end), or (None, pos) if there is no
+    such argument; raises _NeedMore if the buffer ends before that is known.
+    """
+    start = _SPACE.match(buf, pos).end()
+    if start == len(buf):
+        if eof:
+            return None, pos
+        raise _NeedMore
+    if buf[start] != opener:
+        return None, pos
+    simple = _SIMPLE_ARGUMENT[opener].match(buf, start)
+    if simple is not None:
+        return simple.group(1), simple.end()
+
+    closer = _CLOSER[opener]
+    depth = 0
+    pieces = []
+    for match in _GROUP_PIECE.finditer(buf, start + 1):
+        piece = match.group()
+        if piece == closer and depth == 0:
+            return ''.join(pieces), match.end()
+        if piece == '{':
+            depth += 1
+        elif piece == '}':
+            depth -= 1
+        elif piece[0] == '%':
+            continue
+        pieces.append(piece)
+    if not eof:
+        raise _NeedMore
+    return ''.join(pieces), len(buf)
+
+
+def _normalize(text):
+    text = text.strip()
+    # Every whitespace character but the space is unprintable, so most text
+    # is already normalized once stripped
+    if '  ' in text or not text.isprintable():
+        return ' '.join(text.split())
+    return text
+
+
+def _item_texts(run):
+    """The text of each item in a run of \\item, its label (if any) in front"""
+    if '[' not in run and '\\\\' not in run:
+        return _ITEM_SPLIT.split(run)[1:]
+    # Split item by item, so an escaped backslash is not taken for the start of \item
+    return [label + ' ' + text for label, text in _ITEM.findall(run)]
+
+
+def _list_items(body):
+    """The bullets of a list body that holds nothing but items"""
+    texts = body.split('\\item')
+    del texts[0]  # The whitespace before the first item
+    if '[' in body:
+        for i, text in enumerate(texts):
+            label = _LABEL.match(text)
+            if label is not None:
+                texts[i] = label.group(1) + ' ' + text[label.end():]
+    return [Item(BULLET, text if '  ' not in text and text.isprintable() else _normalize(text))
+            for text in map(str.strip, texts) if text]
+
+
+class _SlideParser:
+    """Builds slides from chunks of source, one block of complete lines at a time"""
+
+    def __init__(self):
+        self.slides = []
+        self.frame = None  # The content slide being read
+        self.titled = False
+        self.list_depth = 0
+        self.item = None  # Pieces of the list item being read
+        self.pending = ''
+        self._reset_line()
+
+    def feed(self, chunk, eof=False):
+        buf = self.pending + chunk
+        limit = len(buf) if eof else buf.rfind('\n') + 1
+        pos = 0
+        while pos < limit:
+            pos, complete = self._scan(buf, pos, limit, eof)
+            if not complete:
+                break  # Rescanned from pos once more source has arrived
+        self.pending = buf[pos:]
+
+    def close(self):
+        """Parse what is left; returns the slides (a frame without \\end{frame} is dropped)"""
+        self.feed('', eof=True)
+        return self.slides
+
+    def _reset_line(self, markup=False):
+        # Lines that start with a control sequence are markup and are skipped,
+        # up to the end of the line at brace depth zero.
+        self.line = []
+        self.line_started = markup
+        self.line_is_markup = markup
+        self.depth = 0
+
+    def _flush(self):
+        if self.item is not None:
+            text = _normalize(''.join(self.item))
+            self.item = None
+            if text:
+                level = self.list_depth - 1 if self.list_depth > 1 else 0
+                self.frame.content.append(Item(BULLET, text, level))
+        if self.line:  # Markup lines never collect any
+            text = _normalize(''.join(self.line))
+            if text:
+                self.frame.content.append(Item(TEXT, text))
+        self._reset_line()
+
+    def _text(self, value):
+        if self.item is not None:
+            self.item.append(value)
+        elif self.line_started:
+            if not self.line_is_markup:
+                self.line.append(value)
+        elif not value.isspace():
+            self.line_started = True
+            self.line_is_markup = value.lstrip().startswith('\\')
+            if not self.line_is_markup:
+                self.line.append(value)
+
+    def _newline(self):
+        if self.item is not None:
+            self.item.append(' ')
+        elif self.line_started:
+            if self.depth == 0:
+                self._flush()
+            else:
+                self.line.append(' ')
+
+    def _end_line(self, buf, match, limit):
+        """Handle the line break that ends the unit; returns where the unit ends.
+
+        The lines after the line break that the unit took along only do
+        nothing if the line break left no list item or brace group open;
+        otherwise they are scanned again.
+        """
+        self._newline()
+        if self.item is None and not self.line_started:
+            return match.end()
+        return _BLANK.match(buf, buf.index('\n', match.start()), limit).end()
+
+    def _scan(self, buf, pos, limit, eof):
+        """Handle the units from pos to limit; returns (where to go on, complete).
+
+        Scanning stops early when a unit was handled differently from how it
+        matched (say, a command whose argument is not on its line), and is
+        incomplete when an argument runs past the end of the buffer.
+        """
+        match = None
+        try:
+            for match in _UNIT.finditer(buf, pos, limit):
+                kind = _UNIT_KINDS[match.lastgroup]
+                if kind == 'env':
+                    action, name = match.group('env', 'env_name')
+                    if name is None:
+                        end = self._command(kind, match, buf, limit, eof)
+                    else:
+                        end = self._environment(action, name.strip(), buf, match.end('env_name') + 1, eof, match)
+                elif kind == 'frame':
+                    if self.frame is not None:
+                        # Handled as its \\begin{frame}, then what follows is scanned again
+                        end = self._environment('begin', 'frame', buf, match.start() + len('\\begin{frame}'), eof)
+                    else:
+                        self._frame(*match.group('frame_title', 'frame_text', 'frame_list'))
+                        continue
+                elif kind == 'list':
+                    if self.frame is None or self.list_depth or self.item is not None or self.line_started:
+                        # Handled as its \\begin{...}, then what follows is scanned again
+                        start = match.start()
+                        close = buf.index('}', start)
+                        end = self._environment('begin', buf[start + len('\\begin{'):close], buf, close + 1, eof)
+                    else:
+                        self._list(match.group('list'))
+                        if match.group('list_eol') is None:
+                            self._reset_line(markup=True)
+                        continue
+                elif self.frame is None:
+                    # Outside frames only \begin, \end, \title and \author matter
+                    if kind != 'meta':
+                        continue
+                    end = self._command(kind, match, buf, limit, eof)
+                elif kind == 'text_eol':
+                    if self.item is None and not self.line_started:
+                        # A line of its own: text, or markup that ends with it
+                        text = match.group('text').strip()
+                        if text and text[0] != '\\':
+                            self.frame.content.append(Item(TEXT, _normalize(text)))
+                        continue
+                    self._text(match.group('text'))
+                    end = self._end_line(buf, match, limit)
+                elif kind == 'items' and self.list_depth:
+                    self._items(match.group())
+                    continue
+                elif kind == 'newline' or kind == 'comment_eol':
+                    if self.item is None and not self.line_started:
+                        continue
+                    end = self._end_line(buf, match, limit)
+                elif kind == 'text':
+                    self._text(match.group())
+                    continue
+                elif kind == 'comment':
+                    continue
+                else:
+                    end = self._command(kind, match, buf, limit, eof)
+                if end != match.end():
+                    return end, True
+        except _NeedMore:
+            return match.start(), False
+        return limit, True
+
+    def _items(self, run):
+        """Start the list items of a run of \\item; all but the last one are complete"""
+        self._flush()
+        texts = _item_texts(run)
+        level = self.list_depth - 1 if self.list_depth > 1 else 0
+        content = self.frame.content
+        for text in texts[:-1]:
+            text = _normalize(text)
+            if text:
+                content.append(Item(BULLET, text, level))
+        self.item = [texts[-1]]
+
+    def _list(self, body):
+        """Add the items of a list that holds nothing else, outside any other list"""
+        self.frame.content += _list_items(body)
+
+    def _frame(self, title, text, body):
+        """Add a frame whose body the frame unit matched whole"""
+        title = _normalize(title) if title is not None else None
+        frame = Slide(CONTENT, title or 'Slide')
+        content = frame.content
+        if text:
+            for line in text.split('\n'):
+                line = line.strip()
+                if line and line[0] != '\\' and line[0] != '%':  # Not a markup line
+                    content.append(Item(TEXT, _normalize(line)))
+        if body is not None:
+            content += _list_items(body)
+        self.slides.append(frame)
+
+    def _command(self, kind, match, buf, limit, eof):
+        """Handle a command, a lone brace or a lone backslash; returns where it ends"""
+        start = match.start()
+        if kind == 'env':
+            env, end = _read_argument(buf, match.end(), eof)
+            if env is not None:
+                return self._environment(match.group('env'), env.strip(), buf, end, eof)
+        elif kind == 'meta':
+            if self.frame is not None:
+                return self._verbatim(kind, buf, start, match.end('meta'))
+            arg = match.group('meta_argument')
+            end = match.end()
+            if arg is None:
+                _, end = _read_argument(buf, end, eof, '[')
+                arg, end = _read_argument(buf, end, eof)
+            if arg is not None:
+                if match.group('meta') == 'title':
+                    self.slides.append(Slide(TITLE, _normalize(arg)))
+                elif self.slides and self.slides[-1].type == TITLE:
+                    self.slides[-1].author = _normalize(arg)
+            return end
+        elif kind == 'frametitle':
+            arg = match.group('frametitle_argument')
+            end = match.end()
+            if arg is None:
+                arg, end = _read_argument(buf, end, eof)
+            self._flush()
+            if arg is not None and not self.titled:
+                self.frame.title = _normalize(arg)
+                self.titled = True
+            self._reset_line(markup=True)
+            return end
+        elif kind == 'items':  # Outside a list \item is an ordinary command
+            return self._verbatim(kind, buf, start, start + len('\\item'))
+        return self._verbatim(kind, buf, start, match.end())
+
+    def _verbatim(self, kind, buf, start, end):
+        """Keep a unit as written: a brace, a lone backslash, a command without its arguments"""
+        if self.frame is None:
+            return end
+        value = buf[start:end]
+        if self.item is None and not self.line_started:
+            self.line_started = True
+            self.line_is_markup = kind != 'bgroup' and kind != 'egroup'
+        if kind == 'bgroup':
+            self.depth += 1
+        elif kind == 'egroup' and self.depth:
+            self.depth -= 1
+        if self.item is not None:
+            self.item.append(value)
+        elif not self.line_is_markup:
+            self.line.append(value)
+        return end
+
+    def _environment(self, action, env, buf, end, eof, match=None):
+        """Handle \\begin{env} or \\end{env} whose name ends at end; returns where it ends.
+
+        match is the unit when it also matched the one-line arguments and the
+        rest of the line, which are then markup of the line the environment
+        starts.
+        """
+        if env == 'frame':
+            if action == 'begin':
+                if self.frame is None:
+                    title = match.group('env_argument') if match is not None else None
+                    if title is None:
+                        _, end = _read_argument(buf, end, eof, '[')
+                        title, end = _read_argument(buf, end, eof)
+                        match = None  # The rest of the line is scanned again
+                    title = _normalize(title) if title is not None else None
+                    self.frame = Slide(CONTENT, title or 'Slide')
+                    self.titled = title is not None
+                    self.list_depth = 0
+            elif self.frame is not None:
+                self._flush()
+                self.slides.append(self.frame)
+                self.frame = None
+                self.list_depth = 0
+        elif self.frame is not None:
+            self._flush()
+            if env in LIST_ENVIRONMENTS:
+                if action == 'begin':
+                    self.list_depth += 1
+                elif self.list_depth:
+                    self.list_depth -= 1
+
+        if match is None or self.item is not None:
+            self._reset_line(markup=True)
+            return end  # What follows is scanned again; it may belong to the list item
+        if match.group('env_eol') is None:
+            self._reset_line(markup=True)
+        elif self.line_started:
+            self._reset_line()  # The line break has finished the markup line
+        return match.end()
+
+
+def parse_slides(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Parse LaTeX source (string, file object or chunk iterable) into slides"""
+    parser = _SlideParser()
+    for chunk in iter_chunks(source, chunk_size):
+        parser.feed(chunk)
+    return parser.close()
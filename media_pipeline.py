@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Downscale and recompress images to the size they are displayed at.
+
+Slides show pictures in boxes of a few inches, so embedding full-resolution
+screenshots only makes decks bigger and slower to render. ``prepare_image``
+resizes an image to the pixel size of its placed box at a target DPI,
+recompresses it and caches the result on disk keyed by (content hash, target
+size, format), so repeated builds reuse the processed file.
+``collect_media`` copies media into an output directory once per unique
+content.
+"""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+DEFAULT_DPI = 150
+JPEG_QUALITY = 85
+CACHE_DIR = os.environ.get('MEDIA_CACHE_DIR',
+                           os.path.join(tempfile.gettempdir(), 'latex_converter_media'))
+
+# path -> (mtime_ns, size, sha256), so unchanged files are hashed once per process
+_hashes = {}
+_lock = threading.Lock()
+
+
+def content_hash(path):
+    """SHA-256 of a file's content, memoized on its mtime and size"""
+    stat = os.stat(path)
+    with _lock:
+        cached = _hashes.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    with _lock:
+        _hashes[path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+    return digest.hexdigest()
+
+
+def _target_size(source_size, box_pixels, fit):
+    src_w, src_h = source_size
+    box_w, box_h = box_pixels
+    if fit == 'contain':
+        # Aspect ratio is preserved when drawn, so scale uniformly
+        scale = min(1.0, box_w / src_w, box_h / src_h)
+        return max(1, round(src_w * scale)), max(1, round(src_h * scale))
+    # 'stretch': the picture is stretched to the box, so each axis is independent
+    return min(src_w, box_w), min(src_h, box_h)
+
+
+def prepare_image(path, width_in, height_in, dpi=DEFAULT_DPI, fit='stretch', cache_dir=None):
+    """Return the path of a copy of the image sized for a width_in x height_in box.
+
+    ``fit`` is 'stretch' when the image is stretched to fill the box (python-pptx
+    add_picture with width and height, platypus Image) and 'contain' when its
+    aspect ratio is preserved. The original path is returned when Pillow is not
+    installed or the image cannot be read; an image that processing would not make
+    smaller is cached unchanged.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return path
+
+    cache_dir = cache_dir or CACHE_DIR
+    try:
+        with Image.open(path) as image:
+            source_format = image.format
+            box_pixels = (max(1, round(width_in * dpi)), max(1, round(height_in * dpi)))
+            size = _target_size(image.size, box_pixels, fit)
+            resize = size != image.size
+
+            if source_format == 'JPEG':
+                out_format, extension = 'JPEG', 'jpg'
+            else:
+                out_format, extension = 'PNG', 'png'
+            if not resize and source_format == out_format:
+                return path
+
+            name = f"{content_hash(path)[:32]}_{size[0]}x{size[1]}.{extension}"
+            cached_path = os.path.join(cache_dir, name)
+            if os.path.exists(cached_path):
+                return cached_path
+
+            if out_format == 'JPEG':
+                image = image.convert('RGB')
+            elif image.mode not in ('RGB', 'RGBA', 'L', 'LA', 'P'):
+                image = image.convert('RGBA')
+            if resize:
+                palette = image.mode == 'P'
+                if palette:
+                    image = image.convert('RGBA')
+                image = image.resize(size, Image.LANCZOS)
+                if palette:
+                    # Keep the compact palette encoding of the source
+                    image = image.quantize(256)
+
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.' + extension)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    if out_format == 'JPEG':
+                        image.save(f, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+                    else:
+                        # optimize=True would double the encoding time for about 1.5% smaller files
+                        image.save(f, 'PNG')
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+    except (OSError, ValueError):
+        return path
+
+    if os.path.getsize(tmp_path) >= os.path.getsize(path):
+        if source_format != out_format:
+            os.remove(tmp_path)
+            return path
+        # Already well compressed at display size; cache the original bytes so
+        # later builds do not redo the work
+        shutil.copyfile(path, tmp_path)
+    os.replace(tmp_path, cached_path)
+    return cached_path
+
+
+def _same_file(path, other, digest):
+    try:
+        if os.path.samefile(path, other):
+            return True
+        return os.path.getsize(path) == os.path.getsize(other) and content_hash(other) == digest
+    except OSError:
+        return False
+
+
+def collect_media(paths, dest_dir):
+    """Copy media files into dest_dir, once per unique content.
+
+    Returns (dest_paths, report): dest_paths has one entry per input path, and
+    byte-identical inputs map to the same destination file, so decks embed
+    them once. Files are hardlinked where possible and copied otherwise; a
+    destination that already holds identical content is left alone. report
+    counts files, unique, linked, copied and skipped, plus bytes_saved (bytes
+    that did not have to be written).
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    report = {'files': 0, 'unique': 0, 'linked': 0, 'copied': 0, 'skipped': 0, 'bytes_saved': 0}
+    by_hash = {}
+    claimed = set()
+    dest_paths = []
+
+    for path in paths:
+        report['files'] += 1
+        size = os.path.getsize(path)
+        digest = content_hash(path)
+        if digest in by_hash:
+            report['bytes_saved'] += size
+            dest_paths.append(by_hash[digest])
+            continue
+
+        report['unique'] += 1
+        dest = os.path.join(dest_dir, os.path.basename(path))
+        if dest in claimed:
+            # A different file with the same name was collected already
+            stem, extension = os.path.splitext(dest)
+            dest = f"{stem}_{digest[:8]}{extension}"
+        claimed.add(dest)
+        if os.path.exists(dest) and _same_file(path, dest, digest):
+            report['skipped'] += 1
+            report['bytes_saved'] += size
+        else:
+            # Link or copy under a temporary name so a reader never sees a partial file
+            tmp_path = dest + '.tmp'
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            try:
+                os.link(path, tmp_path)
+                report['linked'] += 1
+                report['bytes_saved'] += size
+            except OSError:
+                shutil.copy2(path, tmp_path)
+                report['copied'] += 1
+            os.replace(tmp_path, dest)
+
+        by_hash[digest] = dest
+        dest_paths.append(dest)
+
+    return dest_paths, report
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Render large decks in parallel: slide chunks on a process pool, merged in order.
+
+The parsed slide list is cut into fixed-size chunks. Each chunk is rendered
+in a worker process, as slide XML fragments for PPTX and as a standalone PDF
+for the PDF backends, and the parent splices the chunks back together in
+order. Chunk boundaries depend only on the chunk size, never on the number of
+workers, so the merged output is the same whatever the worker count.
+"""
+import io
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+DEFAULT_CHUNK_SIZE = 50
+
+
+def new_process_pool(max_workers, initializer=None, initargs=()):
+    """A ProcessPoolExecutor whose workers do not inherit a threaded parent's state.
+
+    Pools are created lazily, usually while other threads are rendering or
+    serving requests. A plain fork() would copy the locks those threads hold
+    (the import lock, logging, template and style caches) in their locked
+    state and can deadlock the worker; the forkserver start method forks
+    workers from a clean single-threaded process instead.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(max_workers=max_workers,
+                                   mp_context=multiprocessing.get_context('forkserver'),
+                                   initializer=initializer, initargs=initargs)
+    return ProcessPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs)
+
+
+class LazyProcessPool:
+    """A new_process_pool that is created on first use and replaced once it breaks.
+
+    When a worker process dies (killed for running out of memory, say), the
+    executor is broken for good: its pending futures fail and it refuses new
+    work. The next submission then starts a fresh pool instead of failing too.
+    """
+
+    def __init__(self, max_workers, initializer=None, initargs=()):
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        executor = self._get_executor()
+        try:
+            return executor.submit(func, *args)
+        except BrokenProcessPool:
+            self._discard(executor)
+            return self._get_executor().submit(func, *args)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _get_executor(self):
+        # Created on first use so importing the server does not spawn processes
+        with self._lock:
+            if self._executor is None:
+                self._executor = new_process_pool(self.max_workers, self.initializer, self.initargs)
+            return self._executor
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+
+def chunk_slides(slides, chunk_size):
+    return [slides[i:i + chunk_size] for i in range(0, len(slides), chunk_size)]
+
+
+class ParallelRenderer:
+    """Maps a chunk renderer over slide chunks on a lazily created process pool.
+
+    With one worker, a single chunk, or when already running inside a worker
+    process (e.g. a job queue renderer), chunks are rendered inline instead.
+    """
+
+    def __init__(self, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self._pool = LazyProcessPool(self.max_workers)
+
+    def should_split(self, slides):
+        return len(slides) > self.chunk_size
+
+    def map(self, func, slides, *args):
+        """Return [func(chunk, *args) for each chunk of slides], in chunk order"""
+        return list(self.imap(func, slides, *args))
+
+    def imap(self, func, slides, *args):
+        """Yield func(chunk, *args) for each chunk of slides, in chunk order, as they finish"""
+        chunks = chunk_slides(slides, self.chunk_size)
+        if self.max_workers <= 1 or len(chunks) <= 1 or multiprocessing.parent_process() is not None:
+            for chunk in chunks:
+                yield func(chunk, *args)
+            return
+        futures = [self._pool.submit(func, chunk, *args) for chunk in chunks]
+        try:
+            for future in futures:
+                yield future.result()
+        finally:
+            # Stop queued chunks when the caller gives up (an error or a cancellation)
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+
+def slide_fragments(prs):
+    """Serialize the slides of a presentation as (layout index, slide XML) pairs"""
+    from lxml import etree
+
+    layouts = list(prs.slide_layouts)
+    return [(layouts.index(slide.slide_layout), etree.tostring(slide._element))
+            for slide in prs.slides]
+
+
+def append_slide_fragments(prs, fragments):
+    """Append slides produced by slide_fragments to prs, in order.
+
+    prs must be based on the same template as the presentation the fragments
+    came from. Fragments may only reference their slide layout, which holds
+    for text slides; pictures or charts would need their parts copied too.
+    """
+    from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+    from pptx.parts.slide import SlidePart
+
+    layouts = prs.slide_layouts
+    presentation_part = prs.part
+    for layout_index, xml in fragments:
+        slide_part = SlidePart.load(partname=presentation_part._next_slide_partname,
+                                    content_type=CT.PML_SLIDE,
+                                    package=presentation_part.package,
+                                    blob=xml)
+        slide_part.relate_to(layouts[layout_index].part, RT.SLIDE_LAYOUT)
+        rId = presentation_part.relate_to(slide_part, RT.SLIDE)
+        prs.slides._sldIdLst.add_sldId(rId)
+
+
+def pdf_merge_available():
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def merge_pdfs(chunks, output, title=None):
+    """Concatenate PDF documents (bytes) into output (a path or binary file object)"""
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for chunk in chunks:
+        writer.append(PdfReader(io.BytesIO(chunk)))
+    if title:
+        writer.add_metadata({'/Title': title})
+    writer.write(output)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Fast PDF backend that draws slides directly on a ReportLab canvas.
+
+Every slide is a fixed one-page layout, so instead of running platypus flow
+layout each slide is drawn at precomputed coordinates on a landscape page
+with the same geometry as the PPTX output (10 x 7.5 inches, the python-pptx
+default template). Text is plain: no paragraph markup is interpreted.
+"""
+from pdf_styles import get_pdf_styles
+from slide_ast import TITLE, BULLET
+
+INCH = 72
+SLIDE_WIDTH = 10 * INCH
+SLIDE_HEIGHT = 7.5 * INCH
+
+# Placeholder boxes of the default PPTX layouts as (left, top, width, height)
+# in points measured from the top-left corner, like python-pptx does
+TITLE_SLIDE_TITLE_BOX = (0.75 * INCH, 2.33 * INCH, 8.5 * INCH, 1.61 * INCH)
+TITLE_SLIDE_SUBTITLE_BOX = (1.5 * INCH, 4.25 * INCH, 7 * INCH, 1.92 * INCH)
+CONTENT_TITLE_BOX = (0.5 * INCH, 0.3 * INCH, 9 * INCH, 1.25 * INCH)
+CONTENT_BODY_BOX = (0.5 * INCH, 1.75 * INCH, 9 * INCH, 4.95 * INCH)
+
+TITLE_COLOR = '#0066CC'
+TEXT_COLOR = '#000000'
+TITLE_SLIDE_TITLE_SIZE = 40
+TITLE_SLIDE_SUBTITLE_SIZE = 24
+CONTENT_TITLE_SIZE = 32
+BODY_SIZES = (20, 18, 16)  # by list level
+BULLET_INDENT = 0.3 * INCH
+LINE_SPACING = 1.2
+ITEM_SPACING = 6
+
+
+class CanvasSlideRenderer:
+    """Draws parsed slides (slide_ast.Slide objects) as PDF pages"""
+
+    def __init__(self):
+        from reportlab.lib.colors import HexColor
+
+        styles = get_pdf_styles()
+        self.font_name = styles.font_name
+        self.bold_font_name = styles.bold_font_name
+        self.title_color = HexColor(TITLE_COLOR)
+        self.text_color = HexColor(TEXT_COLOR)
+
+    def render(self, slides, output, title=None, on_slide=None):
+        """Write slides to output (a path or a binary file object).
+
+        on_slide, if given, is called with the 1-based number of each slide
+        once it has been drawn.
+        """
+        from reportlab.pdfgen import canvas
+
+        pdf = canvas.Canvas(output, pagesize=(SLIDE_WIDTH, SLIDE_HEIGHT), pageCompression=1)
+        if title:
+            pdf.setTitle(title)
+        for number, slide in enumerate(slides, 1):
+            if slide.type == TITLE:
+                self.draw_title_slide(pdf, slide)
+            else:
+                self.draw_content_slide(pdf, slide)
+            pdf.showPage()
+            if on_slide:
+                on_slide(number)
+        pdf.save()
+
+    def draw_title_slide(self, pdf, slide):
+        self._draw_centered(pdf, slide.title, TITLE_SLIDE_TITLE_BOX,
+                            self.bold_font_name, TITLE_SLIDE_TITLE_SIZE, self.title_color)
+        subtitle = slide.subtitle if slide.subtitle is not None else slide.author
+        if subtitle:
+            self._draw_centered(pdf, subtitle, TITLE_SLIDE_SUBTITLE_BOX,
+                                self.font_name, TITLE_SLIDE_SUBTITLE_SIZE, self.text_color)
+
+    def draw_content_slide(self, pdf, slide):
+        from reportlab.lib.utils import simpleSplit
+
+        self._draw_centered(pdf, slide.title, CONTENT_TITLE_BOX,
+                            self.bold_font_name, CONTENT_TITLE_SIZE, self.title_color)
+
+        left, top, width, height = CONTENT_BODY_BOX
+        y = SLIDE_HEIGHT - top
+        bottom = y - height
+        pdf.setFillColor(self.text_color)
+        for item in slide.content:
+            level = item.level
+            size = BODY_SIZES[min(level, len(BODY_SIZES) - 1)]
+            indent = left + level * BULLET_INDENT
+            text_left = indent + (BULLET_INDENT if item.type == BULLET else 0)
+            lines = simpleSplit(item.text, self.font_name, size, left + width - text_left)
+            leading = size * LINE_SPACING
+            if y - leading < bottom:
+                break  # the slide is full; remaining items are dropped like an overflowing text box
+            pdf.setFont(self.font_name, size)
+            if item.type == BULLET:
+                pdf.drawString(indent, y - size, '•')
+            for line in lines:
+                if y - leading < bottom:
+                    break
+                pdf.drawString(text_left, y - size, line)
+                y -= leading
+            y -= ITEM_SPACING
+
+        for image in slide.images:
+            self._draw_image(pdf, image)
+
+    def _draw_centered(self, pdf, text, box, font_name, size, color):
+        from reportlab.lib.utils import simpleSplit
+
+        left, top, width, height = box
+        lines = simpleSplit(text, font_name, size, width)
+        leading = size * LINE_SPACING
+        # Vertically centre the block of lines inside the box
+        y = SLIDE_HEIGHT - top - (height - leading * len(lines)) / 2 - size
+        pdf.setFont(font_name, size)
+        pdf.setFillColor(color)
+        for line in lines:
+            pdf.drawCentredString(left + width / 2, y, line)
+            y -= leading
+
+    def _draw_image(self, pdf, image):
+        # image.box is (left, top, width, height) in points from the top-left
+        left, top, width, height = image.box
+        try:
+            pdf.drawImage(image.path, left, SLIDE_HEIGHT - top - height, width, height,
+                          preserveAspectRatio=True, anchor='c', mask='auto')
+        except Exception:
+            pass  # Skip images that cannot be read, like the platypus path does
+
+
+_renderer = None
+
+
+def render_slides_pdf(slides, output, title=None, on_slide=None):
+    """Render slides to output with a shared CanvasSlideRenderer"""
+    global _renderer
+    if _renderer is None:
+        _renderer = CanvasSlideRenderer()
+    _renderer.render(slides, output, title, on_slide)
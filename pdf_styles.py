@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Process-wide ReportLab font and paragraph style registry.
+
+The registry is built once, on first use, and shared by every PDF renderer
+(server, Tk app and create_pdf_presentation.py). Fonts with Cyrillic coverage
+are registered at that point so Russian decks render real glyphs; the styles
+handed out are frozen so concurrent renders cannot change each other's
+output.
+"""
+import os
+import threading
+from types import MappingProxyType
+
+FONT_FAMILY = 'SlideSans'
+
+# (regular, bold) TrueType fonts that cover Cyrillic, in order of preference
+FONT_CANDIDATES = [
+    ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/dejavu/DejaVuSans.ttf', '/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/TTF/DejaVuSans.ttf', '/usr/share/fonts/TTF/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',
+     '/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf'),
+    ('C:\\Windows\\Fonts\\arial.ttf', 'C:\\Windows\\Fonts\\arialbd.ttf'),
+    ('/System/Library/Fonts/Supplemental/Arial.ttf', '/System/Library/Fonts/Supplemental/Arial Bold.ttf'),
+    ('/Library/Fonts/Arial.ttf', '/Library/Fonts/Arial Bold.ttf'),
+]
+
+_lock = threading.Lock()
+_registry = None
+
+
+class PdfStyleRegistry:
+    """Read-only view of the registered fonts and paragraph styles"""
+
+    def __init__(self, font_name, bold_font_name, cyrillic, styles):
+        self.font_name = font_name
+        self.bold_font_name = bold_font_name
+        self.cyrillic = cyrillic
+        self.styles = MappingProxyType(styles)
+
+    def __getitem__(self, key):
+        return self.styles[key]
+
+
+def _font_candidates():
+    # PDF_FONT_PATH / PDF_BOLD_FONT_PATH take precedence over the system fonts
+    custom = os.environ.get('PDF_FONT_PATH')
+    if custom:
+        yield custom, os.environ.get('PDF_BOLD_FONT_PATH', custom)
+    yield from FONT_CANDIDATES
+
+
+def _register_fonts():
+    """Register the first usable Cyrillic TTF family; falls back to Helvetica"""
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+    from reportlab.lib.fonts import addMapping
+
+    for regular, bold in _font_candidates():
+        if not os.path.exists(regular):
+            continue
+        try:
+            font = TTFont(FONT_FAMILY, regular)
+            if ord('Ж') not in font.face.charToGlyph:
+                continue
+            bold_font = TTFont(FONT_FAMILY + '-Bold', bold if os.path.exists(bold) else regular)
+        except Exception:
+            continue
+        pdfmetrics.registerFont(font)
+        pdfmetrics.registerFont(bold_font)
+        # Let <b> and <i> markup inside paragraphs resolve to the same family
+        addMapping(FONT_FAMILY, 0, 0, FONT_FAMILY)
+        addMapping(FONT_FAMILY, 1, 0, FONT_FAMILY + '-Bold')
+        addMapping(FONT_FAMILY, 0, 1, FONT_FAMILY)
+        addMapping(FONT_FAMILY, 1, 1, FONT_FAMILY + '-Bold')
+        return FONT_FAMILY, FONT_FAMILY + '-Bold', True
+
+    return 'Helvetica', 'Helvetica-Bold', False
+
+
+def _build():
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.colors import HexColor
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+
+    class FrozenParagraphStyle(ParagraphStyle):
+        def __setattr__(self, name, value):
+            raise AttributeError(f"Shared PDF style '{self.name}' is read-only")
+
+    def freeze(style):
+        frozen = FrozenParagraphStyle.__new__(FrozenParagraphStyle)
+        frozen.__dict__.update(style.__dict__)
+        # Attributes were already copied from the parent; drop the mutable link
+        frozen.__dict__['parent'] = None
+        return frozen
+
+    font_name, bold_font_name, cyrillic = _register_fonts()
+    sample = getSampleStyleSheet()
+
+    styles = {
+        'normal': ParagraphStyle(
+            'SlideNormal',
+            parent=sample['Normal'],
+            fontName=font_name
+        ),
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=sample['Title'],
+            fontName=bold_font_name,
+            fontSize=24,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            textColor=HexColor('#0066CC')
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=sample['Heading1'],
+            fontName=bold_font_name,
+            fontSize=18,
+            spaceAfter=20,
+            textColor=HexColor('#0066CC')
+        ),
+        'bullet': ParagraphStyle(
+            'BulletText',
+            parent=sample['Normal'],
+            fontName=font_name,
+            fontSize=12,
+            spaceAfter=8,
+            leftIndent=20,
+            bulletIndent=10
+        ),
+        'body': ParagraphStyle(
+            'CustomNormal',
+            parent=sample['Normal'],
+            fontName=font_name,
+            fontSize=12,
+            spaceAfter=12,
+            alignment=TA_JUSTIFY
+        ),
+    }
+    return PdfStyleRegistry(font_name, bold_font_name, cyrillic,
+                            {key: freeze(style) for key, style in styles.items()})
+
+
+def get_pdf_styles():
+    """Return the shared registry, registering fonts and building styles on first call"""
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = _build()
+    return _registry
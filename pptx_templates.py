@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Process-wide pool of parsed python-pptx templates.
+
+``Presentation()`` unzips and parses its template package on every call. The
+pool parses each template once per process and hands out deep copies of the
+parsed package, which is about twice as fast and produces identical files.
+"""
+import copy
+import os
+import threading
+
+
+class TemplatePool:
+    """Parsed templates keyed by path (None is python-pptx's default template)"""
+
+    def __init__(self):
+        self._templates = {}  # path -> (mtime_ns, Presentation); never handed out directly
+        self._lock = threading.Lock()
+
+    def _template(self, template_path):
+        from pptx import Presentation
+
+        mtime = os.stat(template_path).st_mtime_ns if template_path else None
+        with self._lock:
+            cached = self._templates.get(template_path)
+            if cached is None or cached[0] != mtime:
+                # Custom templates are re-read when the file on disk changes
+                cached = (mtime, Presentation(template_path))
+                self._templates[template_path] = cached
+            return cached[1]
+
+    def presentation(self, template_path=None):
+        """Return a fresh, independent Presentation based on the template"""
+        if template_path:
+            template_path = os.path.abspath(template_path)
+        return copy.deepcopy(self._template(template_path))
+
+    def preload(self, *template_paths):
+        """Parse templates ahead of the first conversion"""
+        for template_path in template_paths or (None,):
+            self._template(os.path.abspath(template_path) if template_path else None)
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+
+
+template_pool = TemplatePool()
+
+
+def new_presentation(template_path=None):
+    """Drop-in replacement for ``Presentation(template_path)`` backed by the shared pool"""
+    return template_pool.presentation(template_path)
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""Production server: a pre-fork pool of multi-threaded WSGI worker processes.
+
+The master process binds the listening socket, loads the application
+(python-pptx, ReportLab, fonts and templates included) and then forks the
+workers, so they share those pages copy-on-write instead of each loading
+its own copy. Every worker accepts connections from the shared socket and
+handles them on a bounded pool of threads; a worker only accepts while it
+has a free thread, so busy workers leave new connections to idle ones.
+
+The master keeps the configured number of workers running and handles
+signals the way gunicorn does:
+
+- SIGTERM / SIGINT: graceful shutdown. Workers stop accepting, finish the
+  requests in flight and exit; stragglers are killed after graceful_timeout.
+- SIGHUP: graceful reload. A new set of workers is forked, then the old ones
+  drain and exit. With preload off, the new workers import the application
+  again, so code changes are picked up.
+- SIGTTIN / SIGTTOU: one worker more / fewer.
+
+Only the standard library and Werkzeug are needed, so it runs offline.
+
+Usage: python prefork_server.py [--port 5000] [--workers N] [--threads T] [--no-preload]
+"""
+import argparse
+import gc
+import os
+import selectors
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WORKERS = int(os.environ.get('WEB_WORKERS', os.cpu_count() or 1))
+DEFAULT_THREADS = int(os.environ.get('WEB_THREADS', 8))
+GRACEFUL_TIMEOUT = 30
+KEEPALIVE_TIMEOUT = 5
+# A worker that exits sooner than this after being forked counts as a failed boot
+MIN_WORKER_LIFETIME = 1.0
+
+
+class RequestHandler(WSGIRequestHandler):
+    """HTTP/1.1 handler whose idle keep-alive connections give their thread back after a timeout"""
+
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEPALIVE_TIMEOUT
+    access_log = False
+
+    def log_request(self, *args, **kwargs):
+        if self.access_log:
+            super().log_request(*args, **kwargs)
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """WSGI server on an inherited listening socket that handles requests on a thread pool"""
+
+    multithread = True
+    multiprocess = True
+
+    def __init__(self, host, port, fd, app, threads, handler=RequestHandler):
+        super().__init__(host, port, app, handler=handler, fd=fd)
+        # Sibling workers accept from the same socket, so a connection may be gone when we get there
+        self.socket.setblocking(False)
+        self.threads = threads
+        self._slots = threading.BoundedSemaphore(threads)
+        self._pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='request')
+        self._stopping = threading.Event()
+
+    def serve(self, poll_interval=0.5):
+        """Accept and handle connections until stop(); then wait for the requests in flight"""
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.socket, selectors.EVENT_READ)
+            while not self._stopping.is_set():
+                if not self._slots.acquire(timeout=poll_interval):
+                    continue
+                try:
+                    if not selector.select(poll_interval):
+                        self._slots.release()
+                        continue
+                    connection, address = self.socket.accept()
+                except OSError:  # Another worker accepted it first, or we are being stopped
+                    self._slots.release()
+                    continue
+                connection.setblocking(True)
+                self._pool.submit(self._handle, connection, address)
+        self._pool.shutdown(wait=True)
+
+    def stop(self):
+        self._stopping.set()
+
+    def _handle(self, connection, address):
+        try:
+            self.finish_request(connection, address)
+        except Exception:
+            self.handle_error(connection, address)
+        finally:
+            self.shutdown_request(connection)
+            self._slots.release()
+
+
+def listen(host, port, backlog=2048):
+    """Bind the listening socket that the workers will share"""
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    """Master process of a pre-fork server.
+
+    app_loader() returns the WSGI application; with preload it is called once
+    in the master before forking, otherwise in every worker. worker_exit(),
+    if given, runs in each worker after it has drained, e.g. to shut down
+    background pools.
+    """
+
+    def __init__(self, app_loader, host='0.0.0.0', port=5000, workers=DEFAULT_WORKERS,
+                 threads=DEFAULT_THREADS, preload=True, graceful_timeout=GRACEFUL_TIMEOUT,
+                 worker_exit=None, access_log=False):
+        self.app_loader = app_loader
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.threads = max(1, threads)
+        self.preload = preload
+        self.graceful_timeout = graceful_timeout
+        self.worker_exit = worker_exit
+        self.access_log = access_log
+        self.app = None
+        self.socket = None
+        self._workers = {}  # pid -> fork time, current generation
+        self._retiring = {}  # pid -> time it was asked to stop
+        self._signals = []
+
+    def run(self):
+        """Serve until SIGTERM or SIGINT; returns once every worker has exited"""
+        self.socket = listen(self.host, self.port)
+        self.port = self.socket.getsockname()[1]
+        if self.preload:
+            self.app = self.app_loader()
+            # Keep the garbage collector from touching (and so copying) the preloaded objects
+            gc.freeze()
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(signum, lambda signum, frame: self._signals.append(signum))
+        self._log(f"listening on http://{self.host}:{self.port} with {self.workers} workers x "
+                  f"{self.threads} threads (pid {os.getpid()}, preload {'on' if self.preload else 'off'})")
+        try:
+            while True:
+                self._reap()
+                while self._signals:
+                    signum = self._signals.pop(0)
+                    if signum in (signal.SIGTERM, signal.SIGINT):
+                        self._shutdown()
+                        return
+                    if signum == signal.SIGHUP:
+                        self._reload()
+                    elif signum == signal.SIGTTIN:
+                        self.workers += 1
+                    elif signum == signal.SIGTTOU and self.workers > 1 and self._workers:
+                        self.workers -= 1
+                        self._retire([max(self._workers, key=self._workers.get)])
+                while len(self._workers) < self.workers:
+                    self._spawn()
+                self._kill_stragglers()
+                time.sleep(0.1)
+        finally:
+            self.socket.close()
+
+    def _spawn(self):
+        pid = os.fork()
+        if pid:
+            self._workers[pid] = time.monotonic()
+            return
+        # Worker process
+        status = 0
+        try:
+            self._serve_worker()
+        except BaseException as e:
+            print(f"[worker {os.getpid()}] {type(e).__name__}: {e}", file=sys.stderr)
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    def _serve_worker(self):
+        # Ctrl+C reaches the whole process group; only the master reacts to it
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        for signum in (signal.SIGINT, signal.SIGHUP, signal.SIGTTIN, signal.SIGTTOU):
+            signal.signal(signum, signal.SIG_IGN)
+        app = self.app if self.preload else self.app_loader()
+        handler = type('WorkerRequestHandler', (RequestHandler,), {'access_log': self.access_log})
+        server = PooledWSGIServer(self.host, self.port, self.socket.fileno(), app, self.threads,
+                                  handler=handler)
+        signal.signal(signal.SIGTERM, lambda signum, frame: server.stop())
+        server.serve()
+        if self.worker_exit is not None:
+            self.worker_exit()
+
+    def _reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            self._retiring.pop(pid, None)
+            started = self._workers.pop(pid, None)
+            if started is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            self._log(f"worker {pid} exited with status {code}")
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                time.sleep(MIN_WORKER_LIFETIME)  # Do not fork in a tight loop while workers fail to boot
+
+    def _retire(self, pids):
+        now = time.monotonic()
+        for pid in pids:
+            self._workers.pop(pid, None)
+            self._retiring[pid] = now
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self._retiring.pop(pid, None)
+
+    def _kill_stragglers(self):
+        now = time.monotonic()
+        for pid, since in list(self._retiring.items()):
+            if now - since > self.graceful_timeout:
+                self._log(f"worker {pid} did not drain within {self.graceful_timeout} s, killing it")
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self._retiring[pid] = float('inf')  # Killed; waiting to be reaped
+
+    def _reload(self):
+        self._log("reloading: starting new workers, draining the old ones")
+        old = list(self._workers)
+        self._workers.clear()
+        while len(self._workers) < self.workers:
+            self._spawn()
+        self._retire(old)
+
+    def _shutdown(self):
+        self._log("shutting down: draining workers")
+        self._retire(list(self._workers))
+        while self._retiring:
+            self._reap()
+            self._kill_stragglers()
+            time.sleep(0.05)
+
+    def _log(self, message):
+        print(f"[master {os.getpid()}] {message}", file=sys.stderr, flush=True)
+
+
+def load_converter_app():
+    """Import the LaTeX converter server and load its rendering libraries"""
+    import server_app as server
+
+    if server.app.config['PRELOAD_RENDERERS']:
+        server.engine.preload()
+    return server.app
+
+
+def stop_converter_app():
+    """Let queued background jobs finish and stop the worker's pools and threads"""
+    import server_app as server
+
+    server.job_queue.shutdown(wait=True)
+    server.engine.parallel_renderer.shutdown()
+    server.artifact_store.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5000)))
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS,
+                        help='worker processes (default: $WEB_WORKERS or the CPU count)')
+    parser.add_argument('-t', '--threads', type=int, default=DEFAULT_THREADS,
+                        help='request threads per worker (default: $WEB_THREADS or 8)')
+    parser.add_argument('--no-preload', dest='preload', action='store_false',
+                        help='load the application in every worker instead of once before forking')
+    parser.add_argument('--graceful-timeout', type=float, default=GRACEFUL_TIMEOUT,
+                        help='seconds a stopping worker may take to finish its requests')
+    parser.add_argument('--keepalive', type=float, default=KEEPALIVE_TIMEOUT,
+                        help='seconds an idle keep-alive connection is kept open')
+    parser.add_argument('--chdir', default=BASE_DIR,
+                        help='working directory; generated files go to its temp_files/')
+    parser.add_argument('--access-log', action='store_true', help='log every request to stderr')
+    args = parser.parse_args(argv)
+
+    os.chdir(args.chdir)
+    # Every worker has its own renderer process pools; together they should not exceed the CPUs
+    os.environ.setdefault('RENDER_WORKERS', str(max(1, (os.cpu_count() or 1) // max(1, args.workers))))
+    RequestHandler.timeout = args.keepalive
+    PreforkServer(load_converter_app, host=args.host, port=args.port, workers=args.workers,
+                  threads=args.threads, preload=args.preload, graceful_timeout=args.graceful_timeout,
+                  worker_exit=stop_converter_app, access_log=args.access_log).run()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
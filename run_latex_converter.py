@@ -1,39 +1,175 @@
-
 #!/usr/bin/env python3
+"""Launcher: make sure the requirements are installed, then run the server in this process.
+
+pip only runs when something changed. A hash of requirements_latex.txt, the
+interpreter and the installed versions of the required distributions (read
+with importlib.metadata) is kept in a stamp file; when it matches, or when
+every requirement is already installed at a version it allows, pip is
+skipped, so a start needs no network access.
+"""
+import argparse
+import hashlib
+import os
+import re
+import runpy
 import subprocess
 import sys
-import os
+from importlib import metadata
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REQUIREMENTS_FILE = os.path.join(BASE_DIR, 'requirements_latex.txt')
+STAMP_FILE = os.path.join(BASE_DIR, '.requirements.stamp')
+SERVER_SCRIPT = os.path.join(BASE_DIR, 'latex_converter_server.py')
+
+_REQUIREMENT = re.compile(r'^([A-Za-z0-9][A-Za-z0-9._-]*)(?:\[[^\]]*\])?\s*(?:(==|>=)\s*([^\s;,]+))?')
+_RELEASE = re.compile(r'\d+(?:\.\d+)*')
+
+
+def read_requirements(path=REQUIREMENTS_FILE):
+    """Return [(distribution name, (operator, version) or None)] from a requirements file"""
+    requirements = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line or line.startswith('-'):
+                continue
+            match = _REQUIREMENT.match(line)
+            if match:
+                operator, version = match.group(2, 3)
+                requirements.append((match.group(1), (operator, version) if operator else None))
+    return requirements
+
+
+def installed_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def requirements_fingerprint(path=REQUIREMENTS_FILE):
+    """Hash the requirements file, the interpreter and the installed versions it refers to"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        digest.update(f.read())
+    digest.update(f"\0{sys.executable}\0{sys.version}\0".encode('utf-8'))
+    for name, _ in sorted(read_requirements(path)):
+        digest.update(f"{name}=={installed_version(name)}\0".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def release(version):
+    """The numeric release of a version string, comparable as a tuple: '3.1.1rc1' -> (3, 1, 1)"""
+    match = _RELEASE.match(version)
+    return tuple(int(part) for part in match.group().split('.')) if match else ()
+
+
+def satisfies(version, specifier):
+    if specifier is None:
+        return True
+    operator, required = specifier
+    if operator == '==':
+        return version == required
+    return release(version) >= release(required)
+
+
+def unsatisfied_requirements(path=REQUIREMENTS_FILE):
+    """Requirements that are not installed, or installed at a version they do not allow"""
+    unsatisfied = []
+    for name, specifier in read_requirements(path):
+        version = installed_version(name)
+        if version is None or not satisfies(version, specifier):
+            unsatisfied.append(name)
+    return unsatisfied
+
+
+def read_stamp(path=STAMP_FILE):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def write_stamp(fingerprint, path=STAMP_FILE):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(fingerprint)
+    os.replace(tmp_path, path)
+
 
 def install_requirements():
     """Install required packages"""
     try:
         print("📦 Installing required packages...")
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '-r', 'requirements_latex.txt'])
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', '--disable-pip-version-check',
+                               '-r', REQUIREMENTS_FILE])
         print("✅ Packages installed successfully!")
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ Error installing packages: {e}")
         return False
 
-def start_server():
-    """Start the LaTeX converter server"""
+
+def ensure_requirements(force=False):
+    """Run pip only if the requirements or the installed packages changed; returns success"""
+    if not force:
+        if read_stamp() == requirements_fingerprint():
+            print("✅ Requirements unchanged, skipping pip")
+            return True
+        if not unsatisfied_requirements():
+            print("✅ Requirements already installed")
+            write_stamp(requirements_fingerprint())
+            return True
+
+    if install_requirements():
+        write_stamp(requirements_fingerprint())
+        return True
+    missing = [name for name, _ in read_requirements() if installed_version(name) is None]
+    if not missing:
+        # Offline, for example: the installed versions are older than required but can run the
+        # server. Stamp them, so later starts do not try pip again until something changes.
+        print("⚠️  Continuing with the packages that are already installed")
+        write_stamp(requirements_fingerprint())
+        return True
+    print(f"❌ Missing packages: {', '.join(missing)}")
+    return False
+
+
+def start_server(production=False):
+    """Run the LaTeX converter server in this interpreter"""
     try:
         print("🚀 Starting LaTeX to Presentation Converter...")
-        subprocess.run([sys.executable, 'latex_converter_server.py'])
+        if production:
+            from prefork_server import main as serve_production
+            serve_production([])
+            return
+        # The server uses paths relative to its directory and reads its own options from sys.argv.
+        # sys.argv names SERVER_SCRIPT, so the debug reloader restarts the server script itself,
+        # not this launcher, and the requirements are not checked again.
+        os.chdir(BASE_DIR)
+        sys.argv = [SERVER_SCRIPT]
+        runpy.run_path(SERVER_SCRIPT, run_name='__main__')
     except KeyboardInterrupt:
         print("\n👋 Server stopped by user")
-    except Exception as e:
-        print(f"❌ Error starting server: {e}")
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Install requirements if needed and start the server.')
+    parser.add_argument('--reinstall', action='store_true', help='run pip even if nothing changed')
+    parser.add_argument('--production', action='store_true',
+                        help='serve with the pre-fork production server (prefork_server.py)')
+    args = parser.parse_args()
+
     print("=" * 60)
     print("🎯 LaTeX to Presentation Converter")
     print("=" * 60)
-    
-    # Install requirements
-    if install_requirements():
+    if sys.version_info < (3, 12):
+        print("⚠️  Python 3.12 or newer is required (see pyproject.toml)")
+
+    if ensure_requirements(force=args.reinstall):
         print("\n" + "=" * 60)
-        start_server()
+        start_server(production=args.production)
     else:
         print("❌ Failed to install requirements. Please check your Python environment.")
         sys.exit(1)
@@ -0,0 +1,469 @@
+"""Flask application of the LaTeX converter server.
+
+Importing this module sets up the stores, caches and job queue in the output
+directory. latex_converter_server.py runs it with the development server and
+prefork_server.py serves it in production.
+"""
+import os
+import sys
+import json
+import hashlib
+import io
+import socket
+import threading
+import time
+import uuid
+import zipfile
+from flask import Flask, request, jsonify, send_file
+from werkzeug.utils import secure_filename
+
+from artifact_store import ArtifactStore, artifact_id, temporary_path
+from conversion_cache import ConversionCache, conversion_key
+from conversion_jobs import JobQueue, QueueFullError
+from conversion_core import ConversionEngine, normalize_format, file_extension, mime_type
+from conversion_core.worker import init_worker, render_conversion
+from parallel_render import ParallelRenderer
+from incremental_render import SlideArtifactStore, STORE_DIRNAME
+from single_flight import SingleFlight
+from slide_ast import AstCache
+
+app = Flask(__name__)
+app.config['UPLOAD_FOLDER'] = 'temp_files'
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max
+app.config['CONVERSION_CACHE_MAX_BYTES'] = 256 * 1024 * 1024  # 256MB of cached artifacts
+app.config['RENDER_WORKERS'] = int(os.environ.get('RENDER_WORKERS', os.cpu_count() or 1))
+app.config['JOB_QUEUE_SIZE'] = int(os.environ.get('JOB_QUEUE_SIZE', 32))
+app.config['BATCH_MAX_DOCUMENTS'] = int(os.environ.get('BATCH_MAX_DOCUMENTS', 500))
+app.config['PPTX_TEMPLATE'] = os.environ.get('PPTX_TEMPLATE')  # optional corporate .pptx template
+# Decks longer than RENDER_CHUNK_SIZE slides are rendered in chunks on RENDER_CHUNK_WORKERS processes
+app.config['RENDER_CHUNK_SIZE'] = int(os.environ.get('RENDER_CHUNK_SIZE', 50))
+app.config['RENDER_CHUNK_WORKERS'] = int(os.environ.get('RENDER_CHUNK_WORKERS', app.config['RENDER_WORKERS']))
+# Keep per-slide artifacts and re-render only slides whose content changed
+app.config['INCREMENTAL_RENDER'] = os.environ.get('INCREMENTAL_RENDER', '1') != '0'
+app.config['SLIDE_CACHE_MAX_BYTES'] = int(os.environ.get('SLIDE_CACHE_MAX_BYTES', 128 * 1024 * 1024))
+app.config['AST_CACHE_MAX_BYTES'] = int(os.environ.get('AST_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+# Generated files are evicted in the background once unused for ARTIFACT_TTL seconds or past the quotas
+app.config['ARTIFACT_MAX_BYTES'] = int(os.environ.get('ARTIFACT_MAX_BYTES', 1024 * 1024 * 1024))
+app.config['ARTIFACT_MAX_COUNT'] = int(os.environ.get('ARTIFACT_MAX_COUNT', 10000))
+app.config['ARTIFACT_TTL'] = int(os.environ.get('ARTIFACT_TTL', 3600))
+app.config['ARTIFACT_SWEEP_INTERVAL'] = int(os.environ.get('ARTIFACT_SWEEP_INTERVAL', 60))
+# python-pptx and ReportLab load on first use; with PRELOAD_RENDERERS they load once the server listens
+app.config['PRELOAD_RENDERERS'] = os.environ.get('PRELOAD_RENDERERS', '1') != '0'
+# Whether inline conversions ("inline": true) are cached; without caching they never touch disk
+app.config['INLINE_CACHE'] = os.environ.get('INLINE_CACHE', '1') != '0'
+# Identical /convert requests in flight share one render; at most MAX_CONCURRENT_RENDERS run on request threads
+app.config['COALESCE_REQUESTS'] = os.environ.get('COALESCE_REQUESTS', '1') != '0'
+app.config['MAX_CONCURRENT_RENDERS'] = int(os.environ.get('MAX_CONCURRENT_RENDERS', app.config['RENDER_WORKERS']))
+
+# Create temp directory
+os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+
+slide_store = SlideArtifactStore(os.path.join(app.config['UPLOAD_FOLDER'], STORE_DIRNAME),
+                                 max_bytes=app.config['SLIDE_CACHE_MAX_BYTES'])
+
+ast_cache = AstCache(os.path.join(app.config['UPLOAD_FOLDER'], '.ast_cache'),
+                     max_bytes=app.config['AST_CACHE_MAX_BYTES'])
+
+engine = ConversionEngine(
+    output_dir=app.config['UPLOAD_FOLDER'],
+    template=app.config['PPTX_TEMPLATE'],
+    parallel_renderer=ParallelRenderer(max_workers=app.config['RENDER_CHUNK_WORKERS'],
+                                       chunk_size=app.config['RENDER_CHUNK_SIZE']),
+    slide_store=slide_store if app.config['INCREMENTAL_RENDER'] else None,
+    ast_cache=ast_cache,
+)
+# filepath -> (mtime_ns, size, etag), so artifacts are hashed once per version
+_etag_cache = {}
+
+artifact_store = ArtifactStore(app.config['UPLOAD_FOLDER'],
+                               max_bytes=app.config['ARTIFACT_MAX_BYTES'],
+                               max_count=app.config['ARTIFACT_MAX_COUNT'],
+                               ttl=app.config['ARTIFACT_TTL'],
+                               sweep_interval=app.config['ARTIFACT_SWEEP_INTERVAL'],
+                               on_evict=lambda name: _etag_cache.pop(
+                                   os.path.abspath(artifact_store.path(name)), None),
+                               # Cache hits are written to the cache index on the eviction thread
+                               on_sweep=lambda: conversion_cache.flush())
+conversion_cache = ConversionCache(app.config['UPLOAD_FOLDER'],
+                                   max_bytes=app.config['CONVERSION_CACHE_MAX_BYTES'],
+                                   artifact_store=artifact_store)
+# Job states are shared through the output directory, so any server worker can report on any job.
+# Renderer processes build their own engine (conversion_core.worker) without the stores and caches above.
+job_queue = JobQueue(max_workers=app.config['RENDER_WORKERS'],
+                     max_pending=app.config['JOB_QUEUE_SIZE'],
+                     state_dir=os.path.join(app.config['UPLOAD_FOLDER'], '.jobs'),
+                     initializer=init_worker,
+                     initargs=(os.path.abspath(app.config['UPLOAD_FOLDER']), app.config['PPTX_TEMPLATE']))
+
+render_slots = threading.BoundedSemaphore(app.config['MAX_CONCURRENT_RENDERS'])
+inflight = SingleFlight()
+
+def coalesced(key, func, *args):
+    """Run func(*args), sharing the call with identical requests in flight; returns (result, shared)"""
+    if not app.config['COALESCE_REQUESTS']:
+        return func(*args), False
+    return inflight.do(key, func, *args)
+
+def conversion_response(name, slides_count, cached, shared=False):
+    """JSON body describing a stored artifact; clients download it by its id"""
+    artifact = artifact_id(name)
+    return {
+        'success': True,
+        'filename': artifact,
+        'download_url': f'/download/{artifact}',
+        'slides_count': slides_count,
+        'cached': cached,
+        'coalesced': shared
+    }
+
+def render_artifact(latex_code, language, format_type, cache_key):
+    """Render into a new stored artifact unless the cache has one; returns (cache entry, cached)"""
+    cached = conversion_cache.get(cache_key)
+    if cached:
+        return cached, True
+    name = artifact_store.new_name(file_extension(format_type))
+    with render_slots:
+        result = engine.convert(latex_code, language, format_type, filename=name)
+    artifact_store.add(name, engine.output_filename(language, format_type))
+    conversion_cache.put(cache_key, name, result['slides_count'])
+    return {'filename': name, 'slides_count': result['slides_count']}, False
+
+def inline_response(body, format_type, download_name, slides_count, cached, shared=False):
+    """Send a converted presentation (bytes or a file path) as the body of the /convert response"""
+    response = send_file(io.BytesIO(body) if isinstance(body, bytes) else body,
+                         mimetype=mime_type(format_type), as_attachment=True,
+                         download_name=download_name)
+    response.headers['X-Slides-Count'] = str(slides_count)
+    response.headers['X-Conversion-Cache'] = 'hit' if cached else 'miss'
+    response.headers['X-Coalesced'] = '1' if shared else '0'
+    return response
+
+def render_inline(latex_code, language, format_type, cache_key, use_cache):
+    """Render in memory unless the cache has the file; returns the body to send and its details"""
+    if use_cache:
+        cached = conversion_cache.get(cache_key)
+        artifact = artifact_store.lookup(cached['filename']) if cached else None
+        if artifact is not None:
+            return {'body': os.path.abspath(artifact_store.path(artifact['name'])),
+                    'download_name': artifact['download_name'],
+                    'slides_count': cached['slides_count'], 'cached': True}
+    
+    with render_slots:
+        result = engine.convert_bytes(latex_code, language, format_type, cached=use_cache)
+    download_name = engine.output_filename(language, format_type)
+    if use_cache:
+        # The response is sent from memory; the stored copy only serves later identical requests
+        name = artifact_store.new_name(file_extension(format_type))
+        path = artifact_store.path(name)
+        tmp_path = temporary_path(path)
+        with open(tmp_path, 'wb') as f:
+            f.write(result['data'])
+        os.replace(tmp_path, path)
+        artifact_store.add(name, download_name)
+        conversion_cache.put(cache_key, name, result['slides_count'])
+    return {'body': result['data'], 'download_name': download_name,
+            'slides_count': result['slides_count'], 'cached': False}
+
+def convert_inline(latex_code, language, format_type, use_cache):
+    """Render in memory and answer with the file itself instead of a download link"""
+    cache_key = conversion_key(latex_code, language, format_type, engine.VERSION)
+    sent, shared = coalesced(('inline', use_cache, cache_key), render_inline,
+                             latex_code, language, format_type, cache_key, use_cache)
+    return inline_response(sent['body'], format_type, sent['download_name'], sent['slides_count'],
+                           sent['cached'], shared)
+
+@app.before_request
+def start_artifact_eviction():
+    # Started by the first request, so only the process that serves requests sweeps
+    # (not the debug reloader's watcher or renderer processes)
+    artifact_store.start()
+
+@app.route('/')
+def index():
+    with open('latex_converter.html', 'r', encoding='utf-8') as f:
+        return f.read()
+
+@app.route('/convert', methods=['POST'])
+def convert_latex():
+    try:
+        data = request.get_json()
+        latex_code = data.get('latex', '')
+        language = data.get('language', 'english')
+        format_type = normalize_format(data.get('format', 'pptx'))
+        
+        if not latex_code:
+            return jsonify({'success': False, 'error': 'No LaTeX code provided'})
+        
+        # Inline mode: the response body is the presentation, no /download round trip
+        if data.get('inline') or request.args.get('inline') == '1':
+            if data.get('async'):
+                return jsonify({'success': False, 'error': 'inline and async cannot be combined'}), 400
+            use_cache = data.get('cache', app.config['INLINE_CACHE'])
+            # Only a JSON boolean: a truthy value such as "false" must not write to disk
+            if not isinstance(use_cache, bool):
+                return jsonify({'success': False, 'error': '"cache" must be true or false'}), 400
+            return convert_inline(latex_code, language, format_type, use_cache)
+        
+        # Reuse a previously rendered artifact for identical input
+        cache_key = conversion_key(latex_code, language, format_type, engine.VERSION)
+        
+        # Asynchronous mode: render in the background and report a job id
+        if data.get('async'):
+            cached = conversion_cache.get(cache_key)
+            if cached:
+                job_id = job_queue.add_finished(cached)
+            else:
+                name = artifact_store.new_name(file_extension(format_type))
+                def remember(result):
+                    artifact_store.add(name, engine.output_filename(language, format_type))
+                    conversion_cache.put(cache_key, name, result['slides_count'])
+                try:
+                    # Identical submissions get the id of the job that is already rendering
+                    job_id = job_queue.submit(render_conversion, latex_code, language, format_type, name,
+                                              on_success=remember,
+                                              key=cache_key if app.config['COALESCE_REQUESTS'] else None)
+                except QueueFullError as e:
+                    return jsonify({'success': False, 'error': str(e)}), 429
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status_url': f'/jobs/{job_id}',
+                'result_url': f'/jobs/{job_id}/result'
+            }), 202
+        
+        (entry, cached), shared = coalesced(('file', cache_key), render_artifact,
+                                            latex_code, language, format_type, cache_key)
+        return jsonify(conversion_response(entry['filename'], entry['slides_count'], cached, shared))
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+def _batch_documents(req):
+    """Collect batch documents from a JSON body or a multipart upload of .tex files / a zip"""
+    if req.is_json:
+        data = req.get_json()
+        defaults = {'language': data.get('language', 'english'), 'format': data.get('format', 'pptx')}
+        documents = []
+        for i, doc in enumerate(data.get('documents', [])):
+            if isinstance(doc, str):
+                doc = {'latex': doc}
+            documents.append({
+                'name': doc.get('name') or f'document_{i + 1}',
+                'latex': doc.get('latex', ''),
+                'language': doc.get('language', defaults['language']),
+                'format': doc.get('format', defaults['format']),
+            })
+        return documents
+    
+    language = req.form.get('language', 'english')
+    format_type = req.form.get('format', 'pptx')
+    sources = []
+    for upload in req.files.getlist('files'):
+        sources.append((upload.filename, upload.read()))
+    archive = req.files.get('archive')
+    if archive:
+        with zipfile.ZipFile(archive.stream) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and info.filename.lower().endswith('.tex'):
+                    sources.append((info.filename, zf.read(info)))
+    return [{
+        'name': os.path.splitext(os.path.basename(name))[0] or f'document_{i + 1}',
+        'latex': content.decode('utf-8', errors='replace'),
+        'language': language,
+        'format': format_type,
+    } for i, (name, content) in enumerate(sources)]
+
+@app.route('/convert/batch', methods=['POST'])
+def convert_batch():
+    """Convert many LaTeX documents at once; responds with a zip of outputs plus manifest.json"""
+    try:
+        documents = _batch_documents(request)
+        
+        if not documents:
+            return jsonify({'success': False, 'error': 'No LaTeX documents provided'}), 400
+        if len(documents) > app.config['BATCH_MAX_DOCUMENTS']:
+            return jsonify({'success': False,
+                            'error': f"At most {app.config['BATCH_MAX_DOCUMENTS']} documents per batch"}), 413
+        
+        batch_id = uuid.uuid4().hex[:12]
+        manifest = []
+        pending = {}  # cache key -> (render args, manifest entries); identical documents render once
+        for i, doc in enumerate(documents):
+            format_type = normalize_format(doc['format'])
+            name = secure_filename(doc['name']) or f'document_{i + 1}'
+            entry = {
+                'index': i,
+                'name': doc['name'],
+                'output': f'{i + 1:04d}_{name}.{file_extension(format_type)}',
+                'language': doc['language'],
+                'format': format_type,
+                'success': False,
+            }
+            manifest.append(entry)
+            
+            if not doc['latex']:
+                entry['error'] = 'No LaTeX code provided'
+                continue
+            
+            cache_key = conversion_key(doc['latex'], doc['language'], format_type, engine.VERSION)
+            cached = conversion_cache.get(cache_key)
+            if cached:
+                entry.update(success=True, filename=artifact_id(cached['filename']),
+                             slides_count=cached['slides_count'], cached=True)
+                continue
+            
+            if cache_key not in pending:
+                filename = artifact_store.new_name(file_extension(format_type))
+                pending[cache_key] = ((doc['latex'], doc['language'], format_type, filename), [])
+            pending[cache_key][1].append(entry)
+        
+        # Render the uncached documents in parallel on the renderer pool; they take job queue slots
+        try:
+            outcomes = job_queue.run_many(render_conversion, [args for args, _ in pending.values()])
+        except QueueFullError as e:
+            return jsonify({'success': False, 'error': str(e)}), 429
+        for (cache_key, ((*_, name), entries)), (result, error) in zip(pending.items(), outcomes):
+            if error is None:
+                artifact_store.add(name, entries[0]['output'])
+                conversion_cache.put(cache_key, name, result['slides_count'])
+            for entry in entries:
+                if error is not None:
+                    entry['error'] = error
+                else:
+                    entry.update(success=True, filename=artifact_id(name),
+                                 slides_count=result['slides_count'], cached=False)
+        
+        zip_name = artifact_store.new_name('zip')
+        zip_path = os.path.abspath(artifact_store.path(zip_name))
+        tmp_path = temporary_path(zip_path)
+        with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for entry in manifest:
+                artifact = artifact_store.lookup(entry['filename']) if entry['success'] else None
+                if artifact is not None:
+                    archive.write(artifact_store.path(artifact['name']), arcname=entry['output'])
+            archive.writestr('manifest.json', json.dumps({
+                'batch_id': batch_id,
+                'total': len(manifest),
+                'succeeded': sum(1 for entry in manifest if entry['success']),
+                'items': manifest,
+            }, indent=2, ensure_ascii=False))
+        os.replace(tmp_path, zip_path)
+        download_name = f'LaTeX_Batch_{batch_id}.zip'
+        artifact_store.add(zip_name, download_name)
+        
+        return send_file(zip_path, as_attachment=True, mimetype='application/zip',
+                         download_name=download_name)
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+def content_etag(filepath):
+    """Strong ETag derived from the file's content hash"""
+    stat = os.stat(filepath)
+    cached = _etag_cache.get(filepath)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    etag = digest.hexdigest()
+    _etag_cache[filepath] = (stat.st_mtime_ns, stat.st_size, etag)
+    return etag
+
+@app.route('/download/<filename>')
+def download_file(filename):
+    try:
+        # Artifact ids resolve through the index, so unknown names never touch the disk
+        artifact = artifact_store.lookup(secure_filename(filename))
+        if artifact is None:
+            return jsonify({'error': 'File not found'}), 404
+        filepath = os.path.abspath(artifact_store.path(artifact['name']))
+        try:
+            etag = content_etag(filepath)
+        except FileNotFoundError:
+            _etag_cache.pop(filepath, None)
+            artifact_store.remove(artifact['name'])
+            return jsonify({'error': 'File not found'}), 404
+        # send_file streams the file from disk and, being conditional, answers
+        # If-None-Match / If-Modified-Since with 304 and Range with 206
+        return send_file(filepath, as_attachment=True, conditional=True, etag=etag,
+                         download_name=artifact['download_name'])
+            
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Report the state of an asynchronous conversion job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    """Download the artifact of a finished job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] == 'failed':
+        return jsonify({'success': False, 'error': job['error']}), 500
+    if job['status'] != 'finished':
+        return jsonify({'status': job['status']}), 202
+    return download_file(artifact_id(job['result']['filename']))
+
+@app.route('/cache/stats')
+def cache_stats():
+    """Report cache size and hit/miss counters and conversion engine timings of this process"""
+    stats = conversion_cache.stats()
+    stats['artifacts'] = artifact_store.stats()
+    stats['slides'] = slide_store.stats()
+    stats['ast'] = ast_cache.stats()
+    stats['engine'] = engine.stats()
+    stats['coalescing'] = inflight.stats()
+    stats['jobs'] = job_queue.stats()
+    # Every counter is this process's own; pre-fork workers each answer with theirs
+    stats['scope'] = 'process'
+    stats['pid'] = os.getpid()
+    return jsonify(stats)
+
+@app.route('/cleanup')
+def cleanup():
+    """Ask the eviction thread to remove expired and over-quota artifacts now"""
+    artifact_store.request_sweep()
+    return jsonify({'scheduled': True, 'message': 'Cleanup scheduled',
+                    'artifacts': artifact_store.stats()}), 202
+
+def preload_when_listening(port, timeout=30):
+    """Load the rendering libraries on a background thread once port accepts connections"""
+    def wait_and_preload():
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+        engine.preload()
+
+    threading.Thread(target=wait_and_preload, name='preload', daemon=True).start()
+
+
+def main(argv=None):
+    """Run the development server"""
+    argv = sys.argv[1:] if argv is None else argv
+    if '--import-profile' in argv:
+        from startup_profile import print_import_profile
+        return print_import_profile('server_app')
+
+    print("🚀 LaTeX to Presentation Converter Server Starting...")
+    print("📊 Supports: PPTX and PDF output")
+    print("🌍 Languages: English and Russian")
+    print("🔗 Access at: http://0.0.0.0:5000")
+    # With the debug reloader only the child process (WERKZEUG_RUN_MAIN) serves requests
+    if app.config['PRELOAD_RENDERERS'] and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        preload_when_listening(5000)
+    app.run(host='0.0.0.0', port=5000, debug=True)
+    return 0
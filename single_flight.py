@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Request coalescing: concurrent calls with the same key share one execution.
+
+When identical conversions arrive together (a dashboard refreshing on many
+screens, say), the first caller runs the conversion and the others wait for
+its result instead of each rendering the same deck.
+"""
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; callers with the same key share its outcome.
+
+    A key is only in flight while its call runs, so results are not kept:
+    callers arriving afterwards run the call again (and should find their
+    result in a cache by then).
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._flights = {}  # key -> Future of the running call
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args):
+        """Return (func(*args), shared); shared is True if another caller's call produced it.
+
+        An exception raised by the call is raised to every caller sharing it.
+        """
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func(*args)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._flights[key]
+        return result, False
+
+    def stats(self):
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._flights)}
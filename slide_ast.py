@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Compact slide AST shared by the parser and all renderers, and its binary format.
+
+Slides, content items and images are ``__slots__`` classes whose type tags
+are module-level string constants, so a parsed deck costs a few small
+objects per frame instead of a dict per slide and per item.
+
+Decks serialize to a flat little-endian struct layout: a header, a string
+table (offsets into one UTF-8 blob, each distinct string stored once) and
+fixed-size slide, item and image records that refer to strings by index.
+Files are memory-mapped and decoded in one pass; equal strings come back as
+one shared object.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import threading
+
+from disk_cache import DiskCache
+
+TITLE = 'title'
+CONTENT = 'content'
+BULLET = 'bullet'
+TEXT = 'text'
+
+SLIDE_TYPES = (TITLE, CONTENT)
+ITEM_TYPES = (BULLET, TEXT)
+
+MAGIC = b'SAST'
+FORMAT_VERSION = 1
+NO_STRING = -1
+
+# magic, format version, string count, slide count, item count, image count
+_HEADER = struct.Struct('<4sHxxIIII')
+# type tag, title, author, subtitle (string indexes), item count, image count
+_SLIDE = struct.Struct('<B3xiiiII')
+# type tag, list level, text (string index)
+_ITEM = struct.Struct('<BBxxi')
+# path (string index), box (left, top, width, height)
+_IMAGE = struct.Struct('<i4d')
+
+
+class Item:
+    """A paragraph of slide content: a bullet (with a list level) or plain text"""
+
+    __slots__ = ('type', 'text', 'level')
+
+    def __init__(self, type, text, level=0):
+        self.type = type
+        self.text = text
+        self.level = level
+
+    def to_dict(self):
+        item = {'type': self.type, 'text': self.text}
+        if self.level:
+            item['level'] = self.level
+        return item
+
+    def __eq__(self, other):
+        if not isinstance(other, Item):
+            return NotImplemented
+        return (self.type, self.text, self.level) == (other.type, other.text, other.level)
+
+    def __repr__(self):
+        return f'Item({self.type!r}, {self.text!r}, level={self.level})'
+
+
+class Image:
+    """A picture placed in a box given in points from the slide's top-left corner"""
+
+    __slots__ = ('path', 'box')
+
+    def __init__(self, path, box):
+        self.path = path
+        self.box = tuple(box)
+
+    def to_dict(self):
+        return {'path': self.path, 'box': self.box}
+
+    def __eq__(self, other):
+        if not isinstance(other, Image):
+            return NotImplemented
+        return (self.path, self.box) == (other.path, other.box)
+
+    def __repr__(self):
+        return f'Image({self.path!r}, {self.box!r})'
+
+
+class Slide:
+    """A title slide (title, author/subtitle) or a content slide (title, items, images)"""
+
+    __slots__ = ('type', 'title', 'author', 'subtitle', 'content', 'images')
+
+    def __init__(self, type, title, content=None, author=None, subtitle=None, images=None):
+        self.type = type
+        self.title = title
+        self.author = author
+        self.subtitle = subtitle
+        self.content = content if content is not None else []
+        self.images = images if images is not None else []
+
+    def to_dict(self):
+        """The slide as plain data, e.g. for hashing or JSON"""
+        slide = {'type': self.type, 'title': self.title,
+                 'content': [item.to_dict() for item in self.content]}
+        if self.author is not None:
+            slide['author'] = self.author
+        if self.subtitle is not None:
+            slide['subtitle'] = self.subtitle
+        if self.images:
+            slide['images'] = [image.to_dict() for image in self.images]
+        return slide
+
+    def __eq__(self, other):
+        if not isinstance(other, Slide):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f'Slide({self.type!r}, {self.title!r}, {len(self.content)} items)'
+
+
+def encode_slides(slides):
+    """Serialize a list of slides to bytes"""
+    strings = {}
+
+    def ref(value):
+        if value is None:
+            return NO_STRING
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    slide_records = []
+    item_records = []
+    image_records = []
+    for slide in slides:
+        slide_records.append(_SLIDE.pack(SLIDE_TYPES.index(slide.type), ref(slide.title),
+                                         ref(slide.author), ref(slide.subtitle),
+                                         len(slide.content), len(slide.images)))
+        for item in slide.content:
+            item_records.append(_ITEM.pack(ITEM_TYPES.index(item.type), item.level, ref(item.text)))
+        for image in slide.images:
+            image_records.append(_IMAGE.pack(ref(image.path), *image.box))
+
+    encoded = [value.encode('utf-8') for value in strings]
+    ends = []
+    end = 0
+    for value in encoded:
+        end += len(value)
+        ends.append(end)
+    return b''.join([
+        _HEADER.pack(MAGIC, FORMAT_VERSION, len(encoded), len(slide_records),
+                     len(item_records), len(image_records)),
+        struct.pack(f'<{len(ends)}I', *ends),
+        *slide_records, *item_records, *image_records,
+        *encoded,
+    ])
+
+
+def decode_slides(buffer):
+    """Rebuild the slides serialized by encode_slides from a bytes-like object"""
+    with memoryview(buffer) as view:
+        magic, version, string_count, slide_count, item_count, image_count = \
+            _HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError('Not a slide AST file of a supported version')
+        offset = _HEADER.size
+        ends = struct.unpack_from(f'<{string_count}I', view, offset)
+        offset += 4 * string_count
+        sections = []
+        for record, count in ((_SLIDE, slide_count), (_ITEM, item_count), (_IMAGE, image_count)):
+            size = record.size * count
+            with view[offset:offset + size] as section:
+                sections.append(list(record.iter_unpack(section)))
+            offset += size
+        blob = view[offset:].tobytes()
+    strings = []
+    start = 0
+    for end in ends:
+        strings.append(blob[start:end].decode('utf-8'))
+        start = end
+    strings.append(None)  # NO_STRING (-1) resolves to the last entry
+
+    slide_records, item_records, image_records = sections
+    item_types = ITEM_TYPES
+    slides = []
+    next_item = next_image = 0
+    for type_tag, title, author, subtitle, n_items, n_images in slide_records:
+        content = [Item(item_types[item_type], strings[text], level)
+                   for item_type, level, text in item_records[next_item:next_item + n_items]]
+        next_item += n_items
+        images = []
+        if n_images:
+            images = [Image(strings[path], box)
+                      for path, *box in image_records[next_image:next_image + n_images]]
+            next_image += n_images
+        slides.append(Slide(SLIDE_TYPES[type_tag], strings[title], content,
+                            strings[author], strings[subtitle], images))
+    return slides
+
+
+def dump_slides(slides, path):
+    """Write slides to path atomically"""
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(encode_slides(slides))
+    os.replace(tmp_path, path)
+
+
+def load_slides(path):
+    """Memory-map a file written by dump_slides and decode its slides"""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return decode_slides(mapped)
+
+
+def ast_key(source, version):
+    """Hash LaTeX source together with the parser version that produced its AST"""
+    digest = hashlib.sha256()
+    digest.update(f"{version}\0".encode('utf-8'))
+    digest.update(source.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class AstCache(DiskCache):
+    """Size-bounded on-disk cache of parsed decks, one binary AST file per key.
+
+    Reads refresh a file's mtime; past max_bytes the least recently used
+    files are removed.
+    """
+
+    SUFFIX = '.ast'
+    LOAD_ERRORS = (OSError, ValueError, struct.error)
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024):
+        super().__init__(directory, max_bytes)
+
+    def _load(self, path):
+        return load_slides(path)
+
+    def _dump(self, slides, f):
+        f.write(encode_slides(slides))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Startup import report built from ``python -X importtime`` output.
+
+The entry points print it with ``--import-profile``:
+
+    python3 latex_converter_server.py --import-profile
+    python3 latex_converter_app.py --import-profile
+
+The module is imported in a fresh interpreter, so the report shows a cold
+start: total import time, the slowest top-level packages and whether any of
+the heavy rendering libraries (which should load lazily) were imported.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Libraries that should only load on first use or in a background preload
+HEAVY_MODULES = ('pptx', 'reportlab', 'pypdf', 'PIL', 'lxml')
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime lines into (module, self us, cumulative us, depth) tuples"""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def profile_imports(module, cwd=None):
+    """Import module in a fresh interpreter; returns (wall seconds, importtime entries)"""
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                               cwd=cwd, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{completed.stderr[-2000:]}")
+    return elapsed, parse_importtime(completed.stderr)
+
+
+def format_report(module, elapsed, entries, top=15):
+    # A package's largest cumulative entry is its own import including its submodules
+    packages = {}
+    for name, _, cumulative_us, _ in entries:
+        root = name.split('.')[0]
+        if root != module:
+            packages[root] = max(packages.get(root, 0), cumulative_us)
+    module_us = next((cumulative_us for name, _, cumulative_us, depth in entries
+                      if name == module and depth == 0), 0)
+    loaded = sorted({name.split('.')[0] for name, *_ in entries} & set(HEAVY_MODULES))
+
+    lines = [
+        f"Import profile of {module}",
+        f"  interpreter start + import: {elapsed * 1000:.1f} ms",
+        f"  import {module}: {module_us / 1000:.1f} ms",
+        f"  modules imported: {len(entries)}",
+        "",
+        "  slowest packages (cumulative ms):",
+    ]
+    for name, cumulative_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"    {name:<32} {cumulative_us / 1000:8.1f}")
+    lines.append("")
+    if loaded:
+        lines.append(f"  heavy libraries imported at startup: {', '.join(loaded)}")
+    else:
+        lines.append(f"  heavy libraries imported at startup: none ({', '.join(HEAVY_MODULES)} load lazily)")
+    return '\n'.join(lines)
+
+
+def print_import_profile(module):
+    """Print the report for module, imported from the directory of this file; returns an exit code"""
+    try:
+        elapsed, entries = profile_imports(module, cwd=os.path.dirname(os.path.abspath(__file__)))
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(format_report(module, elapsed, entries))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(print_import_profile(sys.argv[1] if len(sys.argv) > 1 else 'server_app'))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Stand-in for pdflatex, for testing compile_presentation without a TeX installation.
+
+    PDFLATEX=$PWD/tests/fake_pdflatex.py python3 compile_presentation.py deck.tex
+
+It accepts the command line compile_presentation passes, follows \\input and
+\\include through TEXINPUTS, and writes <jobname>.aux, .log and .pdf to the
+output directory. Like pdflatex, a reference resolves only on the run after
+the one that wrote its label to the .aux file, so a deck with labels needs a
+third run before the .aux stops changing. \\undefined is reported as an
+undefined control sequence in -file-line-error format, with exit status 1
+and no PDF.
+"""
+import os
+import re
+import sys
+
+_INPUT = re.compile(r'\\(?:input|include)\{([^}]*)\}')
+_LABEL = re.compile(r'\\label\{([^}]*)\}')
+_REF = re.compile(r'\\ref\{([^}]*)\}')
+_NEWLABEL = re.compile(r'\\newlabel\{([^}]*)\}\{\{([^}]*)\}\}')
+
+
+def find_input(name, search_path):
+    for directory in search_path:
+        for candidate in (name, name + '.tex'):
+            path = os.path.join(directory or '.', candidate)
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def read_lines(path, search_path):
+    """(file, line number, text) of every line of path, with \\input files expanded"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, text in enumerate(f, 1):
+            match = _INPUT.search(text)
+            included = find_input(match.group(1), search_path) if match else None
+            if included is not None:
+                yield from read_lines(included, search_path)
+            else:
+                yield path, number, text
+
+
+def main(argv):
+    options = dict(arg.lstrip('-').split('=', 1) for arg in argv if arg.startswith('-') and '=' in arg)
+    source = [arg for arg in argv if not arg.startswith('-')][-1]
+    output_dir = options.get('output-directory', '.')
+    jobname = options.get('jobname', os.path.splitext(os.path.basename(source))[0])
+    base = os.path.join(output_dir, jobname)
+    search_path = os.environ.get('TEXINPUTS', '').split(os.pathsep)
+
+    try:
+        with open(base + '.aux', 'r', encoding='utf-8') as f:
+            known = dict(_NEWLABEL.findall(f.read()))
+    except OSError:
+        known = {}
+
+    log = [f'This is fake pdflatex, jobname {jobname}']
+    labels = []
+    for path, number, text in read_lines(source, search_path):
+        if '\\undefined' in text:
+            log.append(f'{path}:{number}: Undefined control sequence.')
+            with open(base + '.log', 'w', encoding='utf-8') as f:
+                f.write('\n'.join(log) + '\n')
+            return 1
+        labels += _LABEL.findall(text)
+        for ref in _REF.findall(text):
+            if known.get(ref, '??') == '??':
+                log.append(f"LaTeX Warning: Reference `{ref}' on page 1 undefined on input line {number}.")
+
+    # A label's number is only known once the previous run recorded the label
+    with open(base + '.aux', 'w', encoding='utf-8') as f:
+        for index, label in enumerate(labels, 1):
+            f.write(f'\\newlabel{{{label}}}{{{{{index if label in known else "??"}}}}}\n')
+    with open(base + '.log', 'w', encoding='utf-8') as f:
+        f.write('\n'.join(log) + '\n')
+    with open(base + '.pdf', 'wb') as f:
+        f.write(b'%PDF-1.4\n% fake pdflatex output\n%%EOF\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,113 @@
+"""Tests of the pdflatex driver in compile_presentation, run against tests/fake_pdflatex.py.
+
+Run with: python -m pytest tests
+"""
+import os
+import stat
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from compile_presentation import LatexCompiler, STAMP_SUFFIX
+
+FAKE_PDFLATEX = os.path.join(REPO_DIR, 'tests', 'fake_pdflatex.py')
+
+
+@pytest.fixture
+def compiler(tmp_path):
+    # The driver runs the command as one executable, so wrap the stub in a script
+    # that starts it with this interpreter
+    command = tmp_path / 'pdflatex'
+    command.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_PDFLATEX}" "$@"\n')
+    command.chmod(command.stat().st_mode | stat.S_IXUSR)
+    return LatexCompiler(command=str(command), max_workers=2)
+
+
+@pytest.fixture
+def deck(tmp_path):
+    source_dir = tmp_path / 'src'
+    source_dir.mkdir()
+    (source_dir / 'body.tex').write_text('Body text\\label{sec:body}\n')
+    deck = source_dir / 'deck.tex'
+    deck.write_text('\\documentclass{beamer}\n\\begin{document}\n\\input{body}\n'
+                    'See \\ref{sec:body}.\n\\end{document}\n')
+    return deck
+
+
+def test_reruns_until_aux_is_stable(compiler, deck, tmp_path):
+    result = compiler.compile(str(deck), str(tmp_path / 'out'))
+    assert result['status'] == 'compiled'
+    # Writes the label, resolves it, then sees an unchanged .aux
+    assert result['runs'] == 3
+    assert result['errors'] == [] and result['warnings'] == []
+    assert os.path.isfile(result['pdf'])
+    assert os.path.isfile(result['pdf'] + STAMP_SUFFIX)
+    # Nothing but the PDF and its stamp is left in the output directory
+    assert sorted(os.listdir(tmp_path / 'out')) == ['deck.pdf', 'deck.pdf' + STAMP_SUFFIX]
+
+
+def test_no_labels_needs_two_runs(compiler, tmp_path):
+    deck = tmp_path / 'plain.tex'
+    deck.write_text('\\begin{document}\nText\n\\end{document}\n')
+    assert compiler.compile(str(deck))['runs'] == 2
+
+
+def test_unresolved_reference_is_a_warning(compiler, tmp_path):
+    deck = tmp_path / 'dangling.tex'
+    deck.write_text('\\begin{document}\nSee \\ref{missing}.\n\\end{document}\n')
+    result = compiler.compile(str(deck))
+    assert result['status'] == 'compiled'
+    assert result['warnings'] == ["LaTeX Warning: Reference `missing' on page 1 undefined on input line 2."]
+
+
+def test_cache_hit_and_invalidation_by_input(compiler, deck, tmp_path):
+    output_dir = str(tmp_path / 'out')
+    assert compiler.compile(str(deck), output_dir)['status'] == 'compiled'
+
+    cached = compiler.compile(str(deck), output_dir)
+    assert cached['status'] == 'cached'
+    assert cached['runs'] == 0
+
+    # A change to a file pulled in with \input invalidates the cached PDF
+    (deck.parent / 'body.tex').write_text('Changed body\\label{sec:body}\n')
+    assert compiler.compile(str(deck), output_dir)['status'] == 'compiled'
+    assert compiler.compile(str(deck), output_dir)['status'] == 'cached'
+    assert compiler.compile(str(deck), output_dir, force=True)['status'] == 'compiled'
+
+
+def test_errors_are_structured(compiler, deck, tmp_path):
+    output_dir = tmp_path / 'out'
+    assert compiler.compile(str(deck), str(output_dir))['status'] == 'compiled'
+    (deck.parent / 'body.tex').write_text('Body text\n\\undefined\n')
+
+    result = compiler.compile(str(deck), str(output_dir))
+    assert result['status'] == 'failed'
+    assert result['runs'] == 1
+    assert len(result['errors']) == 1
+    error = result['errors'][0]
+    assert error['file'].endswith('body.tex')
+    assert error['line'] == 2
+    assert error['message'] == 'Undefined control sequence.'
+    # The log is kept for inspection and the stale PDF is not taken for up to date
+    assert (output_dir / 'deck.log').is_file()
+    assert compiler.compile(str(deck), str(output_dir))['status'] == 'failed'
+
+
+def test_missing_compiler(deck):
+    result = LatexCompiler(command='no-such-pdflatex').compile(str(deck))
+    assert result['status'] == 'failed'
+    assert result['errors'][0]['message'] == 'no-such-pdflatex not found'
+
+
+def test_compile_many_keeps_order(compiler, tmp_path):
+    decks = []
+    for name in ('b', 'a', 'c'):
+        deck = tmp_path / f'{name}.tex'
+        deck.write_text('\\begin{document}\nText\n\\end{document}\n')
+        decks.append(str(deck))
+    results = list(compiler.compile_many(decks))
+    assert [result['source'] for result in results] == decks
+    assert all(result['status'] == 'compiled' for result in results)
@@ -0,0 +1,167 @@
+"""Regression tests for latex_stream_parser.
+
+The parser matches whole frames and lists with one regular expression when
+it can (the fast path) and falls back to unit-by-unit handling otherwise.
+Parsing one character at a time never has a whole frame in the buffer, so it
+always takes the fallback; both must give the same slides.
+
+Run with: python -m pytest tests
+"""
+import io
+import os
+import random
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import latex_stream_parser
+from benchmarks.bench_parser import generate_deck, legacy_parse_latex
+from latex_stream_parser import parse_slides
+
+
+def dicts(slides):
+    return [slide.to_dict() for slide in slides]
+
+
+def frame(body, title='T'):
+    return f"\\begin{{frame}}{{{title}}}\n{body}\\end{{frame}}\n"
+
+
+def parse_all_ways(source):
+    """Slides of source parsed whole, one character at a time and from a file; asserts they agree"""
+    whole = dicts(parse_slides(source))
+    assert dicts(parse_slides(source, chunk_size=1)) == whole
+    assert dicts(parse_slides(source, chunk_size=7)) == whole
+    assert dicts(parse_slides(io.StringIO(source), chunk_size=13)) == whole
+    return whole
+
+
+CASES = {
+    'text and list': (
+        frame("Intro line\n\\begin{itemize}\n\\item One\n\\item Two\n\\end{itemize}\n", 'Plain'),
+        [{'type': 'content', 'title': 'Plain', 'content': [
+            {'type': 'text', 'text': 'Intro line'},
+            {'type': 'bullet', 'text': 'One'},
+            {'type': 'bullet', 'text': 'Two'}]}],
+    ),
+    'item labels': (
+        frame("\\begin{enumerate}\n\\item[a)] First\n\\item[\\textbf{b}] Second\n\\end{enumerate}\n"),
+        [{'type': 'content', 'title': 'T', 'content': [
+            {'type': 'bullet', 'text': 'a) First'},
+            {'type': 'bullet', 'text': '\\textbf{b} Second'}]}],
+    ),
+    'escaped backslash before item': (
+        frame("\\begin{itemize}\n\\item Line one \\\\item not an item\n\\item Two\n\\end{itemize}\n"),
+        [{'type': 'content', 'title': 'T', 'content': [
+            {'type': 'bullet', 'text': 'Line one \\\\item not an item'},
+            {'type': 'bullet', 'text': 'Two'}]}],
+    ),
+    'command starting with item': (
+        frame("\\begin{itemize}\n\\item One \\itemsep two\n\\end{itemize}\n"),
+        [{'type': 'content', 'title': 'T', 'content': [
+            {'type': 'bullet', 'text': 'One \\itemsep two'}]}],
+    ),
+    'frametitle': (
+        "\\begin{frame}\n\\frametitle{Real title}\nSome text\n\\end{frame}\n",
+        [{'type': 'content', 'title': 'Real title', 'content': [{'type': 'text', 'text': 'Some text'}]}],
+    ),
+    'frame argument wins over frametitle': (
+        frame("\\frametitle{Ignored}\nText\n", 'Argument'),
+        [{'type': 'content', 'title': 'Argument', 'content': [{'type': 'text', 'text': 'Text'}]}],
+    ),
+    'untitled frame': (
+        "\\begin{frame}\nText\n\\end{frame}\n",
+        [{'type': 'content', 'title': 'Slide', 'content': [{'type': 'text', 'text': 'Text'}]}],
+    ),
+    'nested lists': (
+        frame("\\begin{itemize}\n\\item Outer\n\\begin{itemize}\n\\item Inner one\n\\item Inner two\n"
+              "\\end{itemize}\n\\item Outer two\n\\end{itemize}\n"),
+        [{'type': 'content', 'title': 'T', 'content': [
+            {'type': 'bullet', 'text': 'Outer'},
+            {'type': 'bullet', 'text': 'Inner one', 'level': 1},
+            {'type': 'bullet', 'text': 'Inner two', 'level': 1},
+            {'type': 'bullet', 'text': 'Outer two'}]}],
+    ),
+    'item over several lines': (
+        frame("\\begin{itemize}\n\\item Spans\n  two   lines\n\\item[x] y\n\\end{itemize}\n"),
+        [{'type': 'content', 'title': 'T', 'content': [
+            {'type': 'bullet', 'text': 'Spans two lines'},
+            {'type': 'bullet', 'text': 'x y'}]}],
+    ),
+    'markup, comments and other environments': (
+        frame("% a comment\n\\centering\n\\begin{block}{Block}\nInside % trailing\n\\end{block}\n"
+              "50\\% of {\\bf it}\n"),
+        [{'type': 'content', 'title': 'T', 'content': [
+            {'type': 'text', 'text': 'Inside'},
+            {'type': 'text', 'text': '50\\% of {\\bf it}'}]}],
+    ),
+    'title and author': (
+        "\\title{Deck}\n\\author{Someone}\n\\begin{document}\n" + frame("Text\n") + "\\end{document}\n",
+        [{'type': 'title', 'title': 'Deck', 'content': [], 'author': 'Someone'},
+         {'type': 'content', 'title': 'T', 'content': [{'type': 'text', 'text': 'Text'}]}],
+    ),
+    'unterminated frame is dropped': (
+        frame("Kept\n", 'First') + "\\begin{frame}{Second}\nLost\n",
+        [{'type': 'content', 'title': 'First', 'content': [{'type': 'text', 'text': 'Kept'}]}],
+    ),
+}
+
+
+@pytest.mark.parametrize('name', CASES)
+def test_cases(name):
+    source, expected = CASES[name]
+    assert parse_all_ways(source) == expected
+
+
+def test_fast_path_is_taken(monkeypatch):
+    """The simple frames above are matched whole, so the comparison covers the fast path"""
+    frames = []
+    original = latex_stream_parser._SlideParser._frame
+
+    def spy(self, *args):
+        frames.append(args[0])
+        return original(self, *args)
+
+    monkeypatch.setattr(latex_stream_parser._SlideParser, '_frame', spy)
+    parse_slides(CASES['text and list'][0] + CASES['item labels'][0])
+    assert frames == ['Plain', 'T']
+    frames.clear()
+    parse_slides(CASES['text and list'][0], chunk_size=1)
+    assert frames == []
+
+
+def test_matches_legacy_parser():
+    source = generate_deck(50)
+    assert parse_all_ways(source) == legacy_parse_latex(source)
+
+
+PIECES = [
+    "Plain text line\n",
+    "Text with \\emph{emphasis} and 10\\% escapes\n",
+    "\\begin{itemize}\n\\item A\n\\item[b)] B\n\\end{itemize}\n",
+    "\\begin{enumerate}\n\\item One\n  continued\n\\begin{itemize}\n\\item Deep\n\\end{itemize}\n\\end{enumerate}\n",
+    "\\begin{itemize}\\item inline \\item list\\end{itemize}\n",
+    "\\begin{itemize}\n\\item Escaped \\\\item here\n\\item \\itemsep x\n\\end{itemize}\n",
+    "\\frametitle{Late title}\n",
+    "% comment line\n",
+    "\\vspace{1em}\n",
+    "\\begin{block}{Note}\nInside block\n\\end{block}\n",
+    "{Grouped\ntext}\n",
+    "\n",
+    "\\begin{columns}\\column{0.5\\textwidth}\nLeft\n\\end{columns}\n",
+]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random_decks_agree_across_chunk_sizes(seed):
+    rng = random.Random(seed)
+    parts = ["\\title{Random}\n\\author{Seed}\n\\begin{document}\n"]
+    for i in range(rng.randint(1, 12)):
+        title = f"{{Frame {i}}}" if rng.random() < 0.8 else ''
+        body = ''.join(rng.choice(PIECES) for _ in range(rng.randint(0, 6)))
+        parts.append(f"\\begin{{frame}}{title}\n{body}\\end{{frame}}\n")
+    parts.append("\\end{document}\n")
+    parse_all_ways(''.join(parts))